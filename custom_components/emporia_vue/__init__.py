@@ -1,49 +1,111 @@
 """The Emporia Vue integration."""
 
 import asyncio
-import calendar
-from datetime import UTC, datetime, timedelta, tzinfo
+from collections.abc import Awaitable, Callable, Collection, Iterator
+from datetime import UTC, datetime, timedelta
 import logging
+from pathlib import Path
 import re
+import time
 from typing import Any
 
-import dateutil.relativedelta
-import dateutil.tz
 from pyemvue import PyEmVue
 from pyemvue.device import (
     ChargerDevice,
+    OutletDevice,
     VueDevice,
     VueDeviceChannel,
     VueDeviceChannelUsage,
     VueUsageDevice,
 )
 from pyemvue.enums import Scale
-import requests
 import voluptuous as vol
 
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.exceptions import (
     ConfigEntryAuthFailed,
     ConfigEntryNotReady,
     HomeAssistantError,
 )
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .accumulator import UsageAccumulator
+from .api import AsyncVueClient, EmporiaApiError, async_get_request_pool
+from .backfill import StatisticsBackfill
+from .channel_index import (
+    ChannelIndex,
+    IndexedChannel,
+    apply_usage_sign,
+    build_channel_index,
+    usage_sign_policy,
+    zeroed_array,
+)
+from .columnar import UsageColumns
 from .const import (
+    COLUMNAR_USAGE,
     CONFIG_FLOW_SCHEMA,
     CONFIG_TITLE,
     CUSTOMER_GID,
+    DEADBAND_OVERRIDES,
+    DEADBAND_PERCENT,
+    DEADBAND_WATTS,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_DEADBAND_WATTS,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_IMPORT_HISTORY_DAYS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_POLL_JITTER,
+    DEFAULT_POLL_OFFSET,
+    DEFAULT_USAGE_SHARD_SIZE,
     DOMAIN,
     ENABLE_1D,
     ENABLE_1M,
     ENABLE_1MON,
+    ENABLE_1S,
+    HISTORY_DAYS,
+    IMPORT_HISTORY_DAYS,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    POLL_JITTER,
+    POLL_OFFSET,
+    POWER_PRECISION,
+    SECOND_CHANNELS,
     SOLAR_INVERT,
+    USAGE_SHARD_SIZE,
+    VUE_CLIENT,
     VUE_DATA,
+    VUE_DEVICES,
+    VUE_RUNTIME,
+)
+from .coordinator import (
+    AdaptiveDataUpdateCoordinator,
+    AdaptivePollInterval,
+    ChangeNotifyingCoordinator,
+    ClockAlignment,
+    PollTimingStats,
+    switch_change_ratio,
+    switch_snapshot,
+    usage_snapshot,
 )
+from .deadband import DeadbandRule, UsageFilter, parse_deadband_overrides
+from .history import MinuteHistory, remove_history
+from .history_api import async_setup_history_api
+from .history_import import HistoryImporter, import_store
+from .records import UsageRecord
+from .resets import DeviceResetSchedule, async_build_reset_schedules
+from .runtime import VueRuntime
+from .session import VueSessionStore
+from .topology import VueTopologyStore, devices_as_list
+from .totals import UsageTotals, VueTotalsStore
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -54,20 +116,117 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
-DEVICE_GIDS: list[str] = []
-DEVICE_INFORMATION: dict[int, VueDevice] = {}
-DEVICES_ONLINE: list[str] = []
-LAST_MINUTE_DATA: dict[str, Any] = {}
-LAST_DAY_DATA: dict[str, Any] = {}
-LAST_DAY_UPDATE: datetime | None = None
-LAST_MONTH_DATA: dict[str, Any] = {}
-LAST_MONTH_UPDATE: datetime | None = None
-INVERT_SOLAR: bool = True
-
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Emporia Vue component."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_history_api(hass)
+
+    # one service for all the entries, the target entity picks the account
+    async def handle_set_charger_current(call) -> None:
+        """Handle setting the EV Charger current."""
+        _LOGGER.debug(
+            "executing set_charger_current: %s %s",
+            str(call.service),
+            str(call.data),
+        )
+        current = call.data.get("current")
+        current = int(current)
+        device_id: str | list[str] | None = call.data.get("device_id", None)
+        entity_id: str | list[str] | None = call.data.get("entity_id", None)
+
+        # if device or entity ids are strings, convert to list
+        if isinstance(device_id, str):
+            device_id = [device_id]
+        if isinstance(entity_id, str):
+            entity_id = [entity_id]
+
+        # technically we should loop through all the passed device and entities and update all
+        # but for now we'll just use the first one
+        charger_entity: er.RegistryEntry | None = None
+        entity_registry: er.EntityRegistry = er.async_get(hass)
+        if device_id:
+            entities: list[er.RegistryEntry] = er.async_entries_for_device(
+                entity_registry, device_id[0]
+            )
+            for entity in entities:
+                _LOGGER.info("Entity is %s", str(entity))
+                if entity.entity_id.startswith("switch"):
+                    charger_entity = entity
+                    break
+            if not charger_entity and entities:
+                charger_entity = entities[0]
+        elif entity_id:
+            charger_entity = entity_registry.async_get(entity_id[0])
+        if not charger_entity:
+            raise HomeAssistantError("Target device or Entity required.")
+
+        unique_entity_id: str = charger_entity.unique_id
+        gid_match: re.Match[str] | None = re.search(r"\d+", unique_entity_id)
+        if not gid_match:
+            raise HomeAssistantError(
+                f"Could not find device gid from unique id {unique_entity_id}"
+            )
+
+        charger_gid = int(gid_match.group(0))
+        # the charger belongs to the config entry, and account, of its entity
+        entry_data: dict[str, Any] = hass.data[DOMAIN].get(
+            charger_entity.config_entry_id, {}
+        )
+        devices: dict[int, VueDevice] = entry_data.get(VUE_DEVICES, {})
+        if charger_gid not in devices or not devices[charger_gid].ev_charger:
+            raise HomeAssistantError(
+                "Set Charging Current called on invalid device with entity id"
+                f" {charger_entity.entity_id} (unique id {unique_entity_id})"
+            )
+
+        state = hass.states.get(charger_entity.entity_id)
+        _LOGGER.info("State is %s", str(state))
+        if not state:
+            raise HomeAssistantError(
+                f"Could not find state for entity {charger_entity.entity_id}"
+            )
+        charger_info: VueDevice = devices[charger_gid]
+        if charger_info.ev_charger is None:
+            raise HomeAssistantError(
+                f"Could not find charger info for device {charger_gid}"
+            )
+        # Scale the current to a minimum of 6 amps and max of the circuit max
+        current: int = max(6, current)
+        current = min(current, charger_info.ev_charger.max_charging_rate)
+        _LOGGER.info("Setting charger %s to current of %d amps", charger_gid, current)
+
+        client: AsyncVueClient = entry_data[VUE_CLIENT]
+        try:
+            updated_charger: ChargerDevice = await client.async_update_charger(
+                charger_info.ev_charger,
+                state.state == "on",
+                current,
+            )
+            devices[charger_gid].ev_charger = updated_charger
+            # update the state of the charger entity using the updated data
+            state: State | None = hass.states.get(charger_entity.entity_id)
+            if state:
+                new_state: str = "on" if updated_charger.charger_on else "off"
+                new_attributes: dict = state.attributes.copy()
+                new_attributes["charging_rate"] = updated_charger.charging_rate
+                # good enough for now, update the state in the registry
+                hass.states.async_set(
+                    charger_entity.entity_id, new_state, new_attributes
+                )
+
+        except EmporiaApiError as err:
+            _LOGGER.error(
+                "Error updating charger status: %s \nResponse body: %s",
+                err,
+                err.body,
+            )
+            raise
+
+    hass.services.async_register(
+        DOMAIN, "set_charger_current", handle_set_charger_current
+    )
+
     conf = config.get(DOMAIN)
     if not conf:
         return True
@@ -82,7 +241,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
                 ENABLE_1M: conf[ENABLE_1M],
                 ENABLE_1D: conf[ENABLE_1D],
                 ENABLE_1MON: conf[ENABLE_1MON],
-                INVERT_SOLAR: conf[SOLAR_INVERT],
+                SOLAR_INVERT: conf[SOLAR_INVERT],
                 CUSTOMER_GID: conf[CUSTOMER_GID],
                 CONFIG_TITLE: conf[CONFIG_TITLE],
             },
@@ -93,27 +252,55 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Emporia Vue from a config entry."""
-    global DEVICE_GIDS
-    global DEVICE_INFORMATION
-    global INVERT_SOLAR
-    DEVICE_GIDS = []
-    DEVICE_INFORMATION = {}
-
     entry_data = entry.data
     _LOGGER.debug("Setting up Emporia Vue with entry data: %s", entry_data)
     email: str = entry_data[CONF_EMAIL]
     password: str = entry_data[CONF_PASSWORD]
-    if SOLAR_INVERT in entry_data:
-        INVERT_SOLAR = entry_data[SOLAR_INVERT]
+    # everything kept between polls belongs to this entry alone
+    runtime = VueRuntime(
+        entry_data.get(SOLAR_INVERT, True),
+        entry_data.get(USAGE_SHARD_SIZE, DEFAULT_USAGE_SHARD_SIZE),
+        entry_data.get(COLUMNAR_USAGE, False),
+    )
+    # small power changes are held back before the sensors are notified
+    usage_filter = UsageFilter(
+        DeadbandRule(
+            entry_data.get(DEADBAND_WATTS, DEFAULT_DEADBAND_WATTS),
+            entry_data.get(DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT) / 100,
+        ),
+        parse_deadband_overrides(entry_data.get(DEADBAND_OVERRIDES)),
+        entry_data.get(POWER_PRECISION),
+    )
+    history_days: int = entry_data.get(HISTORY_DAYS, DEFAULT_HISTORY_DAYS)
+    minute_history: MinuteHistory | None = (
+        MinuteHistory(history_directory(hass, entry), history_days)
+        if history_days
+        else None
+    )
     vue = PyEmVue()
+    client = AsyncVueClient(
+        async_get_clientsession(hass),
+        vue,
+        entry_data.get(MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+        async_get_request_pool(hass),
+    )
+    session_store = VueSessionStore(hass, entry.entry_id)
+    session_restored = False
     loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    # seconds spent in each phase of the setup, logged at the end
+    timings: dict[str, float] = {}
+    setup_start = phase_start = time.monotonic()
     try:
         # support using the simulator by looking at the username
         if email.startswith("vue_simulator@"):
             host = email.split("@")[1]
             result: bool = await loop.run_in_executor(None, vue.login_simulator, host)
         else:
-            result: bool = await loop.run_in_executor(None, vue.login, email, password)
+            # skip the full login when the saved session is still good
+            session_restored = await session_store.async_restore(vue, client, email)
+            result = session_restored or await async_password_login(
+                vue, session_store, email, password
+            )
         if not result:
             _LOGGER.error("Failed to login to Emporia Vue")
             raise ConfigEntryAuthFailed("Failed to login to Emporia Vue")
@@ -122,258 +309,458 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception as err:  # pylint: disable=broad-exception-caught
         _LOGGER.error("Failed to login to Emporia Vue: %s", err)
         raise ConfigEntryAuthFailed("Failed to login to Emporia Vue") from err
-
-    try:
-        devices: list[VueDevice] = await loop.run_in_executor(None, vue.get_devices)
+    if not email.startswith("vue_simulator@"):
+        session_store.track(vue, client, email)
+    timings["login"] = time.monotonic() - phase_start
+
+    topology_store = VueTopologyStore(hass, entry.entry_id)
+
+    async def async_login_again(err: Exception) -> None:
+        """Drop the rejected saved session and log in with the password instead."""
+        nonlocal session_restored
+        _LOGGER.info("Saved Emporia session was rejected, logging in: %s", err)
+        session_restored = False
+        await session_store.async_remove()
+        if not await async_password_login(vue, session_store, email, password):
+            raise ConfigEntryAuthFailed("Failed to login to Emporia Vue") from err
+        session_store.track(vue, client, email)
+
+    async def async_fetch_devices() -> dict[int, VueDevice]:
+        """Get the device list from the API, merging devices listed more than once."""
+        try:
+            devices: list[VueDevice] = await loop.run_in_executor(None, vue.get_devices)
+        except Exception as err:
+            if not session_restored:
+                raise
+            await async_login_again(err)
+            devices = await loop.run_in_executor(None, vue.get_devices)
+        device_information: dict[int, VueDevice] = {}
         for device in devices:
-            if str(device.device_gid) not in DEVICE_GIDS:
-                DEVICE_GIDS.append(str(device.device_gid))
-                _LOGGER.info("Adding gid %s to DEVICE_GIDS list", device.device_gid)
-                DEVICE_INFORMATION[device.device_gid] = device
+            if device.device_gid not in device_information:
+                device_information[device.device_gid] = device
             else:
-                DEVICE_INFORMATION[device.device_gid].channels += device.channels
+                device_information[device.device_gid].channels += device.channels
+        return device_information
+
+    async def async_revalidate_devices() -> None:
+        """Refresh the cached device list and reload if the topology changed."""
+        try:
+            devices = await async_fetch_devices()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            _LOGGER.warning("Could not refresh the Emporia device list: %s", err)
+            return
+        await topology_store.async_save(email, devices)
+        # the runtime devices gain the special channels of the usage, so compare
+        # with the topology as it was cached
+        if devices_as_list(devices, status=False) == cached_topology:
+            _LOGGER.debug("Cached Emporia device list is up to date")
+            return
+        _LOGGER.info("Emporia device list changed, reloading")
+        hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
+    async def async_timed_refresh(name: str, refresh: Awaitable[None]) -> None:
+        """Await a first refresh and record how long it took."""
+        start = time.monotonic()
+        try:
+            await refresh
+        finally:
+            timings[f"{name} refresh"] = time.monotonic() - start
+
+    try:
+        # create the entities from the cached devices right away and check them
+        # against the API once setup is done
+        phase_start = time.monotonic()
+        cached_devices = await topology_store.async_load(email)
+        if cached_devices is not None:
+            _LOGGER.debug("Using the cached Emporia device list")
+            if session_restored:
+                # without the device list call nothing has used the saved tokens
+                # yet, make sure Emporia still accepts them
+                try:
+                    await client.async_refresh_tokens()
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    await async_login_again(err)
+            cached_topology = devices_as_list(cached_devices, status=False)
+            runtime.devices.update(cached_devices)
+        else:
+            runtime.devices.update(await async_fetch_devices())
+            await topology_store.async_save(email, runtime.devices)
+        for device_gid in runtime.devices:
+            runtime.device_gids.append(str(device_gid))
+            _LOGGER.info("Adding gid %s to the device gids", device_gid)
+        runtime.reset_schedules = await async_build_reset_schedules(
+            runtime.devices.values()
+        )
 
         total_channels = 0
-        for device in DEVICE_INFORMATION.values():
+        for device in runtime.devices.values():
             total_channels += len(device.channels)
         _LOGGER.info(
             "Found %s Emporia devices with %s total channels",
-            len(DEVICE_INFORMATION.keys()),
+            len(runtime.devices.keys()),
             total_channels,
         )
-
-        async def async_update_data_1min() -> dict:
-            """Fetch data from API endpoint at a 1 minute interval.
-
-            This is the place to pre-process the data to lookup tables
-            so entities can quickly look up their data.
-            """
-            data: dict = await update_sensors(vue, [Scale.MINUTE.value])
-            # store this, then have the daily sensors pull from it and integrate
-            # then the daily can "true up" hourly (or more frequent) in case it's incorrect
-            if data:
-                global LAST_MINUTE_DATA
-                LAST_MINUTE_DATA = data
-            return data
-
-        async def async_update_day_sensors() -> dict:
-            global LAST_DAY_UPDATE
-            global LAST_DAY_DATA
-            now: datetime = datetime.now(UTC)
-            if not LAST_DAY_UPDATE or (now - LAST_DAY_UPDATE) > timedelta(minutes=15):
-                _LOGGER.info("Updating day sensors")
-                LAST_DAY_UPDATE = now
-                updated_day_data = await update_sensors(vue, [Scale.DAY.value])
-                apply_api_update_debounce(updated_day_data, LAST_DAY_DATA, "day")
-                LAST_DAY_DATA = updated_day_data
-            else:
-                # integrate the minute data
-                _LOGGER.info("Integrating minute data into day sensors")
-                if LAST_MINUTE_DATA:
-                    for identifier, data in LAST_MINUTE_DATA.items():
-                        device_gid, channel_gid, _ = identifier.split("-")
-                        day_id: str = f"{device_gid}-{channel_gid}-{Scale.DAY.value}"
-                        if (
-                            data
-                            and LAST_DAY_DATA
-                            and day_id in LAST_DAY_DATA
-                            and LAST_DAY_DATA[day_id]
-                            and "usage" in LAST_DAY_DATA[day_id]
-                            and LAST_DAY_DATA[day_id]["usage"] is not None
-                        ):
-                            # if we just passed midnight, then reset back to zero
-                            timestamp: datetime = data["timestamp"]
-                            await check_for_midnight(timestamp, int(device_gid), day_id)
-
-                            LAST_DAY_DATA[day_id]["usage"] += data[
-                                "usage"
-                            ]  # already in kwh
-            return LAST_DAY_DATA
-
-        async def async_update_month_sensors() -> dict:
-            global LAST_MONTH_UPDATE
-            global LAST_MONTH_DATA
-            now: datetime = datetime.now(UTC)
-            if not LAST_MONTH_UPDATE or (now - LAST_MONTH_UPDATE) > timedelta(minutes=30):
-                _LOGGER.info("Updating month sensors")
-                LAST_MONTH_UPDATE = now
-                updated_month_data = await update_sensors(vue, [Scale.MONTH.value])
-                apply_api_update_debounce(
-                    updated_month_data,
-                    LAST_MONTH_DATA,
-                    "month",
-                )
-                LAST_MONTH_DATA = updated_month_data
-            else:
-                # integrate the minute data
-                _LOGGER.info("Integrating minute data into month sensors")
-                if LAST_MINUTE_DATA:
-                    for identifier, data in LAST_MINUTE_DATA.items():
-                        device_gid, channel_gid, _ = identifier.split("-")
-                        month_id: str = f"{device_gid}-{channel_gid}-{Scale.MONTH.value}"
-                        if (
-                            data
-                            and LAST_MONTH_DATA
-                            and month_id in LAST_MONTH_DATA
-                            and LAST_MONTH_DATA[month_id]
-                            and "usage" in LAST_MONTH_DATA[month_id]
-                            and LAST_MONTH_DATA[month_id]["usage"] is not None
-                        ):
-                            # if we just passed the billing cycle start, reset back to zero
-                            timestamp: datetime = data["timestamp"]
-                            await check_for_new_month(timestamp, int(device_gid), month_id)
-
-                            LAST_MONTH_DATA[month_id]["usage"] += data[
-                                "usage"
-                            ]  # already in kwh
-            return LAST_MONTH_DATA
-
+        timings["devices"] = time.monotonic() - phase_start
+
+        # The saved totals make the day and month sensors available right away,
+        # their API true-up is left to the polling after setup
+        totals_store = VueTotalsStore(hass, entry.entry_id)
+        restored_totals = await totals_store.async_load(
+            email,
+            runtime.devices,
+            {"day": Scale.DAY.value, "month": Scale.MONTH.value},
+        )
+        true_up_deferred = False
+        if restored_totals:
+            _LOGGER.debug("Restored the saved day and month totals")
+            if "day" in restored_totals:
+                runtime.last_day_data, runtime.last_day_update = restored_totals["day"]
+            if "month" in restored_totals:
+                runtime.last_month_data, runtime.last_month_update = restored_totals[
+                    "month"
+                ]
+            true_up_deferred = True
+
+        def refresh_from_usage(scale: str) -> Callable[[], Awaitable[dict]]:
+            """Build an update method that refreshes the shared usage fetch."""
+
+            async def async_refresh_scale() -> dict:
+                await usage_coordinator.async_request_refresh()
+                if not usage_coordinator.last_update_success:
+                    raise UpdateFailed(str(usage_coordinator.last_exception))
+                return usage_coordinator.data[scale]
+
+            return async_refresh_scale
+
+        # The per-scale coordinators have no timer of their own, they are fed by
+        # the usage coordinator so all scales are fetched together on one tick.
+        # They only write the state of the sensors whose usage or reset changed.
         coordinator_1min = None
         if ENABLE_1M not in entry_data or entry_data[ENABLE_1M]:
-            coordinator_1min = DataUpdateCoordinator(
+            coordinator_1min = ChangeNotifyingCoordinator(
                 hass,
                 _LOGGER,
                 # Name of the data. For logging purposes.
                 name="sensor",
-                update_method=async_update_data_1min,
-                # Polling interval. Will only be polled if there are subscribers.
-                update_interval=timedelta(minutes=1),
+                update_method=refresh_from_usage(Scale.MINUTE.value),
+                snapshot=usage_snapshot,
             )
-            await coordinator_1min.async_config_entry_first_refresh()
-            _LOGGER.debug("1min Update data: %s", coordinator_1min.data)
         coordinator_1mon = None
         if ENABLE_1MON not in entry_data or entry_data[ENABLE_1MON]:
-            coordinator_1mon = DataUpdateCoordinator(
+            coordinator_1mon = ChangeNotifyingCoordinator(
                 hass,
                 _LOGGER,
                 # Name of the data. For logging purposes.
                 name="sensor",
-                update_method=async_update_month_sensors,
-                # Polling interval. Will only be polled if there are subscribers.
-                update_interval=timedelta(minutes=1),
+                update_method=refresh_from_usage(Scale.MONTH.value),
+                snapshot=usage_snapshot,
             )
-            await coordinator_1mon.async_config_entry_first_refresh()
-            _LOGGER.debug("1mon Update data: %s", coordinator_1mon.data)
-
         coordinator_day_sensor = None
         if ENABLE_1D not in entry_data or entry_data[ENABLE_1D]:
-            coordinator_day_sensor = DataUpdateCoordinator(
+            coordinator_day_sensor = ChangeNotifyingCoordinator(
                 hass,
                 _LOGGER,
                 # Name of the data. For logging purposes.
                 name="sensor",
-                update_method=async_update_day_sensors,
-                # Polling interval. Will only be polled if there are subscribers.
-                update_interval=timedelta(minutes=1),
-            )
-            await coordinator_day_sensor.async_config_entry_first_refresh()
-
-        # Setup custom services
-        async def handle_set_charger_current(call) -> None:
-            """Handle setting the EV Charger current."""
-            _LOGGER.debug(
-                "executing set_charger_current: %s %s",
-                str(call.service),
-                str(call.data),
-            )
-            current = call.data.get("current")
-            current = int(current)
-            device_id: str | list[str] | None = call.data.get("device_id", None)
-            entity_id: str | list[str] | None = call.data.get("entity_id", None)
-
-            # if device or entity ids are strings, convert to list
-            if isinstance(device_id, str):
-                device_id = [device_id]
-            if isinstance(entity_id, str):
-                entity_id = [entity_id]
-
-            # technically we should loop through all the passed device and entities and update all
-            # but for now we'll just use the first one
-            charger_entity: er.RegistryEntry | None = None
-            entity_registry: er.EntityRegistry = er.async_get(hass)
-            if device_id:
-                entities: list[er.RegistryEntry] = er.async_entries_for_device(
-                    entity_registry, device_id[0]
+                update_method=refresh_from_usage(Scale.DAY.value),
+                snapshot=usage_snapshot,
+            )
+
+        scale_coordinators: dict[str, DataUpdateCoordinator] = {}
+        if coordinator_1min:
+            scale_coordinators[Scale.MINUTE.value] = coordinator_1min
+        if coordinator_day_sensor:
+            scale_coordinators[Scale.DAY.value] = coordinator_day_sensor
+        if coordinator_1mon:
+            scale_coordinators[Scale.MONTH.value] = coordinator_1mon
+
+        async def async_update_day_sensors(updated_day_data: dict | None) -> dict:
+            if updated_day_data is not None:
+                _LOGGER.info("Updating day sensors")
+                apply_api_update_debounce(
+                    updated_day_data, runtime.last_day_data, "day"
                 )
-                for entity in entities:
-                    _LOGGER.info("Entity is %s", str(entity))
-                    if entity.entity_id.startswith("switch"):
-                        charger_entity = entity
-                        break
-                if not charger_entity and entities:
-                    charger_entity = entities[0]
-            elif entity_id:
-                charger_entity = entity_registry.async_get(entity_id[0])
-            if not charger_entity:
-                raise HomeAssistantError("Target device or Entity required.")
-
-            unique_entity_id: str = charger_entity.unique_id
-            gid_match: re.Match[str] | None = re.search(r"\d+", unique_entity_id)
-            if not gid_match:
-                raise HomeAssistantError(
-                    f"Could not find device gid from unique id {unique_entity_id}"
+                runtime.last_day_data = updated_day_data
+            elif runtime.last_minute_data and runtime.last_day_data:
+                # integrate the minute data, resetting back to zero after midnight
+                _LOGGER.info("Integrating minute data into day sensors")
+                runtime.day_accumulator = integrate_minute_data(
+                    runtime,
+                    runtime.day_accumulator,
+                    runtime.last_day_data,
+                    Scale.DAY.value,
+                    DeviceResetSchedule.day_reset,
                 )
+            return runtime.last_day_data
 
-            charger_gid = int(gid_match.group(0))
-            if (
-                charger_gid not in DEVICE_INFORMATION
-                or not DEVICE_INFORMATION[charger_gid].ev_charger
+        async def async_update_month_sensors(updated_month_data: dict | None) -> dict:
+            if updated_month_data is not None:
+                _LOGGER.info("Updating month sensors")
+                apply_api_update_debounce(
+                    updated_month_data,
+                    runtime.last_month_data,
+                    "month",
+                )
+                runtime.last_month_data = updated_month_data
+            elif runtime.last_minute_data and runtime.last_month_data:
+                # integrate the minute data, resetting back to zero when the billing
+                # cycle starts
+                _LOGGER.info("Integrating minute data into month sensors")
+                runtime.month_accumulator = integrate_minute_data(
+                    runtime,
+                    runtime.month_accumulator,
+                    runtime.last_month_data,
+                    Scale.MONTH.value,
+                    DeviceResetSchedule.month_reset,
+                )
+            return runtime.last_month_data
+
+        minute_timing = PollTimingStats(timedelta(minutes=1))
+
+        async def async_update_usage() -> dict[str, dict[str, Any]]:
+            """Fetch every scale that is due on this tick in one concurrent batch.
+
+            Minute data is fetched on every tick. Day and month data only go to the
+            API when their true-up is due, otherwise they integrate the minute data.
+            """
+            nonlocal true_up_deferred
+            now: datetime = datetime.now(UTC)
+            due_scales: list[str] = []
+            if coordinator_1min:
+                due_scales.append(Scale.MINUTE.value)
+            # restored totals aren't trued up on the first tick, which setup waits on
+            if coordinator_day_sensor and (
+                not runtime.last_day_update
+                or (
+                    not true_up_deferred
+                    and (now - runtime.last_day_update) > timedelta(minutes=15)
+                )
             ):
-                raise HomeAssistantError(
-                    "Set Charging Current called on invalid device with entity id"
-                    f" {charger_entity.entity_id} (unique id {unique_entity_id})"
+                due_scales.append(Scale.DAY.value)
+            if coordinator_1mon and (
+                not runtime.last_month_update
+                or (
+                    not true_up_deferred
+                    and (now - runtime.last_month_update) > timedelta(minutes=30)
                 )
+            ):
+                due_scales.append(Scale.MONTH.value)
 
-            state = hass.states.get(charger_entity.entity_id)
-            _LOGGER.info("State is %s", str(state))
-            if not state:
-                raise HomeAssistantError(
-                    f"Could not find state for entity {charger_entity.entity_id}"
+            fetched: dict[str, dict[str, Any]] = await update_sensors(
+                runtime, client, due_scales
+            )
+            # only a true-up that came back pushes the next one out
+            if Scale.DAY.value in fetched:
+                runtime.last_day_update = now
+            if Scale.MONTH.value in fetched:
+                runtime.last_month_update = now
+
+            usage: dict[str, dict[str, Any]] = {}
+            if coordinator_1min:
+                # store this, then have the daily sensors pull from it and integrate
+                # then the daily can "true up" every 15 minutes in case it's incorrect
+                minute_data = fetched[Scale.MINUTE.value]
+                if minute_data:
+                    runtime.last_minute_data = minute_data
+                    data_time = next(iter(minute_data.values())).timestamp
+                    minute_timing.record(now, data_time)
+                    if minute_history is not None:
+                        await async_record_minute_history(
+                            hass, minute_history, minute_data, data_time
+                        )
+                    usage_filter.apply(minute_data, Scale.MINUTE.value)
+                usage[Scale.MINUTE.value] = minute_data
+            if coordinator_day_sensor:
+                usage[Scale.DAY.value] = await async_update_day_sensors(
+                    fetched.get(Scale.DAY.value)
+                )
+            if coordinator_1mon:
+                usage[Scale.MONTH.value] = await async_update_month_sensors(
+                    fetched.get(Scale.MONTH.value)
+                )
+            true_up_deferred = False
+            if coordinator_day_sensor or coordinator_1mon:
+                totals_store.async_schedule_save(email, saved_totals)
+            return usage
+
+        def saved_totals() -> dict[str, UsageTotals]:
+            """Return the totals to save, read when the save happens."""
+            totals: dict[str, UsageTotals] = {}
+            if coordinator_day_sensor and runtime.last_day_data:
+                totals["day"] = UsageTotals(
+                    runtime.last_day_data, runtime.last_day_update
                 )
-            charger_info: VueDevice = DEVICE_INFORMATION[charger_gid]
-            if charger_info.ev_charger is None:
-                raise HomeAssistantError(
-                    f"Could not find charger info for device {charger_gid}"
+            if coordinator_1mon and runtime.last_month_data:
+                totals["month"] = UsageTotals(
+                    runtime.last_month_data, runtime.last_month_update
                 )
-            # Scale the current to a minimum of 6 amps and max of the circuit max
-            current: int = max(6, current)
-            current = min(current, charger_info.ev_charger.max_charging_rate)
+            return totals
+
+        min_poll_interval = timedelta(
+            seconds=entry_data.get(MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)
+        )
+        max_poll_interval = timedelta(
+            seconds=entry_data.get(MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)
+        )
+        usage_coordinator = AdaptiveDataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            # Name of the data. For logging purposes.
+            name="usage",
+            update_method=async_update_usage,
+            # Polls every minute, adapting to the API latency and errors. Will only
+            # be polled if there are subscribers.
+            poll_interval=AdaptivePollInterval(
+                timedelta(minutes=1), min_poll_interval, max_poll_interval
+            ),
+            # Poll just after Emporia closes each minute bucket to get the freshest
+            # complete data in one request
+            alignment=ClockAlignment(
+                timedelta(minutes=1),
+                timedelta(seconds=entry_data.get(POLL_OFFSET, DEFAULT_POLL_OFFSET)),
+                timedelta(seconds=entry_data.get(POLL_JITTER, DEFAULT_POLL_JITTER)),
+            ),
+        )
+
+        # fills the hourly statistics the outage left empty once polling recovers
+        statistics_backfill = StatisticsBackfill(hass, entry, client)
+        usage_failing = False
+
+        @callback
+        def async_dispatch_usage() -> None:
+            """Feed each per-scale coordinator from the shared usage fetch."""
+            nonlocal usage_failing
+            if usage_coordinator.last_update_success == usage_failing:
+                usage_failing = not usage_coordinator.last_update_success
+                if not usage_failing and coordinator_1min:
+                    statistics_backfill.async_schedule(
+                        get_channel_index(runtime, Scale.MINUTE.value)
+                    )
+            for scale, coordinator in scale_coordinators.items():
+                if usage_coordinator.last_update_success and usage_coordinator.data:
+                    coordinator.async_set_updated_data(usage_coordinator.data[scale])
+                elif coordinator.last_update_success:
+                    coordinator.last_update_success = False
+                    coordinator.last_exception = usage_coordinator.last_exception
+                    coordinator.async_update_listeners()
+
+        # the dispatcher is the only subscriber of the usage coordinator, it keeps
+        # the shared poll running for as long as the entry is loaded
+        entry.async_on_unload(
+            usage_coordinator.async_add_listener(async_dispatch_usage)
+        )
+
+        coordinator_1s = None
+        if entry_data.get(ENABLE_1S, False):
+            second_data, second_channels = build_second_sensor_data(
+                runtime, entry_data.get(SECOND_CHANNELS)
+            )
+            second_gids: list[str] = sorted(
+                {str(gid) for _, gid, _, _, _ in second_channels}
+            )
             _LOGGER.info(
-                "Setting charger %s to current of %d amps", charger_gid, current
+                "Polling %s channels every second from devices %s",
+                len(second_channels),
+                second_gids,
             )
 
-            try:
-                updated_charger: ChargerDevice = await loop.run_in_executor(
-                    None,
-                    vue.update_charger,
-                    charger_info.ev_charger,
-                    state.state == "on",
-                    current,
+            async def async_update_1s() -> dict:
+                """Fetch the per second power of the selected channels."""
+                data = await update_second_sensors(
+                    runtime, client, second_gids, second_data, second_channels
                 )
-                DEVICE_INFORMATION[charger_gid].ev_charger = updated_charger
-                # update the state of the charger entity using the updated data
-                state: State | None = hass.states.get(charger_entity.entity_id)
-                if state:
-                    new_state: str = "on" if updated_charger.charger_on else "off"
-                    new_attributes: dict = state.attributes.copy()
-                    new_attributes["charging_rate"] = updated_charger.charging_rate
-                    # good enough for now, update the state in the registry
-                    hass.states.async_set(
-                        charger_entity.entity_id, new_state, new_attributes
-                    )
+                usage_filter.apply(data, Scale.SECOND.value)
+                return data
+
+            coordinator_1s = AdaptiveDataUpdateCoordinator(
+                hass,
+                _LOGGER,
+                # Name of the data. For logging purposes.
+                name="sensor_1s",
+                update_method=async_update_1s,
+                # Backs off while the API is slow or failing.
+                # Will only be polled if there are subscribers.
+                poll_interval=AdaptivePollInterval(
+                    timedelta(seconds=1), timedelta(seconds=1), max_poll_interval
+                ),
+                snapshot=usage_snapshot,
+            )
+
+        coordinator_switch = None
+        if any(
+            device.outlet or device.ev_charger for device in runtime.devices.values()
+        ):
+
+            async def async_update_switches() -> dict[str, Any]:
+                return await update_switches(client)
+
+            coordinator_switch = AdaptiveDataUpdateCoordinator(
+                hass,
+                _LOGGER,
+                # Name of the data. For logging purposes.
+                name="switch",
+                update_method=async_update_switches,
+                # Polls every minute, adapting to the API latency, errors and how
+                # often the switches change. Will only be polled if there are
+                # subscribers.
+                poll_interval=AdaptivePollInterval(
+                    timedelta(minutes=1), min_poll_interval, max_poll_interval
+                ),
+                change_ratio=switch_change_ratio,
+                snapshot=switch_snapshot,
+            )
 
-            except requests.exceptions.HTTPError as err:
-                _LOGGER.error(
-                    "Error updating charger status: %s \nResponse body: %s",
-                    err,
-                    err.response.text,
+        # the first refreshes are independent API calls, run them side by side
+        phase_start = time.monotonic()
+        first_refreshes = [
+            async_timed_refresh(
+                "usage", usage_coordinator.async_config_entry_first_refresh()
+            )
+        ]
+        if coordinator_1s:
+            first_refreshes.append(
+                async_timed_refresh(
+                    "1s", coordinator_1s.async_config_entry_first_refresh()
                 )
-                raise
+            )
+        if coordinator_switch:
+            # the switches are optional, a failure there doesn't fail the setup
+            first_refreshes.append(
+                async_timed_refresh("switch", coordinator_switch.async_refresh())
+            )
+        await asyncio.gather(*first_refreshes)
+        timings["first refresh"] = time.monotonic() - phase_start
+        if coordinator_1min and usage_coordinator.last_update_success:
+            # Home Assistant itself may have been down, fill what it missed
+            statistics_backfill.async_schedule(
+                get_channel_index(runtime, Scale.MINUTE.value)
+            )
 
-        hass.services.async_register(
-            DOMAIN, "set_charger_current", handle_set_charger_current
+        import_days: int = entry_data.get(
+            IMPORT_HISTORY_DAYS, DEFAULT_IMPORT_HISTORY_DAYS
         )
+        if import_days:
+            # the first run imports the history, the later ones add the new hours
+            history_importer = HistoryImporter(hass, entry, client, import_days)
+
+            @callback
+            def async_schedule_import(_: datetime | None = None) -> None:
+                history_importer.async_schedule(runtime.devices, runtime.invert_solar)
+
+            async_schedule_import()
+            entry.async_on_unload(
+                async_track_time_interval(
+                    hass, async_schedule_import, timedelta(hours=1)
+                )
+            )
+
+        if coordinator_1min:
+            _LOGGER.debug("1min Update data: %s", coordinator_1min.data)
+        if coordinator_1mon:
+            _LOGGER.debug("1mon Update data: %s", coordinator_1mon.data)
 
+    except ConfigEntryAuthFailed:
+        raise
     except Exception as err:
         _LOGGER.warning("Exception while setting up Emporia Vue. Will retry. %s", err)
         raise ConfigEntryNotReady(
@@ -382,20 +769,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data[DOMAIN][entry.entry_id] = {
         VUE_DATA: vue,
+        VUE_CLIENT: client,
+        VUE_DEVICES: runtime.devices,
+        VUE_RUNTIME: runtime,
+        "coordinator_usage": usage_coordinator,
+        "minute_timing": minute_timing,
+        "coordinator_1s": coordinator_1s,
         "coordinator_1min": coordinator_1min,
         "coordinator_1mon": coordinator_1mon,
         "coordinator_day_sensor": coordinator_day_sensor,
+        "coordinator_switch": coordinator_switch,
+        "usage_filter": usage_filter,
+        "minute_history": minute_history,
     }
 
+    phase_start = time.monotonic()
     try:
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     except Exception as err:
         _LOGGER.warning("Error setting up platforms: %s", err)
         raise ConfigEntryNotReady(f"Error setting up platforms: {err}") from err
+    timings["platforms"] = time.monotonic() - phase_start
+    _LOGGER.debug(
+        "Set up Emporia Vue in %.3fs (%s)",
+        time.monotonic() - setup_start,
+        ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in timings.items()),
+    )
+
+    if cached_devices is not None:
+        entry.async_create_background_task(
+            hass, async_revalidate_devices(), "emporia_vue_revalidate_devices"
+        )
 
     return True
 
 
+async def async_password_login(
+    vue: PyEmVue, session_store: VueSessionStore, email: str, password: str
+) -> bool:
+    """Do a full login with the password and save the new session."""
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    result: bool = await loop.run_in_executor(None, vue.login, email, password)
+    if result:
+        session_store.async_save(vue, email)
+    return result
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok: bool = all(
@@ -407,46 +826,295 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        if entry_data["minute_history"] is not None:
+            await hass.async_add_executor_job(entry_data["minute_history"].close)
 
     return unload_ok
 
 
-async def update_sensors(vue: PyEmVue, scales: list[str]) -> dict:
-    """Fetch data from API endpoint."""
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved session and devices along with the config entry."""
+    await VueSessionStore(hass, entry.entry_id).async_remove()
+    await VueTopologyStore(hass, entry.entry_id).async_remove()
+    await hass.async_add_executor_job(remove_history, history_directory(hass, entry))
+    await import_store(hass, entry.entry_id).async_remove()
+    await VueTotalsStore(hass, entry.entry_id).async_remove()
+
+
+def history_directory(hass: HomeAssistant, entry: ConfigEntry) -> Path:
+    """Return the directory of the minute history ring files of the entry."""
+    return Path(hass.config.path(".storage", f"{DOMAIN}.{entry.entry_id}.history"))
+
+
+async def async_record_minute_history(
+    hass: HomeAssistant,
+    minute_history: MinuteHistory,
+    minute_data: dict[str, UsageRecord],
+    data_time: datetime,
+) -> None:
+    """Write the minute data to the history, a failure only costs the samples."""
+    try:
+        await hass.async_add_executor_job(minute_history.record, minute_data, data_time)
+    except OSError as err:
+        _LOGGER.warning("Failed to write the minute history: %s", err)
+
+
+async def update_switches(client: AsyncVueClient) -> dict[str, Any]:
+    """Fetch the state of the outlets and chargers, keyed by device gid."""
     try:
         # Note: asyncio.TimeoutError and aiohttp.ClientError are already
         # handled by the data update coordinator.
-        data: dict = {}
-        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-        for scale in scales:
-            utcnow: datetime = datetime.now(UTC)
-            usage_dict: dict[int, VueUsageDevice] = await loop.run_in_executor(
-                None, vue.get_device_list_usage, DEVICE_GIDS, utcnow, scale
-            )
-            if not usage_dict:
-                _LOGGER.warning(
-                    "No channels found during update for scale %s. Retrying", scale
-                )
-                usage_dict = await loop.run_in_executor(
-                    None, vue.get_device_list_usage, DEVICE_GIDS, utcnow, scale
-                )
-            if usage_dict:
-                flattened, data_time = flatten_usage_data(usage_dict, scale)
-                await parse_flattened_usage_data(
-                    flattened,
-                    scale,
-                    data,
-                    utcnow,
-                    data_time,
-                )
-            else:
-                raise UpdateFailed(f"No channels found during update for scale {scale}")
+        data: dict[str, Any] = {}
+        outlets: list[OutletDevice]
+        chargers: list[ChargerDevice]
+        (outlets, chargers) = await client.async_get_devices_status()
+        for outlet in outlets:
+            data[str(outlet.device_gid)] = outlet
+        for charger in chargers:
+            data[str(charger.device_gid)] = charger
+        return data
+    except Exception as err:
+        raise UpdateFailed(f"Error communicating with Emporia API: {err}") from err
+
+
+async def update_sensors(
+    runtime: VueRuntime, client: AsyncVueClient, scales: list[str]
+) -> dict[str, dict[str, Any]]:
+    """Fetch data from API endpoint for all of the scales concurrently.
+
+    Nothing is parsed until every scale was fetched, so a failed batch leaves
+    the minute records, which are reused from tick to tick, as they were.
+    """
+    try:
+        # Note: asyncio.TimeoutError and aiohttp.ClientError are already
+        # handled by the data update coordinator.
+        utcnow: datetime = datetime.now(UTC)
+        responses: list[
+            tuple[dict[int, VueUsageDevice], set[int]]
+        ] = await asyncio.gather(
+            *(fetch_usage_for_scale(runtime, client, scale, utcnow) for scale in scales)
+        )
+        results: dict[str, dict[str, Any]] = {}
+        for scale, (usage_dict, failed_gids) in zip(scales, responses, strict=True):
+            results[scale] = await parse_usage_for_scale(
+                runtime, usage_dict, scale, utcnow, failed_gids
+            )
+        return results
+    except Exception as err:
+        # the coordinator logs the first failure and the recovery, and backs off
+        _LOGGER.debug("Error communicating with Emporia API: %s", err)
+        raise UpdateFailed(f"Error communicating with Emporia API: {err}") from err
+
+
+async def fetch_usage_for_scale(
+    runtime: VueRuntime, client: AsyncVueClient, scale: str, utcnow: datetime
+) -> tuple[dict[int, VueUsageDevice], set[int]]:
+    """Fetch the usage of every device for a single scale.
+
+    The device gids are split into shards of the shard size which are fetched
+    concurrently, so a large account isn't limited by one huge request. A
+    failing shard only leaves its own devices without data for this tick, their
+    gids are returned along with the usage.
+    """
+    device_gids = runtime.device_gids
+    shard_size = runtime.shard_size
+    shards: list[list[str]] = [
+        device_gids[i : i + shard_size] for i in range(0, len(device_gids), shard_size)
+    ]
+    results: list[dict[int, VueUsageDevice] | BaseException] = await asyncio.gather(
+        *(fetch_usage_shard(client, shard, utcnow, scale) for shard in shards),
+        return_exceptions=True,
+    )
+    usage_dict: dict[int, VueUsageDevice] = {}
+    failed_gids: set[int] = set()
+    for shard, result in zip(shards, results, strict=True):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            _LOGGER.warning(
+                "Failed to fetch usage for devices %s at scale %s: %s",
+                shard,
+                scale,
+                result,
+            )
+            failed_gids.update(int(gid) for gid in shard)
+        else:
+            usage_dict.update(result)
+    if not usage_dict:
+        raise UpdateFailed(f"No channels found during update for scale {scale}")
+    return (usage_dict, failed_gids)
+
+
+async def parse_usage_for_scale(
+    runtime: VueRuntime,
+    usage_dict: dict[int, VueUsageDevice],
+    scale: str,
+    utcnow: datetime,
+    failed_gids: set[int],
+) -> dict[str, Any]:
+    """Parse the fetched usage of a single scale into usage records.
 
+    The minute records are reused from tick to tick and updated in place.
+    """
+    data: dict[str, UsageRecord] = (
+        runtime.last_minute_data if scale == Scale.MINUTE.value else {}
+    )
+    if runtime.columnar:
+        await parse_usage_columns(runtime, usage_dict, scale, data, utcnow, failed_gids)
         return data
+    flattened, data_time = flatten_usage_data(usage_dict, scale)
+    await parse_flattened_usage_data(
+        runtime,
+        flattened,
+        scale,
+        data,
+        utcnow,
+        data_time,
+        failed_gids,
+    )
+    return data
+
+
+async def fetch_usage_shard(
+    client: AsyncVueClient, device_gids: list[str], utcnow: datetime, scale: str
+) -> dict[int, VueUsageDevice]:
+    """Fetch the usage for one shard of devices, retrying once if nothing came back."""
+    usage_dict: dict[int, VueUsageDevice] = await client.async_get_device_list_usage(
+        device_gids, utcnow, scale
+    )
+    if not usage_dict:
+        _LOGGER.warning(
+            "No channels found during update for devices %s scale %s. Retrying",
+            device_gids,
+            scale,
+        )
+        usage_dict = await client.async_get_device_list_usage(
+            device_gids, utcnow, scale
+        )
+    if not usage_dict:
+        raise UpdateFailed(
+            f"No channels found during update for devices {device_gids} scale {scale}"
+        )
+    return usage_dict
+
+
+def build_second_sensor_data(
+    runtime: VueRuntime, selected_channels: Collection[str] | None
+) -> tuple[dict[str, Any], list[tuple[str, int, str, bool, bool]]]:
+    """Build the per second sensor data once, defaulting to the mains of each device.
+
+    Returns the data dictionary handed to the sensors along with the lookup
+    information for each channel, so a tick never has to rebuild either.
+    """
+    data: dict[str, Any] = {}
+    channels: list[tuple[str, int, str, bool, bool]] = []
+    for gid, info in runtime.devices.items():
+        for info_channel in info.channels:
+            channel_id = f"{gid}-{info_channel.channel_num}"
+            if selected_channels:
+                if channel_id not in selected_channels:
+                    continue
+            elif info_channel.channel_num != "1,2,3":
+                continue
+            identifier: str = make_channel_id(info_channel, Scale.SECOND.value)
+            data[identifier] = UsageRecord(
+                gid, info_channel.channel_num, Scale.SECOND.value, info
+            )
+            channels.append(
+                (
+                    identifier,
+                    gid,
+                    info_channel.channel_num,
+                    "bidirectional" in info_channel.type.lower(),
+                    info_channel.channel_type_gid == 13,
+                )
+            )
+    return (data, channels)
+
+
+async def update_second_sensors(
+    runtime: VueRuntime,
+    client: AsyncVueClient,
+    device_gids: list[str],
+    data: dict[str, Any],
+    channels: list[tuple[str, int, str, bool, bool]],
+) -> dict[str, Any]:
+    """Update the per second sensor data in place.
+
+    This skips flattening, time zone conversion and reset handling since none of
+    it applies to instantaneous power, and it only touches the selected channels.
+    A channel without a fresh reading keeps its previous value.
+    """
+    try:
+        usage_dict: dict[
+            int, VueUsageDevice
+        ] = await client.async_get_device_list_usage(
+            device_gids, datetime.now(UTC), Scale.SECOND.value, max_attempts=1
+        )
     except Exception as err:
-        _LOGGER.error("Error communicating with Emporia API: %s", err)
         raise UpdateFailed(f"Error communicating with Emporia API: {err}") from err
+    if not usage_dict:
+        raise UpdateFailed("No channels found during update for scale 1S")
+
+    for identifier, gid, channel_num, bidirectional, is_solar in channels:
+        usage_device: VueUsageDevice | None = usage_dict.get(gid)
+        if not usage_device:
+            continue
+        channel: VueDeviceChannelUsage | None = usage_device.channels.get(channel_num)
+        if not channel or channel.usage is None:
+            continue
+        data[identifier].update(
+            fix_usage_sign(
+                channel_num,
+                channel.usage,
+                bidirectional,
+                is_solar,
+                runtime.invert_solar,
+            ),
+            None,
+            usage_device.timestamp,
+        )
+    return data
+
+
+class UsageChannelStream:
+    """Stream every channel of a usage response, nested devices included.
+
+    The channels are yielded as (identifier, channel) pairs in the order the
+    recursive flatten used to visit them, without building a dict per level.
+    The newest timestamp seen is kept in newest.
+    """
+
+    def __init__(self, usage_devices: dict[int, VueUsageDevice], scale: str) -> None:
+        """Initialize."""
+        self._usage_devices = usage_devices
+        self._scale = scale
+        self.newest: datetime | None = None
+
+    def __iter__(self) -> Iterator[tuple[str, VueDeviceChannelUsage]]:
+        """Yield the channels depth first, nested devices right after their channel."""
+        scale = self._scale
+        for usage in self._usage_devices.values():
+            self._track_timestamp(usage)
+            pending: list[Iterator[VueDeviceChannelUsage]] = [
+                iter(usage.channels.values())
+            ]
+            while pending:
+                channel: VueDeviceChannelUsage | None = next(pending[-1], None)
+                if channel is None:
+                    pending.pop()
+                    continue
+                yield (f"{channel.device_gid}-{channel.channel_num}-{scale}", channel)
+                if channel.nested_devices:
+                    # pushed in reverse so the first nested device comes out first
+                    for nested in reversed(channel.nested_devices.values()):
+                        self._track_timestamp(nested)
+                        pending.append(iter(nested.channels.values()))
+
+    def _track_timestamp(self, usage: VueUsageDevice) -> None:
+        if usage.timestamp and (self.newest is None or usage.timestamp > self.newest):
+            self.newest = usage.timestamp
 
 
 def flatten_usage_data(
@@ -454,97 +1122,81 @@ def flatten_usage_data(
     scale: str,
 ) -> tuple[dict[str, VueDeviceChannelUsage], datetime]:
     """Flattens the raw usage data into a dictionary of channel ids and usage info."""
-    flattened: dict[str, VueDeviceChannelUsage] = {}
-    data_time: datetime = datetime.now(UTC)
-    for usage in usage_devices.values():
-        data_time = usage.timestamp or data_time
-        if usage.channels:
-            for channel in usage.channels.values():
-                identifier: str = make_channel_id(channel, scale)
-                flattened[identifier] = channel
-                if channel.nested_devices:
-                    nested_flattened, _ = flatten_usage_data(
-                        channel.nested_devices, scale
-                    )
-                    flattened.update(nested_flattened)
-    return (flattened, data_time)
+    stream = UsageChannelStream(usage_devices, scale)
+    flattened: dict[str, VueDeviceChannelUsage] = dict(stream)
+    return (flattened, stream.newest or datetime.now(UTC))
 
 
 async def parse_flattened_usage_data(
+    runtime: VueRuntime,
     flattened_data: dict[str, VueDeviceChannelUsage],
     scale: str,
     data: dict[str, Any],
     requested_time: datetime,
     data_time: datetime,
+    skipped_gids: Collection[int] = (),
 ) -> None:
-    """Loop through the device list and find the corresponding update data."""
-    unused_data: dict[str, VueDeviceChannelUsage] = flattened_data.copy()
-    for gid, info in DEVICE_INFORMATION.items():
-        local_time: datetime = await change_time_to_local(data_time, info.time_zone)
-        requested_time_local: datetime = await change_time_to_local(
-            requested_time, info.time_zone
-        )
-        if abs((local_time - requested_time_local).total_seconds()) > 30:
-            _LOGGER.warning(
-                "More than 30 seconds have passed between the requested datetime"
-                " and the returned datetime. Requested: %s Returned: %s",
-                requested_time,
-                data_time,
+    """Loop through the device list and find the corresponding update data.
+
+    Devices in skipped_gids had their usage request fail and are left out.
+    """
+    index: ChannelIndex = get_channel_index(runtime, scale)
+    usage_column = index.usage = zeroed_array(len(index.channels))
+    matched = 0
+    last_gid: int | None = None
+    local_time: datetime = data_time
+    reset_datetime: datetime | None = None
+    for slot, indexed in enumerate(index.channels):
+        gid = indexed.device_gid
+        if gid in skipped_gids:
+            clear_usage_record(data, indexed)
+            continue
+        if gid != last_gid:
+            # the index is grouped by device, these are the same for all its channels
+            last_gid = gid
+            local_time, reset_datetime = device_times(
+                indexed.schedule, scale, requested_time, data_time
             )
-        for info_channel in info.channels:
-            identifier: str = make_channel_id(info_channel, scale)
-            channel_num = info_channel.channel_num
-            channel: VueDeviceChannelUsage | None = flattened_data.get(identifier)
-            if not channel:
-                _LOGGER.info(
-                    "Could not find usage info for device %s channel %s",
-                    gid,
-                    channel_num,
-                )
-            unused_data.pop(identifier, None)
-            reset_datetime: datetime | None = None
-
-            if scale in [Scale.DAY.value, Scale.MONTH.value]:
-                # We need to know when the value reset
-                # For day, that should be midnight local time, but we need to use the timestamp
-                # returnedto us for month, that should be midnight of the reset day they specify
-                # in the app
-                reset_datetime = determine_reset_datetime(
-                    local_time,
-                    info.billing_cycle_start_day,
-                    scale == Scale.MONTH.value,
-                )
 
-            # Fix the usage if we got None
-            # Use the last value if we have it, otherwise use zero
-            fixed_usage: float = channel.usage if channel else 0.0
-            if fixed_usage is None:
-                fixed_usage = handle_none_usage(scale, identifier)
-                _LOGGER.info(
-                    "Got None usage for device %s channel %s scale %s and timestamp %s. "
-                    "Instead using a value of %s",
-                    gid,
-                    channel_num,
-                    scale,
-                    local_time.isoformat(),
-                    fixed_usage,
-                )
+        identifier: str = indexed.identifier
+        channel: VueDeviceChannelUsage | None = flattened_data.get(identifier)
+        if channel:
+            matched += 1
+        else:
+            _LOGGER.info(
+                "Could not find usage info for device %s channel %s",
+                gid,
+                indexed.channel_num,
+            )
+
+        # Fix the usage if we got None
+        # Use the last value if we have it, otherwise use zero
+        fixed_usage: float = channel.usage if channel else 0.0
+        if fixed_usage is None:
+            fixed_usage = handle_none_usage(runtime, scale, identifier)
+            _LOGGER.info(
+                "Got None usage for device %s channel %s scale %s and timestamp %s. "
+                "Instead using a value of %s",
+                gid,
+                indexed.channel_num,
+                scale,
+                local_time.isoformat(),
+                fixed_usage,
+            )
 
-            bidirectional = "bidirectional" in info_channel.type.lower()
-            is_solar = info_channel.channel_type_gid == 13
-            fixed_usage = fix_usage_sign(
-                channel_num, fixed_usage, bidirectional, is_solar, INVERT_SOLAR
-            )
-
-            data[identifier] = {
-                "device_gid": gid,
-                "channel_num": channel_num,
-                "usage": fixed_usage,
-                "scale": scale,
-                "info": info,
-                "reset": reset_datetime,
-                "timestamp": local_time,
-            }
+        fixed_usage = apply_usage_sign(fixed_usage, indexed.sign_policy)
+        usage_column[slot] = fixed_usage
+        set_usage_record(data, indexed, scale, fixed_usage, reset_datetime, local_time)
+    if matched < len(flattened_data):
+        unused_data: dict[str, VueDeviceChannelUsage] = {
+            identifier: channel
+            for identifier, channel in flattened_data.items()
+            if identifier not in index.identifiers
+            and (channel.device_gid, channel.channel_num)
+            not in runtime.ignored_channels
+        }
+    else:
+        unused_data = {}
     if unused_data:
         # unused_data is not json serializable because VueDeviceChannelUsage
         # is not JSON serializable instead print out dictionary as a string
@@ -552,38 +1204,263 @@ async def parse_flattened_usage_data(
             "Unused data found during update. Unused data: %s",
             str(unused_data),
         )
-        channels_were_added = False
-        for channel in unused_data.values():
-            channels_were_added |= await handle_special_channels_for_device(channel)
-            # we'll also need to register these entities I think. They might show up
-            # automatically on the first run When we're done handling the unused data
-            # we need to rerun the update
-        if channels_were_added:
-            _LOGGER.info("Rerunning update due to added channels")
-            await parse_flattened_usage_data(
-                flattened_data, scale, data, requested_time, data_time
-            )
-
-
-async def handle_special_channels_for_device(channel: VueDeviceChannel) -> bool:
-    """Handle the special channels for a device, if they exist."""
-    if channel.device_gid in DEVICE_INFORMATION:
-        device_info: VueDevice = DEVICE_INFORMATION[channel.device_gid]
+        await parse_added_channels(
+            runtime,
+            index,
+            list(unused_data.values()),
+            scale,
+            data,
+            requested_time,
+            data_time,
+        )
+
+
+async def parse_usage_columns(
+    runtime: VueRuntime,
+    usage_devices: dict[int, VueUsageDevice],
+    scale: str,
+    data: dict[str, Any],
+    requested_time: datetime,
+    skipped_gids: Collection[int] = (),
+) -> None:
+    """Parse the usage like parse_flattened_usage_data, but column by column.
+
+    The response is laid out in the slots of the channel index and sign fixed as
+    a whole. Only the slots without usage are visited one by one, the records are
+    then updated a device range at a time straight from the column.
+    """
+    index: ChannelIndex = get_channel_index(runtime, scale)
+    columns = UsageColumns(index, usage_devices)
+    data_time: datetime = columns.data_time
+    usage_column = index.usage = columns.usage
+    times: dict[int, tuple[datetime, datetime | None]] = {}
+    for gid, start, end, schedule in index.device_ranges:
+        if gid in skipped_gids:
+            for indexed in index.channels[start:end]:
+                clear_usage_record(data, indexed)
+            usage_column[start:end] = zeroed_array(end - start)
+        else:
+            times[gid] = device_times(schedule, scale, requested_time, data_time)
+
+    for slot in columns.missing:
+        indexed = index.channels[slot]
+        if indexed.device_gid in times:
+            _LOGGER.info(
+                "Could not find usage info for device %s channel %s",
+                indexed.device_gid,
+                indexed.channel_num,
+            )
+    for slot in columns.none_slots:
+        indexed = index.channels[slot]
+        if indexed.device_gid not in times:
+            continue
+        # Use the last value if we have it, otherwise use zero
+        fixed_usage: float = handle_none_usage(runtime, scale, indexed.identifier)
+        _LOGGER.info(
+            "Got None usage for device %s channel %s scale %s and timestamp %s. "
+            "Instead using a value of %s",
+            indexed.device_gid,
+            indexed.channel_num,
+            scale,
+            times[indexed.device_gid][0].isoformat(),
+            fixed_usage,
+        )
+        usage_column[slot] = apply_usage_sign(fixed_usage, indexed.sign_policy)
+
+    usage_values: list[float] = usage_column.tolist()
+    for gid, start, end, _schedule in index.device_ranges:
+        if gid in times:
+            local_time, reset_datetime = times[gid]
+            set_usage_records(
+                data,
+                index,
+                start,
+                end,
+                scale,
+                usage_values[start:end],
+                reset_datetime,
+                local_time,
+            )
+    unused: list[VueDeviceChannelUsage] = [
+        channel
+        for channel in columns.unused
+        if (channel.device_gid, channel.channel_num) not in runtime.ignored_channels
+    ]
+    if unused:
+        _LOGGER.info(
+            "Unused data found during update. Unused data: %s",
+            str(unused),
+        )
+        await parse_added_channels(
+            runtime, index, unused, scale, data, requested_time, data_time
+        )
+
+
+async def parse_added_channels(
+    runtime: VueRuntime,
+    index: ChannelIndex,
+    unused: list[VueDeviceChannelUsage],
+    scale: str,
+    data: dict[str, Any],
+    requested_time: datetime,
+    data_time: datetime,
+) -> None:
+    """Add the special channels found in the unused data and parse only those.
+
+    The channels that can't be added are remembered in the ignored channels so
+    the following updates don't look at them again.
+    """
+    added: dict[tuple[int, str], VueDeviceChannelUsage] = {}
+    for channel in unused:
+        key = (channel.device_gid, channel.channel_num)
+        if key in added:
+            continue
+        if await handle_special_channels_for_device(runtime, channel, index):
+            added[key] = channel
+        else:
+            runtime.ignored_channels.add(key)
+    if not added:
+        return
+    _LOGGER.info("Parsing the %s added channels", len(added))
+    index = reindex_channels(runtime, scale, index)
+    for key, channel in added.items():
+        slot: int = index.slots[key]
+        indexed: IndexedChannel = index.channels[slot]
+        local_time, reset_datetime = device_times(
+            indexed.schedule, scale, requested_time, data_time
+        )
+        fixed_usage: float | None = channel.usage
+        if fixed_usage is None:
+            fixed_usage = handle_none_usage(runtime, scale, indexed.identifier)
+        fixed_usage = apply_usage_sign(fixed_usage, indexed.sign_policy)
+        index.usage[slot] = fixed_usage
+        set_usage_record(data, indexed, scale, fixed_usage, reset_datetime, local_time)
+
+
+def set_usage_record(
+    data: dict[str, UsageRecord],
+    indexed: IndexedChannel,
+    scale: str,
+    usage: float,
+    reset: datetime | None,
+    timestamp: datetime,
+) -> None:
+    """Update the record of the channel in place, or add it if it is new."""
+    record: UsageRecord | None = data.get(indexed.identifier)
+    if record is None:
+        data[indexed.identifier] = UsageRecord(
+            indexed.device_gid,
+            indexed.channel_num,
+            scale,
+            indexed.info,
+            usage,
+            reset,
+            timestamp,
+        )
+    else:
+        record.update(usage, reset, timestamp)
+
+
+def set_usage_records(
+    data: dict[str, UsageRecord],
+    index: ChannelIndex,
+    start: int,
+    end: int,
+    scale: str,
+    usages: list[float],
+    reset: datetime | None,
+    timestamp: datetime,
+) -> None:
+    """Update the records of a range of slots in place, or add them all if new."""
+    records: list[UsageRecord | None] = list(
+        map(data.get, index.slot_identifiers[start:end])
+    )
+    if None not in records:
+        for record, usage in zip(records, usages, strict=True):
+            record.update(usage, reset, timestamp)
+        return
+    channels: list[IndexedChannel] = index.channels[start:end]
+    if all(record is None for record in records):
+        data.update(
+            (
+                indexed.identifier,
+                UsageRecord(
+                    indexed.device_gid,
+                    indexed.channel_num,
+                    scale,
+                    indexed.info,
+                    usage,
+                    reset,
+                    timestamp,
+                ),
+            )
+            for indexed, usage in zip(channels, usages, strict=True)
+        )
+        return
+    for indexed, usage in zip(channels, usages, strict=True):
+        set_usage_record(data, indexed, scale, usage, reset, timestamp)
+
+
+def clear_usage_record(data: dict[str, UsageRecord], indexed: IndexedChannel) -> None:
+    """Clear the usage of a reused record whose device has no data this tick."""
+    record: UsageRecord | None = data.get(indexed.identifier)
+    if record is not None:
+        record.update(None, record.reset, record.timestamp)
+
+
+def device_times(
+    schedule: DeviceResetSchedule,
+    scale: str,
+    requested_time: datetime,
+    data_time: datetime,
+) -> tuple[datetime, datetime | None]:
+    """Return the local data time of a device and when its usage for the scale reset."""
+    local_time: datetime = schedule.to_local(data_time)
+    requested_time_local: datetime = schedule.to_local(requested_time)
+    if abs((local_time - requested_time_local).total_seconds()) > 30:
+        _LOGGER.warning(
+            "More than 30 seconds have passed between the requested datetime"
+            " and the returned datetime. Requested: %s Returned: %s",
+            requested_time,
+            data_time,
+        )
+    # We need to know when the value reset
+    # For day, that should be midnight local time, but we need to use the timestamp
+    # returnedto us for month, that should be midnight of the reset day they specify
+    # in the app
+    reset_datetime: datetime | None = None
+    if scale == Scale.DAY.value:
+        reset_datetime = schedule.day_reset(data_time)
+    elif scale == Scale.MONTH.value:
+        reset_datetime = schedule.month_reset(data_time)
+    return (local_time, reset_datetime)
+
+
+async def handle_special_channels_for_device(
+    runtime: VueRuntime, channel: VueDeviceChannel, index: ChannelIndex
+) -> bool:
+    """Handle the special channels for a device, if they exist.
+
+    The index has to be built from the current devices of the runtime, it is used
+    to look up whether the device already has the channel.
+    """
+    if channel.device_gid in runtime.devices:
+        device_info: VueDevice = runtime.devices[channel.device_gid]
         # if channel.channel_num in [
         #     "MainsFromGrid",
         #     "MainsToGrid",
         #     "Balance",
         #     "TotalUsage",
         # ]:
-        found = False
-        channel_123: VueDeviceChannel | None = None
-        for device_channel in device_info.channels:
-            if device_channel.channel_num == channel.channel_num:
-                found = True
-                break
-            if device_channel.channel_num == "1,2,3":
-                channel_123 = device_channel
-        if not found:
+        if (channel.device_gid, channel.channel_num) not in index.slots:
+            channel_123: VueDeviceChannel | None = next(
+                (
+                    device_channel
+                    for device_channel in device_info.channels
+                    if device_channel.channel_num == "1,2,3"
+                ),
+                None,
+            )
             _LOGGER.info(
                 "Adding channel for channel %s-%s",
                 channel.device_gid,
@@ -604,11 +1481,37 @@ async def handle_special_channels_for_device(channel: VueDeviceChannel) -> bool:
                     channelTypeGid=type_gid,
                 )
             )
-
             return True
     return False
 
 
+def get_channel_index(runtime: VueRuntime, scale: str) -> ChannelIndex:
+    """Return the channel index for the scale, building it if needed."""
+    if scale not in runtime.channel_indexes:
+        runtime.channel_indexes[scale] = build_channel_index(
+            runtime.devices, runtime.reset_schedules, scale, runtime.invert_solar
+        )
+    return runtime.channel_indexes[scale]
+
+
+def reindex_channels(
+    runtime: VueRuntime, scale: str, previous: ChannelIndex
+) -> ChannelIndex:
+    """Rebuild the channel indexes to pick up added channels.
+
+    The usage column of the previous index is carried over to the new slots, the
+    indexes of the other scales are rebuilt when they are next used.
+    """
+    runtime.channel_indexes.clear()
+    index: ChannelIndex = get_channel_index(runtime, scale)
+    slots = index.slots
+    for slot, indexed in enumerate(previous.channels):
+        index.usage[slots[(indexed.device_gid, indexed.channel_num)]] = previous.usage[
+            slot
+        ]
+    return index
+
+
 def make_channel_id(channel: VueDeviceChannel, scale: str) -> str:
     """Format the channel id for a channel and scale."""
     return f"{channel.device_gid}-{channel.channel_num}-{scale}"
@@ -627,135 +1530,60 @@ def fix_usage_sign(
 
     (see https://github.com/magico13/ha-emporia-vue/issues/57)
     """
-    if is_solar:
-        # Energy dashboard wants solar to be positive, Emporia usually provides negative
-        if usage and invert_solar:
-            return -1 * usage
-        return usage
-
-    if usage and not bidirectional and channel_num not in ["1,2,3", "Balance"]:
-        # With bidirectionality, we need to also check if bidirectional. If yes,
-        # we either don't abs, or we flip the sign.
-        return abs(usage)
-    return usage
-
-
-async def change_time_to_local(time: datetime, tz_string: str) -> datetime:
-    """Change the datetime to the provided timezone, if not already."""
-    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-    tz_info: tzinfo | None = await loop.run_in_executor(
-        None, dateutil.tz.gettz, tz_string
+    return apply_usage_sign(
+        usage, usage_sign_policy(channel_num, bidirectional, is_solar, invert_solar)
     )
-    if not time.tzinfo or time.tzinfo.utcoffset(time) is None:
-        # unaware, assume it's already utc
-        time = time.replace(tzinfo=UTC)
-    return time.astimezone(tz_info)
-
-
-async def check_for_midnight(timestamp: datetime, device_gid: int, day_id: str):
-    """If midnight has recently passed, reset the LAST_DAY_DATA for Day sensors to zero."""
-    if device_gid in DEVICE_INFORMATION:
-        device_info: VueDevice = DEVICE_INFORMATION[device_gid]
-        local_time: datetime = await change_time_to_local(
-            timestamp, device_info.time_zone
-        )
-        local_midnight: datetime = local_time.replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        last_reset = LAST_DAY_DATA[day_id]["reset"]
-        if local_midnight > last_reset:
-            # New reset time found
-            _LOGGER.info(
-                "Midnight happened recently for id %s! Timestamp is %s, midnight is %s, "
-                "previous reset was %s",
-                day_id,
-                local_time,
-                local_midnight,
-                last_reset,
-            )
-            LAST_DAY_DATA[day_id]["usage"] = 0
-            LAST_DAY_DATA[day_id]["reset"] = local_midnight
-
 
-async def check_for_new_month(timestamp: datetime, device_gid: int, month_id: str):
-    """If a new billing cycle has started, reset the LAST_MONTH_DATA for Month sensors to zero."""
-    if device_gid in DEVICE_INFORMATION:
-        device_info: VueDevice = DEVICE_INFORMATION[device_gid]
-        local_time: datetime = await change_time_to_local(
-            timestamp, device_info.time_zone
-        )
-        current_reset: datetime = determine_reset_datetime(
-            local_time,
-            device_info.billing_cycle_start_day,
-            True,
-        )
-        last_reset = LAST_MONTH_DATA[month_id]["reset"]
-        if current_reset > last_reset:
-            # New billing cycle started
-            _LOGGER.info(
-                "New billing cycle started for id %s! Timestamp is %s, "
-                "current reset is %s, previous reset was %s",
-                month_id,
-                local_time,
-                current_reset,
-                last_reset,
-            )
-            LAST_MONTH_DATA[month_id]["usage"] = 0
-            LAST_MONTH_DATA[month_id]["reset"] = current_reset
 
+def integrate_minute_data(
+    runtime: VueRuntime,
+    accumulator: UsageAccumulator | None,
+    data: dict[str, Any],
+    scale: str,
+    reset_for: Callable[[DeviceResetSchedule, datetime], datetime],
+) -> UsageAccumulator | None:
+    """Add the last minute usage onto the day or month data in place.
 
-def determine_reset_datetime(
-    local_time: datetime, monthly_cycle_start: int, is_month: bool
-) -> datetime:
-    """Determine the last reset datetime (aware) based on the passed time and cycle start date."""
-    reset_datetime: datetime = local_time.replace(
-        hour=0, minute=0, second=0, microsecond=0
-    )
-    if is_month:
-        # Month should use the most recent billing_cycle_start_day midnight.
-        # Never return a future reset datetime.
-        last_day_this_month = calendar.monthrange(
-            reset_datetime.year, reset_datetime.month
-        )[1]
-        target_day_this_month = min(monthly_cycle_start, last_day_this_month)
-        candidate_this_month = reset_datetime.replace(day=target_day_this_month)
-
-        if local_time >= candidate_this_month:
-            reset_datetime = candidate_this_month
-        else:
-            previous_month = reset_datetime - dateutil.relativedelta.relativedelta(
-                months=1
-            )
-            last_day_previous_month = calendar.monthrange(
-                previous_month.year, previous_month.month
-            )[1]
-            target_day_previous_month = min(
-                monthly_cycle_start, last_day_previous_month
-            )
-            reset_datetime = previous_month.replace(day=target_day_previous_month)
-    return reset_datetime
+    Returns the accumulator to pass in on the next minute. It is rebuilt from the
+    data whenever the API trued the data up or the channels changed.
+    """
+    index: ChannelIndex = get_channel_index(runtime, scale)
+    minute_index: ChannelIndex = get_channel_index(runtime, Scale.MINUTE.value)
+    if len(minute_index.usage) != len(index.channels):
+        _LOGGER.debug("Channels changed, skipping the %s integration", scale)
+        return None
+    if (
+        accumulator is None
+        or accumulator.index is not index
+        or accumulator.data is not data
+    ):
+        accumulator = UsageAccumulator(index, data, reset_for)
+    timestamp: datetime = next(iter(runtime.last_minute_data.values())).timestamp
+    accumulator.add(minute_index.usage, timestamp)  # already in kwh
+    accumulator.store()
+    return accumulator
 
 
-def handle_none_usage(scale: str, identifier: str):
+def handle_none_usage(runtime: VueRuntime, scale: str, identifier: str):
     """Handle the case of the usage being None by using the previous value or zero."""
     if (
         scale is Scale.MINUTE.value
-        and identifier in LAST_MINUTE_DATA
-        and "usage" in LAST_MINUTE_DATA[identifier]
+        and identifier in runtime.last_minute_data
+        and runtime.last_minute_data[identifier].usage is not None
     ):
-        return LAST_MINUTE_DATA[identifier]["usage"]
+        return runtime.last_minute_data[identifier].usage
     if (
         scale is Scale.DAY.value
-        and identifier in LAST_DAY_DATA
-        and "usage" in LAST_DAY_DATA[identifier]
+        and identifier in runtime.last_day_data
+        and runtime.last_day_data[identifier].usage is not None
     ):
-        return LAST_DAY_DATA[identifier]["usage"]
+        return runtime.last_day_data[identifier].usage
     return 0
 
 
 def apply_api_update_debounce(
-    updated_data: dict[str, Any],
-    existing_data: dict[str, Any],
+    updated_data: dict[str, UsageRecord],
+    existing_data: dict[str, UsageRecord],
     scale_name: str,
 ) -> None:
     """Prevent API reset lag from inflating totals shortly after local reset time.
@@ -775,10 +1603,10 @@ def apply_api_update_debounce(
         if not existing:
             continue
 
-        updated_usage = updated.get("usage")
-        existing_usage = existing.get("usage")
-        reset_datetime = updated.get("reset")
-        timestamp = updated.get("timestamp")
+        updated_usage = updated.usage
+        existing_usage = existing.usage
+        reset_datetime = updated.reset
+        timestamp = updated.timestamp
 
         if (
             updated_usage is None
@@ -802,7 +1630,7 @@ def apply_api_update_debounce(
                     bounded_usage,
                     updated_usage,
                 )
-                updated["usage"] = bounded_usage
+                updated.usage = bounded_usage
 
 
 def is_in_reset_debounce_window(
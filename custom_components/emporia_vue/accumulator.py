@@ -0,0 +1,97 @@
+"""Integrate the minute usage into the day and month totals."""
+
+from array import array
+from collections.abc import Callable
+from datetime import datetime
+import logging
+
+from .channel_index import ChannelIndex, zeroed_array
+from .records import UsageRecord
+from .resets import DeviceResetSchedule
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python path gives the same result
+    np = None
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class UsageAccumulator:
+    """Day or month totals kept in one float slot per channel.
+
+    The slots line up with the minute channel index, so integrating a minute is
+    a single element-wise add of the minute usage column into the totals, in
+    place. Resets are applied to the slot range of each device before the add.
+    """
+
+    def __init__(
+        self,
+        index: ChannelIndex,
+        data: dict[str, UsageRecord],
+        reset_for: Callable[[DeviceResetSchedule, datetime], datetime],
+    ) -> None:
+        """Initialize the totals from the data the sensors show."""
+        self.index = index
+        self.data = data
+        self._reset_for = reset_for
+        self.usage: array = zeroed_array(len(index.channels))
+        # channels without a total from the API are left alone, as before
+        self.has_usage = bytearray(len(index.channels))
+        self.resets: list[datetime | None] = [None] * len(index.device_ranges)
+        # the slots written back by store, with the device they belong to
+        self._stored_slots: list[int] = []
+        self._stored_devices: list[int] = []
+        for device, (_, start, end, _) in enumerate(index.device_ranges):
+            for slot in range(start, end):
+                record = data.get(index.channels[slot].identifier)
+                if not record or record.usage is None:
+                    continue
+                self.usage[slot] = record.usage
+                self.has_usage[slot] = 1
+                self._stored_slots.append(slot)
+                self._stored_devices.append(device)
+                if self.resets[device] is None:
+                    self.resets[device] = record.reset
+
+    def add(self, minute_usage: array, timestamp: datetime) -> None:
+        """Add the minute usage, resetting the devices that crossed a boundary."""
+        for device, (gid, start, end, schedule) in enumerate(self.index.device_ranges):
+            last_reset = self.resets[device]
+            if last_reset is None:
+                continue
+            current_reset = self._reset_for(schedule, timestamp)
+            if current_reset > last_reset:
+                _LOGGER.info(
+                    "Reset happened recently for device %s! Timestamp is %s, reset is"
+                    " %s, previous reset was %s",
+                    gid,
+                    timestamp,
+                    current_reset,
+                    last_reset,
+                )
+                self.usage[start:end] = zeroed_array(end - start)
+                self.resets[device] = current_reset
+        if np is not None:
+            totals = np.frombuffer(self.usage, dtype=np.float64)
+            np.add(totals, np.frombuffer(minute_usage, dtype=np.float64), out=totals)
+        else:
+            usage = self.usage
+            for slot, value in enumerate(minute_usage):
+                usage[slot] += value
+
+    def store(self) -> None:
+        """Write the totals back to the data the sensors show."""
+        channels = self.index.channels
+        if np is not None:
+            totals: list[float] = np.frombuffer(self.usage, dtype=np.float64)[
+                np.fromiter(self._stored_slots, dtype=np.intp)
+            ].tolist()
+        else:
+            totals = [self.usage[slot] for slot in self._stored_slots]
+        for slot, device, total in zip(
+            self._stored_slots, self._stored_devices, totals, strict=True
+        ):
+            record = self.data[channels[slot].identifier]
+            record.usage = total
+            record.reset = self.resets[device]
@@ -0,0 +1,326 @@
+"""Asyncio transport for the Emporia API calls made on every update."""
+
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+import logging
+import time
+from typing import Any
+
+import aiohttp
+from dateutil.parser import parse
+import jwt
+from pyemvue import PyEmVue
+from pyemvue.auth import CLIENT_ID, USER_POOL
+from pyemvue.device import ChargerDevice, OutletDevice, VueUsageDevice
+from pyemvue.enums import Unit
+from pyemvue.pyemvue import (
+    API_CHARGER,
+    API_CHART_USAGE,
+    API_DEVICES_USAGE,
+    API_GET_STATUS,
+    API_OUTLET,
+)
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.json import json_loads
+
+from .const import DEFAULT_MAX_CONCURRENT_REQUESTS, DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+COGNITO_URL = f"https://cognito-idp.{USER_POOL.split('_')[0]}.amazonaws.com/"
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(connect=6.03, sock_read=10.03)
+MAX_REQUEST_ATTEMPTS = 3
+INITIAL_RETRY_DELAY = 0.5
+USAGE_MAX_ATTEMPTS = 3
+USAGE_RETRY_DELAY = 2.0
+# Requests in flight across every config entry, on top of the cap of each entry
+SHARED_MAX_CONCURRENT_REQUESTS = 16
+REQUEST_POOL = f"{DOMAIN}_request_pool"
+
+
+class EmporiaApiError(HomeAssistantError):
+    """Error to indicate the Emporia API returned an error response."""
+
+    def __init__(self, status: int, body: str) -> None:
+        """Initialize."""
+        super().__init__(f"Emporia API returned status {status}: {body}")
+        self.status = status
+        self.body = body
+
+
+class AsyncVueClient:
+    """Make the frequent Emporia API calls on Home Assistant's aiohttp session.
+
+    Logging in with a password still goes through PyEmVue since it needs the
+    Cognito SRP handshake, but every request made while polling, as well as the
+    token refresh, runs natively on the event loop and reuses pooled connections.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        vue: PyEmVue,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_pool: asyncio.Semaphore | None = None,
+    ) -> None:
+        """Initialize with a PyEmVue instance that has already logged in.
+
+        The request pool is shared with the clients of the other accounts, so many
+        accounts polled at once stay within one bound.
+        """
+        self._session = session
+        self._vue = vue
+        self._refresh_lock = asyncio.Lock()
+        # caps the requests in flight, e.g. when usage is fetched in many shards
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._request_pool = request_pool or asyncio.Semaphore(
+            SHARED_MAX_CONCURRENT_REQUESTS
+        )
+        # called after the tokens were refreshed
+        self.token_listener: Callable[[], None] | None = None
+
+    @property
+    def host(self) -> str:
+        """Return the API root, which points at the simulator when it is in use."""
+        return self._vue.auth.host
+
+    @property
+    def tokens(self) -> dict[str, Any]:
+        """Return the current token set."""
+        return self._vue.auth.tokens
+
+    async def async_get_device_list_usage(
+        self,
+        device_gids: list[str],
+        instant: datetime,
+        scale: str,
+        unit: str = Unit.KWH.value,
+        max_attempts: int = USAGE_MAX_ATTEMPTS,
+    ) -> dict[int, VueUsageDevice]:
+        """Return the usage of every device for the scale, like PyEmVue does."""
+        path = API_DEVICES_USAGE.format(
+            deviceGids="+".join(device_gids),
+            instant=_format_time(instant),
+            scale=scale,
+            unit=unit,
+        )
+        devices: dict[int, VueUsageDevice] = {}
+        for attempt in range(max_attempts):
+            if attempt:
+                await asyncio.sleep(USAGE_RETRY_DELAY * (2 ** (attempt - 1)))
+            data_missing = False
+            j = await self._async_request("get", path)
+            if not j or "devices" not in j.get("deviceListUsages", {}):
+                continue
+            timestamp = parse(j["deviceListUsages"]["instant"])
+            for device in j["deviceListUsages"]["devices"]:
+                populated = VueUsageDevice(timestamp=timestamp).from_json_dictionary(
+                    device
+                )
+                # usage is None when Emporia hasn't finished the bucket, retry those
+                missing = any(
+                    channel.usage is None for channel in populated.channels.values()
+                )
+                data_missing |= missing
+                if not missing or attempt == max_attempts - 1:
+                    devices[populated.device_gid] = populated
+            if not data_missing:
+                break
+        return devices
+
+    async def async_get_chart_usage(
+        self,
+        device_gid: int,
+        channel_num: str,
+        start: datetime,
+        end: datetime,
+        scale: str,
+        unit: str = Unit.KWH.value,
+    ) -> tuple[list[float | None], datetime]:
+        """Return the usage of a channel over a time range, like PyEmVue does.
+
+        The usage comes with the start of its first bucket.
+        """
+        if channel_num in ["MainsFromGrid", "MainsToGrid"]:
+            # This is not populated for the special Mains data as of right now
+            return [], start
+        path = API_CHART_USAGE.format(
+            deviceGid=device_gid,
+            channel=channel_num,
+            start=_format_time(start),
+            end=_format_time(end),
+            scale=scale,
+            unit=unit,
+        )
+        usage: list[float | None] = []
+        instant = start
+        j = await self._async_request("get", path)
+        if j:
+            if "firstUsageInstant" in j:
+                instant = parse(j["firstUsageInstant"])
+            usage = j.get("usageList") or []
+        return usage, instant
+
+    async def async_get_devices_status(
+        self,
+    ) -> tuple[list[OutletDevice], list[ChargerDevice]]:
+        """Get the current state of every outlet and charger."""
+        outlets: list[OutletDevice] = []
+        chargers: list[ChargerDevice] = []
+        j = await self._async_request("get", API_GET_STATUS)
+        if j:
+            outlets.extend(
+                OutletDevice().from_json_dictionary(raw)
+                for raw in j.get("outlets") or []
+            )
+            chargers.extend(
+                ChargerDevice().from_json_dictionary(raw)
+                for raw in j.get("evChargers") or []
+            )
+        return (outlets, chargers)
+
+    async def async_update_outlet(
+        self, outlet: OutletDevice, on: bool | None = None
+    ) -> OutletDevice:
+        """Turn an outlet on or off."""
+        if on is not None:
+            outlet.outlet_on = on
+        j = await self._async_request("put", API_OUTLET, json=outlet.as_dictionary())
+        if j:
+            outlet.from_json_dictionary(j)
+        return outlet
+
+    async def async_update_charger(
+        self,
+        charger: ChargerDevice,
+        on: bool | None = None,
+        charge_rate: int | None = None,
+    ) -> ChargerDevice:
+        """Turn a charger on or off and optionally change the charging rate."""
+        if on is not None:
+            charger.charger_on = on
+        if charge_rate:
+            charger.charging_rate = charge_rate
+        j = await self._async_request("put", API_CHARGER, json=charger.as_dictionary())
+        if j:
+            charger.from_json_dictionary(j)
+        return charger
+
+    async def async_refresh_tokens(self, stale_id_token: str | None = None) -> None:
+        """Exchange the refresh token for a new id and access token.
+
+        Given the id token a request went out with, the refresh is skipped when
+        another request already replaced it while this one waited for the lock.
+        """
+        async with self._refresh_lock:
+            if stale_id_token is not None and self.tokens.get("id_token") not in (
+                None,
+                stale_id_token,
+            ):
+                return
+            refresh_token = self.tokens.get("refresh_token")
+            if not refresh_token:
+                # the simulator and password-only sessions go through PyEmVue
+                loop = asyncio.get_running_loop()
+                self._vue.auth.tokens = await loop.run_in_executor(
+                    None, self._vue.auth.refresh_tokens
+                )
+                return
+
+            async with self._session.post(
+                COGNITO_URL,
+                json={
+                    "AuthFlow": "REFRESH_TOKEN_AUTH",
+                    "ClientId": CLIENT_ID,
+                    "AuthParameters": {"REFRESH_TOKEN": refresh_token},
+                },
+                headers={
+                    "X-Amz-Target": "AWSCognitoIdentityProviderService.InitiateAuth",
+                    "Content-Type": "application/x-amz-json-1.1",
+                },
+                timeout=REQUEST_TIMEOUT,
+            ) as response:
+                if response.status >= 400:
+                    raise EmporiaApiError(response.status, await response.text())
+                result = (await response.json(content_type=None))[
+                    "AuthenticationResult"
+                ]
+
+            tokens = self.tokens
+            tokens["access_token"] = result["AccessToken"]
+            tokens["id_token"] = result["IdToken"]
+            tokens["token_type"] = result.get("TokenType")
+            # keep PyEmVue's Cognito state in sync for the calls still made through it
+            self._vue.auth.cognito.access_token = tokens["access_token"]
+            self._vue.auth.cognito.id_token = tokens["id_token"]
+            if self.token_listener is not None:
+                self.token_listener()
+
+    def tokens_expired(self) -> bool:
+        """Return true if the access token has expired."""
+        access_token = self.tokens.get("access_token")
+        if not access_token:
+            return False
+        claims = jwt.decode(access_token, options={"verify_signature": False})
+        return time.time() > claims["exp"]
+
+    async def _async_request(
+        self, method: str, path: str, json: dict[str, Any] | None = None
+    ) -> Any:
+        """Make an authenticated request and return the decoded json body."""
+        if self.tokens_expired():
+            await self.async_refresh_tokens(self.tokens.get("id_token"))
+
+        refreshed = False
+        for attempt in range(MAX_REQUEST_ATTEMPTS):
+            # the own cap is taken first, waiting on it doesn't hold a pooled slot
+            async with self._request_semaphore, self._request_pool:
+                # read once a slot is free, a refresh may have happened meanwhile
+                id_token: str = self.tokens["id_token"]
+                async with self._session.request(
+                    method,
+                    f"{self.host}/{path}",
+                    json=json,
+                    headers={"authtoken": id_token},
+                    timeout=REQUEST_TIMEOUT,
+                ) as response:
+                    status = response.status
+                    body = await response.text()
+            if status == 401 and not refreshed:
+                _LOGGER.debug("Emporia API rejected the token, refreshing")
+                refreshed = True
+                await self.async_refresh_tokens(id_token)
+                continue
+            if status >= 500 and attempt < MAX_REQUEST_ATTEMPTS - 1:
+                # server error, retry with exponential backoff
+                await asyncio.sleep(INITIAL_RETRY_DELAY * (2**attempt))
+                continue
+            if status >= 400:
+                raise EmporiaApiError(status, body)
+            return json_loads(body) if body else None
+        # the last attempt was rejected and refreshed the tokens, no retry is left
+        raise EmporiaApiError(status, body)
+
+
+@callback
+def async_get_request_pool(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the request pool the clients of all the config entries share."""
+    pool: asyncio.Semaphore | None = hass.data.get(REQUEST_POOL)
+    if pool is None:
+        pool = hass.data[REQUEST_POOL] = asyncio.Semaphore(
+            SHARED_MAX_CONCURRENT_REQUESTS
+        )
+    return pool
+
+
+def _format_time(time_to_format: datetime) -> str:
+    """Convert the time to UTC, then format it the way the Emporia API expects."""
+    if (
+        time_to_format.tzinfo
+        and time_to_format.tzinfo.utcoffset(time_to_format) is not None
+    ):
+        time_to_format = time_to_format.astimezone(UTC)
+    return time_to_format.replace(tzinfo=None).isoformat() + "Z"
@@ -0,0 +1,165 @@
+"""Backfill the hourly statistics of the power sensors after an outage."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+import logging
+
+from pyemvue.enums import Scale
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    get_last_statistics,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfPower
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .api import AsyncVueClient
+from .channel_index import ChannelIndex, IndexedChannel, apply_usage_sign
+from .const import DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# Gaps are only filled this far back
+BACKFILL_MAX_AGE = timedelta(days=7)
+# Chart usage requests in flight at once, the polling keeps the rest of the pool
+BACKFILL_CONCURRENCY = 2
+# Channels whose last statistics are looked up in one recorder job
+BACKFILL_BATCH_SIZE = 100
+HOUR = timedelta(hours=1)
+
+
+class StatisticsBackfill:
+    """Fill the holes an outage left in the hourly statistics of the power sensors.
+
+    The gap of a channel runs from its last hourly statistic up to the start of
+    the current hour, so the last complete hour of an outage is filled too. The
+    hourly usage of the gap comes from the chart usage API and is imported as the
+    mean power of each hour. Channels without any statistics yet have no gap.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, client: AsyncVueClient
+    ) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._entry = entry
+        self._client = client
+        self._semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_schedule(self, index: ChannelIndex) -> None:
+        """Start a backfill of the minute channels unless one is running."""
+        if "recorder" not in self._hass.config.components:
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._task = self._entry.async_create_background_task(
+            self._hass, self.async_backfill(index), "emporia_vue statistics backfill"
+        )
+
+    async def async_backfill(self, index: ChannelIndex) -> None:
+        """Backfill every minute channel that has a power sensor."""
+        registry = er.async_get(self._hass)
+        targets: dict[str, IndexedChannel] = {}
+        for indexed in index.channels:
+            entity_id = registry.async_get_entity_id(
+                "sensor",
+                DOMAIN,
+                "sensor.emporia_vue.instant."
+                f"{indexed.device_gid}-{indexed.channel_num}",
+            )
+            if entity_id:
+                targets[entity_id] = indexed
+        until = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        entity_ids = list(targets)
+        filled = 0
+        for batch_start in range(0, len(entity_ids), BACKFILL_BATCH_SIZE):
+            batch = entity_ids[batch_start : batch_start + BACKFILL_BATCH_SIZE]
+            last_starts = await get_instance(self._hass).async_add_executor_job(
+                _last_statistic_starts, self._hass, batch
+            )
+            gaps = [
+                (entity_id, max(last_start + HOUR, until - BACKFILL_MAX_AGE))
+                for entity_id, last_start in last_starts.items()
+                if last_start + HOUR < until
+            ]
+            results = await asyncio.gather(
+                *(
+                    self._async_backfill_channel(
+                        entity_id, targets[entity_id], start, until
+                    )
+                    for entity_id, start in gaps
+                ),
+                return_exceptions=True,
+            )
+            for (entity_id, _), result in zip(gaps, results, strict=True):
+                if isinstance(result, BaseException):
+                    if not isinstance(result, Exception):
+                        raise result
+                    _LOGGER.warning(
+                        "Failed to backfill the statistics of %s: %s",
+                        entity_id,
+                        result,
+                    )
+                else:
+                    filled += result
+        if filled:
+            _LOGGER.info("Backfilled %s hours of power statistics", filled)
+
+    async def _async_backfill_channel(
+        self,
+        entity_id: str,
+        indexed: IndexedChannel,
+        start: datetime,
+        until: datetime,
+    ) -> int:
+        """Import the hours of one channel from start up to until, return how many."""
+        async with self._semaphore:
+            usage, first_hour = await self._client.async_get_chart_usage(
+                indexed.device_gid,
+                indexed.channel_num,
+                start,
+                until,
+                Scale.HOUR.value,
+            )
+        statistics: list[StatisticData] = []
+        for hour, kwh in enumerate(usage):
+            hour_start = first_hour.astimezone(UTC) + hour * HOUR
+            if kwh is None or not start <= hour_start < until:
+                continue
+            watts = 1000 * apply_usage_sign(kwh, indexed.sign_policy)
+            statistics.append(
+                StatisticData(start=hour_start, mean=watts, min=watts, max=watts)
+            )
+        if statistics:
+            async_import_statistics(
+                self._hass,
+                StatisticMetaData(
+                    has_mean=True,
+                    has_sum=False,
+                    name=None,
+                    source="recorder",
+                    statistic_id=entity_id,
+                    unit_of_measurement=UnitOfPower.WATT,
+                ),
+                statistics,
+            )
+        return len(statistics)
+
+
+def _last_statistic_starts(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> dict[str, datetime]:
+    """Return when the last hourly statistic of each entity starts, in the recorder."""
+    last_starts: dict[str, datetime] = {}
+    for entity_id in entity_ids:
+        rows = get_last_statistics(hass, 1, entity_id, False, {"mean"}).get(entity_id)
+        if rows:
+            last_starts[entity_id] = dt_util.utc_from_timestamp(rows[0]["start"])
+    return last_starts
@@ -0,0 +1,119 @@
+"""Index of the channels to parse on every update, built once per topology."""
+
+from array import array
+from collections.abc import Mapping
+from typing import NamedTuple
+
+from pyemvue.device import VueDevice
+
+from .resets import DeviceResetSchedule
+
+SIGN_KEEP = 0
+SIGN_ABS = 1
+SIGN_NEGATE = 2
+
+
+class IndexedChannel(NamedTuple):
+    """Everything needed to parse the usage of one channel at one scale."""
+
+    identifier: str
+    device_gid: int
+    channel_num: str
+    info: VueDevice
+    schedule: DeviceResetSchedule
+    sign_policy: int
+
+
+class ChannelIndex:
+    """The channels of every device at one scale, grouped by device.
+
+    The channels of a device occupy a contiguous range of slots. Indexes built
+    from the same devices line up slot for slot across scales, which lets the
+    usage column of one scale be added onto the totals of another.
+    """
+
+    def __init__(self, channels: list[IndexedChannel]) -> None:
+        """Initialize."""
+        self.channels = channels
+        self.slot_identifiers = [channel.identifier for channel in channels]
+        self.identifiers = frozenset(self.slot_identifiers)
+        self.slots: dict[tuple[int, str], int] = {
+            (channel.device_gid, channel.channel_num): slot
+            for slot, channel in enumerate(channels)
+        }
+        self.sign_policies = bytes(channel.sign_policy for channel in channels)
+        # (device gid, first slot, end slot, reset schedule) for every device
+        self.device_ranges: list[tuple[int, int, int, DeviceResetSchedule]] = []
+        start = 0
+        for slot, channel in enumerate(channels):
+            if (
+                slot + 1 == len(channels)
+                or channels[slot + 1].device_gid != channel.device_gid
+            ):
+                self.device_ranges.append(
+                    (channel.device_gid, start, slot + 1, channel.schedule)
+                )
+                start = slot + 1
+        # the sign fixed usage of every slot from the last parse
+        self.usage = zeroed_array(len(channels))
+
+
+def build_channel_index(
+    devices: Mapping[int, VueDevice],
+    schedules: Mapping[int, DeviceResetSchedule],
+    scale: str,
+    invert_solar: bool,
+) -> ChannelIndex:
+    """Build the index of every channel of the devices for the scale."""
+    channels: list[IndexedChannel] = []
+    for gid, info in devices.items():
+        for info_channel in info.channels:
+            channels.append(
+                IndexedChannel(
+                    f"{info_channel.device_gid}-{info_channel.channel_num}-{scale}",
+                    gid,
+                    info_channel.channel_num,
+                    info,
+                    schedules[gid],
+                    usage_sign_policy(
+                        info_channel.channel_num,
+                        "bidirectional" in info_channel.type.lower(),
+                        info_channel.channel_type_gid == 13,
+                        invert_solar,
+                    ),
+                )
+            )
+    return ChannelIndex(channels)
+
+
+def usage_sign_policy(
+    channel_num: str, bidirectional: bool, is_solar: bool, invert_solar: bool
+) -> int:
+    """Return how the sign of the channel's usage has to be fixed.
+
+    Solar circuits are up to the user to decide. Positive is recommended for the energy dashboard.
+
+    (see https://github.com/magico13/ha-emporia-vue/issues/57)
+    """
+    if is_solar:
+        # Energy dashboard wants solar to be positive, Emporia usually provides negative
+        return SIGN_NEGATE if invert_solar else SIGN_KEEP
+    if not bidirectional and channel_num not in ["1,2,3", "Balance"]:
+        # With bidirectionality, we need to also check if bidirectional. If yes,
+        # we either don't abs, or we flip the sign.
+        return SIGN_ABS
+    return SIGN_KEEP
+
+
+def apply_usage_sign(usage: float, sign_policy: int) -> float:
+    """Fix the sign of the usage according to the policy."""
+    if not usage or sign_policy == SIGN_KEEP:
+        return usage
+    if sign_policy == SIGN_ABS:
+        return abs(usage)
+    return -1 * usage
+
+
+def zeroed_array(length: int) -> array:
+    """Return an array of doubles set to zero."""
+    return array("d", bytes(8 * length))
@@ -2,7 +2,6 @@
 
 from typing import Any
 
-from pyemvue import pyemvue
 from pyemvue.device import ChargerDevice, VueDevice
 
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -11,6 +10,7 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 
+from .api import AsyncVueClient
 from .const import DOMAIN
 
 
@@ -20,18 +20,18 @@ class EmporiaChargerEntity(CoordinatorEntity):
     def __init__(
         self,
         coordinator: DataUpdateCoordinator[dict[str, Any]],
-        vue: pyemvue.PyEmVue,
+        client: AsyncVueClient,
         device: VueDevice,
         units: str | None,
         device_class: str,
         enabled_default=True,
     ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
+        """Initialize the sensor, updated when the charger changes."""
+        super().__init__(coordinator, str(device.device_gid))
         self._coordinator = coordinator
         self._device: VueDevice = device
         self._device_gid = str(device.device_gid)
-        self._vue: pyemvue.PyEmVue = vue
+        self._client: AsyncVueClient = client
         self._enabled_default: bool = enabled_default
 
         self._attr_unit_of_measurement = units
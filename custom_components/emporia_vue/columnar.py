@@ -0,0 +1,105 @@
+"""Columnar processing of a usage response, vectorized with NumPy when available."""
+
+from array import array
+from datetime import UTC, datetime
+import math
+
+from pyemvue.device import VueDeviceChannelUsage, VueUsageDevice
+
+from .channel_index import (
+    SIGN_ABS,
+    SIGN_NEGATE,
+    ChannelIndex,
+    apply_usage_sign,
+    zeroed_array,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python path gives the same result
+    np = None
+
+
+class UsageColumns:
+    """The usage of one response laid out in the slots of a channel index.
+
+    The response is walked once into parallel lists of slots and raw usage, the
+    sign rules are then applied to the whole column at once. Slots the response
+    has no channel for are listed in missing, slots whose usage was None in
+    none_slots so the caller can fall back to the previous value. The data time
+    is the newest timestamp in the response, like UsageChannelStream.newest.
+    """
+
+    def __init__(
+        self, index: ChannelIndex, usage_devices: dict[int, VueUsageDevice]
+    ) -> None:
+        """Initialize from the usage of every device."""
+        self.index = index
+        newest: datetime | None = None
+        # channels in the response that the index doesn't know about
+        self.unused: list[VueDeviceChannelUsage] = []
+        slots: list[int] = []
+        raw_usage: list[float] = []
+        slot_lookup = index.slots
+        for usage in usage_devices.values():
+            pending = [usage]
+            while pending:
+                device = pending.pop()
+                if device.timestamp and (newest is None or device.timestamp > newest):
+                    newest = device.timestamp
+                for channel in device.channels.values():
+                    slot = slot_lookup.get((channel.device_gid, channel.channel_num))
+                    if slot is None:
+                        self.unused.append(channel)
+                    else:
+                        slots.append(slot)
+                        raw_usage.append(
+                            math.nan if channel.usage is None else channel.usage
+                        )
+                    if channel.nested_devices:
+                        pending.extend(channel.nested_devices.values())
+
+        self.data_time: datetime = newest or datetime.now(UTC)
+
+        length = len(index.channels)
+        present = bytearray(length)
+        for slot in slots:
+            present[slot] = 1
+        if np is not None:
+            self.usage: array = _signed_column_numpy(index, length, slots, raw_usage)
+            self.missing: list[int] = np.flatnonzero(
+                np.frombuffer(present, dtype=np.uint8) == 0
+            ).tolist()
+            self.none_slots: list[int] = np.flatnonzero(
+                np.isnan(np.frombuffer(self.usage, dtype=np.float64))
+            ).tolist()
+        else:
+            self.usage = _signed_column(index, length, slots, raw_usage)
+            self.missing = [slot for slot, found in enumerate(present) if not found]
+            self.none_slots = [
+                slot for slot, usage in enumerate(self.usage) if math.isnan(usage)
+            ]
+
+
+def _signed_column(
+    index: ChannelIndex, length: int, slots: list[int], raw_usage: list[float]
+) -> array:
+    """Place the usage in its slots and fix the signs, one slot at a time."""
+    column = zeroed_array(length)
+    policies = index.sign_policies
+    for slot, usage in zip(slots, raw_usage, strict=True):
+        column[slot] = apply_usage_sign(usage, policies[slot])
+    return column
+
+
+def _signed_column_numpy(
+    index: ChannelIndex, length: int, slots: list[int], raw_usage: list[float]
+) -> array:
+    """Place the usage in its slots and fix the signs as vector operations."""
+    column = np.zeros(length)
+    column[np.fromiter(slots, dtype=np.intp, count=len(slots))] = raw_usage
+    policies = np.frombuffer(index.sign_policies, dtype=np.uint8)
+    np.abs(column, out=column, where=policies == SIGN_ABS)
+    # zero stays as it is, like apply_usage_sign
+    np.negative(column, out=column, where=(policies == SIGN_NEGATE) & (column != 0))
+    return array("d", column.tobytes())
@@ -13,15 +13,42 @@ from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
+    COLUMNAR_USAGE,
     CONFIG_FLOW_SCHEMA,
     CONFIG_TITLE,
     CUSTOMER_GID,
+    DEADBAND_OVERRIDES,
+    DEADBAND_PERCENT,
+    DEADBAND_WATTS,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_DEADBAND_WATTS,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_IMPORT_HISTORY_DAYS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_POLL_JITTER,
+    DEFAULT_POLL_OFFSET,
+    DEFAULT_USAGE_SHARD_SIZE,
     DOMAIN,
     ENABLE_1D,
     ENABLE_1M,
     ENABLE_1MON,
+    ENABLE_1S,
+    HISTORY_DAYS,
+    IMPORT_HISTORY_DAYS,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    POLL_JITTER,
+    POLL_OFFSET,
+    POWER_PRECISION,
+    SECOND_CHANNELS,
     SOLAR_INVERT,
+    USAGE_SHARD_SIZE,
+    VUE_DEVICES,
 )
+from .deadband import validate_deadband_overrides
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -133,6 +160,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 ENABLE_1D: user_input[ENABLE_1D],
                 ENABLE_1MON: user_input[ENABLE_1MON],
                 SOLAR_INVERT: user_input[SOLAR_INVERT],
+                ENABLE_1S: user_input[ENABLE_1S],
+                SECOND_CHANNELS: user_input[SECOND_CHANNELS],
+                USAGE_SHARD_SIZE: user_input[USAGE_SHARD_SIZE],
+                MAX_CONCURRENT_REQUESTS: user_input[MAX_CONCURRENT_REQUESTS],
+                MIN_POLL_INTERVAL: user_input[MIN_POLL_INTERVAL],
+                MAX_POLL_INTERVAL: user_input[MAX_POLL_INTERVAL],
+                POLL_OFFSET: user_input[POLL_OFFSET],
+                POLL_JITTER: user_input[POLL_JITTER],
+                COLUMNAR_USAGE: user_input[COLUMNAR_USAGE],
+                DEADBAND_WATTS: user_input[DEADBAND_WATTS],
+                DEADBAND_PERCENT: user_input[DEADBAND_PERCENT],
+                # cleared fields are left out of the input
+                DEADBAND_OVERRIDES: user_input.get(DEADBAND_OVERRIDES, ""),
+                POWER_PRECISION: user_input.get(POWER_PRECISION),
+                HISTORY_DAYS: user_input[HISTORY_DAYS],
+                IMPORT_HISTORY_DAYS: user_input[IMPORT_HISTORY_DAYS],
                 CUSTOMER_GID: info[CUSTOMER_GID],
                 CONFIG_TITLE: info[CONFIG_TITLE],
             }
@@ -158,6 +201,82 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 SOLAR_INVERT,
                 default=current_config.data.get(SOLAR_INVERT, True),
             ): cv.boolean,
+            vol.Optional(
+                ENABLE_1S,
+                default=current_config.data.get(ENABLE_1S, False),
+            ): cv.boolean,
+            vol.Optional(
+                SECOND_CHANNELS,
+                default=current_config.data.get(SECOND_CHANNELS, []),
+            ): cv.multi_select(self._second_channel_options(current_config)),
+            vol.Optional(
+                USAGE_SHARD_SIZE,
+                default=current_config.data.get(
+                    USAGE_SHARD_SIZE, DEFAULT_USAGE_SHARD_SIZE
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                MAX_CONCURRENT_REQUESTS,
+                default=current_config.data.get(
+                    MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                MIN_POLL_INTERVAL,
+                default=current_config.data.get(
+                    MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+            vol.Optional(
+                MAX_POLL_INTERVAL,
+                default=current_config.data.get(
+                    MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+            vol.Optional(
+                POLL_OFFSET,
+                default=current_config.data.get(POLL_OFFSET, DEFAULT_POLL_OFFSET),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=59)),
+            vol.Optional(
+                POLL_JITTER,
+                default=current_config.data.get(POLL_JITTER, DEFAULT_POLL_JITTER),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=30)),
+            vol.Optional(
+                COLUMNAR_USAGE,
+                default=current_config.data.get(COLUMNAR_USAGE, False),
+            ): cv.boolean,
+            vol.Optional(
+                DEADBAND_WATTS,
+                default=current_config.data.get(DEADBAND_WATTS, DEFAULT_DEADBAND_WATTS),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                DEADBAND_PERCENT,
+                default=current_config.data.get(
+                    DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Optional(
+                DEADBAND_OVERRIDES,
+                description={
+                    "suggested_value": current_config.data.get(DEADBAND_OVERRIDES)
+                },
+            ): vol.All(cv.string, validate_deadband_overrides),
+            vol.Optional(
+                POWER_PRECISION,
+                description={
+                    "suggested_value": current_config.data.get(POWER_PRECISION)
+                },
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=6)),
+            vol.Optional(
+                HISTORY_DAYS,
+                default=current_config.data.get(HISTORY_DAYS, DEFAULT_HISTORY_DAYS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=366)),
+            vol.Optional(
+                IMPORT_HISTORY_DAYS,
+                default=current_config.data.get(
+                    IMPORT_HISTORY_DAYS, DEFAULT_IMPORT_HISTORY_DAYS
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
         }
 
         return self.async_show_form(
@@ -165,6 +284,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema(data_schema),
         )
 
+    def _second_channel_options(
+        self, entry: config_entries.ConfigEntry
+    ) -> dict[str, str]:
+        """Return the channels that can be polled every second, keyed by channel id."""
+        options: dict[str, str] = {
+            channel_id: channel_id for channel_id in entry.data.get(SECOND_CHANNELS, [])
+        }
+        entry_data = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        if entry_data:
+            for gid, device in entry_data[VUE_DEVICES].items():
+                for channel in device.channels:
+                    options[f"{gid}-{channel.channel_num}"] = (
+                        f"{channel.name or device.device_name} ({channel.channel_num})"
+                    )
+        return options
+
     async def async_step_reauth(
         self, entry_data: Mapping[str, Any]
     ) -> config_entries.ConfigFlowResult:
@@ -7,6 +7,9 @@ import homeassistant.helpers.config_validation as cv
 
 DOMAIN = "emporia_vue"
 VUE_DATA = "vue_data"
+VUE_CLIENT = "vue_client"
+VUE_DEVICES = "vue_devices"
+VUE_RUNTIME = "vue_runtime"
 ENABLE_1S = "enable_1s"
 ENABLE_1M = "enable_1m"
 ENABLE_1D = "enable_1d"
@@ -14,6 +17,31 @@ ENABLE_1MON = "enable_1mon"
 SOLAR_INVERT = "solar_invert"
 CUSTOMER_GID = "customer_gid"
 CONFIG_TITLE = "title"
+SECOND_CHANNELS = "second_channels"
+USAGE_SHARD_SIZE = "usage_shard_size"
+MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+MIN_POLL_INTERVAL = "min_poll_interval"
+MAX_POLL_INTERVAL = "max_poll_interval"
+POLL_OFFSET = "poll_offset"
+POLL_JITTER = "poll_jitter"
+COLUMNAR_USAGE = "columnar_usage"
+DEADBAND_WATTS = "deadband_watts"
+DEADBAND_PERCENT = "deadband_percent"
+DEADBAND_OVERRIDES = "deadband_overrides"
+POWER_PRECISION = "power_precision"
+HISTORY_DAYS = "history_days"
+IMPORT_HISTORY_DAYS = "import_history_days"
+
+DEFAULT_USAGE_SHARD_SIZE = 25
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_MIN_POLL_INTERVAL = 60  # seconds
+DEFAULT_MAX_POLL_INTERVAL = 900  # seconds
+DEFAULT_POLL_OFFSET = 5  # seconds after the minute
+DEFAULT_POLL_JITTER = 5  # seconds
+DEFAULT_DEADBAND_WATTS = 0.0
+DEFAULT_DEADBAND_PERCENT = 0.0
+DEFAULT_HISTORY_DAYS = 0  # the minute history is off
+DEFAULT_IMPORT_HISTORY_DAYS = 0  # nothing is imported
 
 CONFIG_FLOW_SCHEMA = vol.Schema(
     {
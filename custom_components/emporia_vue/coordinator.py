@@ -0,0 +1,302 @@
+"""Data update coordinators for the Emporia Vue integration."""
+
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+import logging
+import random
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .records import UsageRecord
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+_DataT = TypeVar("_DataT")
+
+# Smoothing factor for the moving average of the API latency
+LATENCY_SMOOTHING = 0.3
+# Above this many seconds the API is considered slow and polling slows down with it
+SLOW_API_LATENCY = 5.0
+# Polling speeds up when at least this fraction of the values changed
+FAST_CHANGE_RATIO = 0.5
+
+_MISSING = object()
+
+
+class AdaptivePollInterval:
+    """Pick the next poll interval from the API latency, errors and data churn.
+
+    On success the interval starts from the base interval, stretched in
+    proportion to the smoothed latency when the API is slow, or halved when most
+    of the values changed. Consecutive failures back off exponentially. The
+    result always stays within the min and max bounds.
+    """
+
+    def __init__(
+        self,
+        base_interval: timedelta,
+        min_interval: timedelta,
+        max_interval: timedelta,
+    ) -> None:
+        """Initialize."""
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max(min_interval, max_interval)
+        self.latency: float | None = None
+        self.consecutive_failures = 0
+
+    def record_success(
+        self, latency: float, change_ratio: float | None = None
+    ) -> timedelta:
+        """Record a successful update and return the interval until the next one."""
+        self.consecutive_failures = 0
+        self._record_latency(latency)
+        interval = self.base_interval
+        if self.latency is not None and self.latency > SLOW_API_LATENCY:
+            interval *= self.latency / SLOW_API_LATENCY
+        elif change_ratio is not None and change_ratio >= FAST_CHANGE_RATIO:
+            interval /= 2
+        return self._clamp(interval)
+
+    def record_failure(self, latency: float | None = None) -> timedelta:
+        """Record a failed update and return the backed off interval."""
+        self.consecutive_failures += 1
+        if latency is not None:
+            self._record_latency(latency)
+        # cap the exponent, the max interval bounds the result anyway
+        backoff = 2 ** min(self.consecutive_failures, 16)
+        return self._clamp(self.base_interval * backoff)
+
+    def _record_latency(self, latency: float) -> None:
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+
+class ClockAlignment:
+    """Line polls up with a wall clock boundary, like the close of a minute bucket.
+
+    Polls land offset after the boundary, plus a jitter that is picked once per
+    instance so many installs don't all hit the API in the same second.
+    """
+
+    def __init__(
+        self, period: timedelta, offset: timedelta, max_jitter: timedelta
+    ) -> None:
+        """Initialize."""
+        self.period = period
+        self.offset = offset + max_jitter * random.random()
+
+    def align(self, now: datetime, interval: timedelta) -> timedelta:
+        """Return the delay until the aligned poll time closest to now + interval."""
+        period = self.period.total_seconds()
+        offset = self.offset.total_seconds()
+        now_seconds = now.timestamp()
+        target = now_seconds + interval.total_seconds() - offset
+        next_poll = round(target / period) * period + offset
+        if next_poll <= now_seconds:
+            next_poll += period
+        return timedelta(seconds=next_poll - now_seconds)
+
+
+class PollTimingStats:
+    """Track how far past the boundary polls ran and how stale the returned data was.
+
+    Skew is the number of seconds between the last boundary and the request.
+    Staleness is the number of seconds between the returned data timestamp and
+    the request.
+    """
+
+    def __init__(self, period: timedelta) -> None:
+        """Initialize."""
+        self.period = period
+        self.samples = 0
+        self.last_skew: float | None = None
+        self.mean_skew = 0.0
+        self.max_skew = 0.0
+        self.last_staleness: float | None = None
+        self.mean_staleness = 0.0
+        self.max_staleness = 0.0
+
+    def record(self, requested_time: datetime, data_time: datetime) -> None:
+        """Record the timing of a poll."""
+        skew = requested_time.timestamp() % self.period.total_seconds()
+        staleness = (requested_time - data_time).total_seconds()
+        self.samples += 1
+        self.last_skew = skew
+        self.mean_skew += (skew - self.mean_skew) / self.samples
+        self.max_skew = max(self.max_skew, skew)
+        self.last_staleness = staleness
+        self.mean_staleness += (staleness - self.mean_staleness) / self.samples
+        self.max_staleness = max(self.max_staleness, staleness)
+        _LOGGER.debug(
+            "Poll skew %.3fs (mean %.3fs), data staleness %.3fs (mean %.3fs)",
+            skew,
+            self.mean_skew,
+            staleness,
+            self.mean_staleness,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "samples": self.samples,
+            "last_skew": self.last_skew,
+            "mean_skew": self.mean_skew,
+            "max_skew": self.max_skew,
+            "last_staleness": self.last_staleness,
+            "mean_staleness": self.mean_staleness,
+            "max_staleness": self.max_staleness,
+        }
+
+
+class ChangeNotifyingCoordinator(DataUpdateCoordinator[_DataT]):
+    """Data update coordinator that only notifies the entities whose data changed.
+
+    The snapshot function maps the data to a comparable value per listener
+    context, which is what the entities pass to CoordinatorEntity. After an
+    update only the listeners whose value differs from the last notified one are
+    called, listeners without a context always are. Failures and the first
+    update after them notify everyone, so availability is kept up to date.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        *,
+        snapshot: Callable[[_DataT], dict[Any, Any]] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize."""
+        super().__init__(hass, logger, **kwargs)
+        self._snapshot = snapshot
+        self._notified: dict[Any, Any] | None = None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose data changed since they were last updated."""
+        if self._snapshot is None:
+            super().async_update_listeners()
+            return
+        if not self.last_update_success or self.data is None:
+            self._notified = None
+            super().async_update_listeners()
+            return
+        previous = self._notified
+        current = self._notified = self._snapshot(self.data)
+        if previous is None:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or current.get(context, _MISSING) != previous.get(
+                context, _MISSING
+            ):
+                update_callback()
+
+
+class AdaptiveDataUpdateCoordinator(ChangeNotifyingCoordinator[_DataT]):
+    """Data update coordinator whose interval follows an AdaptivePollInterval.
+
+    With a clock alignment the adapted interval is snapped to the aligned poll
+    time closest to it. The change ratio lets the interval shorten while the data
+    churns, it only makes sense without an alignment, aligned polls already land
+    when new data is published.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        *,
+        name: str,
+        poll_interval: AdaptivePollInterval,
+        change_ratio: Callable[[_DataT | None, _DataT], float | None] | None = None,
+        alignment: ClockAlignment | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize, polling at the base interval until the first update."""
+        super().__init__(
+            hass,
+            logger,
+            name=name,
+            update_interval=poll_interval.base_interval,
+            **kwargs,
+        )
+        self.poll_interval = poll_interval
+        self.alignment = alignment
+        self._change_ratio = change_ratio
+
+    def _set_next_interval(self, interval: timedelta) -> None:
+        """Set the interval until the next update, aligning it if needed."""
+        if self.alignment is not None:
+            interval = self.alignment.align(datetime.now(UTC), interval)
+        self.update_interval = interval
+
+    async def _async_update_data(self) -> _DataT:
+        """Fetch the data and adapt the interval to how the update went."""
+        start = time.monotonic()
+        try:
+            data = await super()._async_update_data()
+        except Exception:
+            self._set_next_interval(
+                self.poll_interval.record_failure(time.monotonic() - start)
+            )
+            _LOGGER.debug(
+                "Update of %s failed %s times in a row, next try in %s",
+                self.name,
+                self.poll_interval.consecutive_failures,
+                self.update_interval,
+            )
+            raise
+        change_ratio: float | None = None
+        if self._change_ratio is not None:
+            change_ratio = self._change_ratio(self.data, data)
+        self._set_next_interval(
+            self.poll_interval.record_success(time.monotonic() - start, change_ratio)
+        )
+        return data
+
+
+def usage_snapshot(data: dict[str, UsageRecord]) -> dict[str, tuple[Any, ...]]:
+    """Return what the sensor of each identifier shows, to detect changes."""
+    return {
+        identifier: (record.published, record.reset)
+        for identifier, record in data.items()
+    }
+
+
+def switch_snapshot(data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the attributes of each outlet and charger, to detect changes."""
+    return {gid: dict(vars(device)) for gid, device in data.items()}
+
+
+def switch_change_ratio(
+    previous: dict[str, Any] | None, current: dict[str, Any]
+) -> float | None:
+    """Return the fraction of outlets and chargers whose state changed."""
+    if not previous or not current:
+        return None
+    changed = sum(
+        1
+        for gid, device in current.items()
+        if gid in previous
+        and (
+            getattr(device, "outlet_on", None),
+            getattr(device, "charger_on", None),
+            getattr(device, "charging_rate", None),
+        )
+        != (
+            getattr(previous[gid], "outlet_on", None),
+            getattr(previous[gid], "charger_on", None),
+            getattr(previous[gid], "charging_rate", None),
+        )
+    )
+    return changed / len(current)
@@ -0,0 +1,132 @@
+"""Deadbands and quantization that keep power noise from becoming new states."""
+
+from typing import NamedTuple
+
+from pyemvue.enums import Scale
+import voluptuous as vol
+
+from .records import UsageRecord
+
+# Convert the kWh of a power scale to watts
+POWER_SCALE_FACTORS: dict[str, int] = {
+    Scale.MINUTE.value: 60 * 1000,
+    Scale.SECOND.value: 3600 * 1000,
+}
+
+
+class DeadbandRule(NamedTuple):
+    """How far the power of a channel has to move before it is published."""
+
+    absolute: float  # watts
+    relative: float  # fraction of the published power
+
+
+class UsageFilter:
+    """Hold the published power of a channel until it leaves the deadband.
+
+    The filter works on the reused records of the power scales: a change that
+    stays within the deadband, or within half a unit of the last shown decimal,
+    keeps the previously published usage in the record's held_usage. The sensor
+    then shows the same value and isn't notified, while the usage itself stays
+    what the API returned for everything else that reads it. Overrides are keyed
+    by device gid or by "gid-channel num", the channel wins over the device.
+    """
+
+    def __init__(
+        self,
+        default: DeadbandRule,
+        overrides: dict[str, DeadbandRule],
+        precision: int | None,
+    ) -> None:
+        """Initialize."""
+        self.default = default
+        self.overrides = overrides
+        self.precision = precision
+        self._rules: dict[str, DeadbandRule] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the filter can hold back any change."""
+        return (
+            self.precision is not None
+            or self.default != (0.0, 0.0)
+            or any(rule != (0.0, 0.0) for rule in self.overrides.values())
+        )
+
+    def rule_for(self, identifier: str, record: UsageRecord) -> DeadbandRule:
+        """Return the deadband of the record's channel."""
+        rule = self._rules.get(identifier)
+        if rule is None:
+            rule = self._rules[identifier] = self.overrides.get(
+                f"{record.device_gid}-{record.channel_num}",
+                self.overrides.get(str(record.device_gid), self.default),
+            )
+        return rule
+
+    def apply(self, data: dict[str, UsageRecord], scale: str) -> None:
+        """Hold back the changes of the tick that are too small to publish."""
+        factor = POWER_SCALE_FACTORS.get(scale)
+        if factor is None or not self.enabled:
+            return
+        # the sensor rounds, a smaller change can't show
+        step = 0.5 * 10**-self.precision if self.precision is not None else 0.0
+        for identifier, record in data.items():
+            usage = record.usage
+            # published on the tick before, whether it was held or not
+            published = (
+                record.previous_usage
+                if record.held_usage is None
+                else record.held_usage
+            )
+            record.held_usage = None
+            if usage is None or published is None:
+                continue
+            change = abs(factor * (usage - published))
+            if change < step:
+                record.held_usage = published
+                continue
+            absolute, relative = self.rule_for(identifier, record)
+            if change <= max(absolute, relative * abs(factor * published)):
+                record.held_usage = published
+
+
+def parse_deadband_rule(value: str) -> DeadbandRule:
+    """Parse "5" as 5 watts or "10%" as 10 percent of the published power."""
+    value = value.strip()
+    try:
+        if value.endswith("%"):
+            rule = DeadbandRule(0.0, float(value[:-1]) / 100)
+        else:
+            rule = DeadbandRule(float(value), 0.0)
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid deadband {value!r}") from err
+    if rule.absolute < 0 or rule.relative < 0:
+        raise vol.Invalid(f"Deadband {value!r} is negative")
+    return rule
+
+
+def parse_deadband_overrides(text: str | None) -> dict[str, DeadbandRule]:
+    """Parse overrides like "12345=5; 12345-1,2,3=10%", one per line or semicolon.
+
+    Channel numbers can contain commas, so those don't separate the overrides.
+    """
+    overrides: dict[str, DeadbandRule] = {}
+    if not text:
+        return overrides
+    for entry in text.replace("\n", ";").split(";"):
+        if not entry.strip():
+            continue
+        key, separator, value = entry.partition("=")
+        gid, _, channel_num = key.strip().partition("-")
+        if not separator or not gid.isdigit():
+            raise vol.Invalid(f"Invalid deadband override {entry.strip()!r}")
+        overrides[f"{gid}-{channel_num}" if channel_num else gid] = parse_deadband_rule(
+            value
+        )
+    return overrides
+
+
+def validate_deadband_overrides(text: str) -> str:
+    """Validate the overrides text of the config flow."""
+    parse_deadband_overrides(text)
+    return text
@@ -0,0 +1,33 @@
+"""Diagnostics support for the Emporia Vue integration."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import AdaptiveDataUpdateCoordinator, PollTimingStats
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the polling diagnostics for a config entry."""
+    entry_data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
+    usage_coordinator: AdaptiveDataUpdateCoordinator = entry_data["coordinator_usage"]
+    minute_timing: PollTimingStats = entry_data["minute_timing"]
+    return {
+        "usage_poll": {
+            "update_interval": str(usage_coordinator.update_interval),
+            "latency": usage_coordinator.poll_interval.latency,
+            "consecutive_failures": (
+                usage_coordinator.poll_interval.consecutive_failures
+            ),
+            "offset": (
+                usage_coordinator.alignment.offset.total_seconds()
+                if usage_coordinator.alignment
+                else None
+            ),
+        },
+        "minute_timing": minute_timing.as_dict(),
+    }
@@ -0,0 +1,151 @@
+"""On-disk ring buffers of the minute power of every channel."""
+
+from array import array
+from datetime import datetime
+import math
+import mmap
+import os
+from pathlib import Path
+import shutil
+import struct
+import threading
+
+from .records import UsageRecord
+
+# The header holds the last written minute, in minutes since the epoch
+HEADER = struct.Struct("<q")
+SAMPLE_SIZE = 4  # float32
+MINUTES_PER_DAY = 24 * 60
+# Watts of one kWh spread over a minute
+MINUTE_WATTS = 60 * 1000
+
+
+class ChannelRing:
+    """A fixed-size, memory-mapped ring of float32 samples, one per minute.
+
+    A minute has a fixed slot, its number modulo the capacity, so no write
+    pointer is kept. Only the last written minute is, and the slots of skipped
+    minutes are cleared to NaN, so every slot within capacity of it is current.
+    """
+
+    def __init__(self, path: Path, capacity: int) -> None:
+        """Open the ring at path, creating or resizing the file as needed."""
+        self.capacity = capacity
+        size = HEADER.size + SAMPLE_SIZE * capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                # new or sized for a different number of days, start over
+                os.ftruncate(fd, 0)
+                os.pwrite(
+                    fd,
+                    HEADER.pack(-1) + (array("f", [math.nan]) * capacity).tobytes(),
+                    0,
+                )
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._samples = memoryview(self._map)[HEADER.size :].cast("f")
+
+    @property
+    def last_minute(self) -> int:
+        """Return the last written minute, or -1 if nothing was written."""
+        return HEADER.unpack_from(self._map, 0)[0]
+
+    def write(self, minute: int, value: float) -> None:
+        """Write the sample of a minute."""
+        last = self.last_minute
+        if minute > last:
+            if last >= 0:
+                # clear the minutes in between, at most one lap
+                for skipped in range(max(last + 1, minute - self.capacity + 1), minute):
+                    self._samples[skipped % self.capacity] = math.nan
+            HEADER.pack_into(self._map, 0, minute)
+        elif minute <= last - self.capacity:
+            return  # older than the ring reaches back
+        self._samples[minute % self.capacity] = value
+
+    def read(self, start: int, end: int) -> list[float | None]:
+        """Return the samples of the minutes from start up to end, both included."""
+        last = self.last_minute
+        capacity = self.capacity
+        samples = self._samples
+        values: list[float | None] = []
+        for minute in range(start, end + 1):
+            value = (
+                samples[minute % capacity] if last - capacity < minute <= last else None
+            )
+            values.append(None if value is None or math.isnan(value) else value)
+        return values
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._samples.release()
+        self._map.close()
+
+
+class MinuteHistory:
+    """The minute power of every channel of a config entry, kept for a few days.
+
+    Every channel has its own ring file named after "gid-channel num" in the
+    directory. The methods do file I/O and run in the executor, possibly on
+    several threads at once, so the rings are only touched under the lock.
+    """
+
+    def __init__(self, directory: Path, days: int) -> None:
+        """Initialize."""
+        self.directory = directory
+        self.capacity = days * MINUTES_PER_DAY
+        self._rings: dict[str, ChannelRing] = {}
+        self._lock = threading.Lock()
+
+    def _ring(self, channel: str, create: bool) -> ChannelRing | None:
+        """Return the ring of a channel, opening its file if needed.
+
+        Has to be called with the lock held.
+        """
+        ring = self._rings.get(channel)
+        if ring is None:
+            if "/" in channel or channel.startswith("."):
+                return None  # not a channel, keep the lookup in the directory
+            path = self.directory / f"{channel}.f32"
+            if not create and not path.exists():
+                return None
+            self.directory.mkdir(parents=True, exist_ok=True)
+            ring = self._rings[channel] = ChannelRing(path, self.capacity)
+        return ring
+
+    def record(self, data: dict[str, UsageRecord], time: datetime) -> None:
+        """Write the minute usage of every channel as watts."""
+        minute = int(time.timestamp()) // 60
+        with self._lock:
+            for record in data.values():
+                if record.usage is None:
+                    continue
+                ring = self._ring(f"{record.device_gid}-{record.channel_num}", True)
+                ring.write(minute, MINUTE_WATTS * record.usage)
+
+    def window(
+        self, channel: str, start: datetime, end: datetime
+    ) -> list[float | None] | None:
+        """Return the watts of the channel for every minute of the window.
+
+        Returns None if nothing was ever recorded for the channel.
+        """
+        with self._lock:
+            ring = self._ring(channel, False)
+            if ring is None:
+                return None
+            return ring.read(int(start.timestamp()) // 60, int(end.timestamp()) // 60)
+
+    def close(self) -> None:
+        """Close the ring files."""
+        with self._lock:
+            for ring in self._rings.values():
+                ring.close()
+            self._rings.clear()
+
+
+def remove_history(directory: Path) -> None:
+    """Remove the ring files of a config entry."""
+    shutil.rmtree(directory, ignore_errors=True)
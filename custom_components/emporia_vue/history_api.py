@@ -0,0 +1,124 @@
+"""Service and websocket command that return windows of the minute history."""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .history import MinuteHistory
+
+SERVICE_GET_MINUTE_HISTORY = "get_minute_history"
+DEFAULT_WINDOW = timedelta(hours=1)
+
+GET_MINUTE_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("channel"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+    }
+)
+
+
+@callback
+def async_setup_history_api(hass: HomeAssistant) -> None:
+    """Register the service and the websocket command."""
+
+    async def handle_get_minute_history(call: ServiceCall) -> ServiceResponse:
+        """Return the minute history of a channel."""
+        return await async_get_minute_history(
+            hass, call.data["channel"], call.data.get("start"), call.data.get("end")
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_MINUTE_HISTORY,
+        handle_get_minute_history,
+        schema=GET_MINUTE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    websocket_api.async_register_command(hass, websocket_minute_history)
+
+
+async def async_get_minute_history(
+    hass: HomeAssistant,
+    channel: str,
+    start: datetime | None,
+    end: datetime | None,
+) -> dict[str, Any]:
+    """Return the watts of a "gid-channel num" channel for every minute of a window.
+
+    The window defaults to the last hour and is cut to what the history keeps.
+    Times without a time zone are in the local time of Home Assistant. Minutes
+    without a sample are None.
+    """
+    histories: list[MinuteHistory] = [
+        entry_data["minute_history"]
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+        if entry_data.get("minute_history") is not None
+    ]
+    if not histories:
+        raise HomeAssistantError("The Emporia Vue minute history is not enabled")
+    end = dt_util.as_utc(dt_util.as_local(end)) if end else dt_util.utcnow()
+    start = dt_util.as_utc(dt_util.as_local(start)) if start else end - DEFAULT_WINDOW
+    if start > end:
+        raise HomeAssistantError(f"The window starts at {start}, after its end {end}")
+    for history in histories:
+        # each entry keeps its own number of minutes
+        window_start = max(start, end - timedelta(minutes=history.capacity - 1))
+        values = await hass.async_add_executor_job(
+            history.window, channel, window_start, end
+        )
+        if values is not None:
+            return {
+                "channel": channel,
+                "start": window_start.replace(second=0, microsecond=0).isoformat(),
+                "interval": 60,
+                "values": values,
+            }
+    raise HomeAssistantError(f"No minute history for channel {channel}")
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/minute_history",
+        vol.Required("channel"): str,
+        vol.Optional("start"): str,
+        vol.Optional("end"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_minute_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the minute history of a channel over the websocket."""
+    times: dict[str, datetime | None] = {}
+    for key in ("start", "end"):
+        times[key] = dt_util.parse_datetime(msg[key]) if key in msg else None
+        if key in msg and times[key] is None:
+            connection.send_error(
+                msg["id"], websocket_api.ERR_INVALID_FORMAT, f"Invalid {key} time"
+            )
+            return
+    try:
+        result = await async_get_minute_history(
+            hass, msg["channel"], times["start"], times["end"]
+        )
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+    connection.send_result(msg["id"], result)
@@ -0,0 +1,230 @@
+"""Import the Emporia history of every channel as external energy statistics."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+import logging
+import re
+from typing import Any, NamedTuple
+
+from pyemvue.device import VueDevice
+from pyemvue.enums import Scale
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import AsyncVueClient
+from .channel_index import apply_usage_sign, usage_sign_policy
+from .const import DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Progress is saved a little after each chunk rather than for every one
+SAVE_DELAY = 10  # seconds
+# Hours of one channel fetched and imported at a time, keeps memory bounded
+CHUNK = timedelta(days=30)
+# Channels imported side by side, the client still caps the requests in flight
+IMPORT_CONCURRENCY = 8
+# Emporia may still be filling in hours this recent, they are imported but not
+# checkpointed, so the next run fetches them again
+SETTLE_TIME = timedelta(hours=2)
+HOUR = timedelta(hours=1)
+
+
+class ImportChannel(NamedTuple):
+    """A channel and the external statistic its history is imported into."""
+
+    statistic_id: str
+    name: str
+    device_gid: int
+    channel_num: str
+    sign_policy: int
+
+
+class HistoryImporter:
+    """Import the hourly energy of every channel, resuming where it stopped.
+
+    Each channel becomes an external statistic with a running sum, which the
+    Energy dashboard can use. The history is fetched in chunks of CHUNK from the
+    chart usage API, and after every chunk the channel's checkpoint is saved: the
+    end of its last settled hour with usage, and the sum up to there. A restart
+    continues from there, so running the import again later only adds the hours
+    since the last run, and refetches the hours that were missing or still
+    filling in at its end.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: AsyncVueClient,
+        days: int,
+    ) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._entry = entry
+        self._client = client
+        self._days = days
+        self._store = import_store(hass, entry.entry_id)
+        self._checkpoints: dict[str, dict[str, float]] | None = None
+        self._semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_schedule(self, devices: dict[int, VueDevice], invert_solar: bool) -> None:
+        """Start an import of every channel of the devices unless one is running."""
+        if "recorder" not in self._hass.config.components:
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._task = self._entry.async_create_background_task(
+            self._hass,
+            self.async_import(import_channels(devices, invert_solar)),
+            "emporia_vue history import",
+        )
+
+    async def async_import(self, channels: list[ImportChannel]) -> None:
+        """Import every channel up to the start of the current hour."""
+        checkpoints = self._checkpoints
+        if checkpoints is None:
+            stored = await self._store.async_load()
+            checkpoints = self._checkpoints = stored["channels"] if stored else {}
+        until = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        earliest = until - timedelta(days=self._days)
+        results = await asyncio.gather(
+            *(
+                self._async_import_channel(
+                    channel, checkpoints, earliest, until - SETTLE_TIME, until
+                )
+                for channel in channels
+            ),
+            return_exceptions=True,
+        )
+        imported = 0
+        for channel, result in zip(channels, results, strict=True):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                _LOGGER.warning(
+                    "Failed to import the history of %s, will resume on the next run: %s",
+                    channel.statistic_id,
+                    result,
+                )
+            else:
+                imported += result
+        await self._store.async_save({"channels": checkpoints})
+        if imported:
+            _LOGGER.info(
+                "Imported %s hours of energy history for %s channels",
+                imported,
+                len(channels),
+            )
+
+    async def _async_import_channel(
+        self,
+        channel: ImportChannel,
+        checkpoints: dict[str, dict[str, float]],
+        earliest: datetime,
+        settled: datetime,
+        until: datetime,
+    ) -> int:
+        """Import the hours of one channel chunk by chunk, return how many.
+
+        The checkpoint only moves up to the end of the last hour with usage that
+        ended before settled. A channel without any usage since its checkpoint
+        moves it to settled with the sum unchanged, so an unused channel isn't
+        fetched in full on every run.
+        """
+        checkpoint = checkpoints.get(channel.statistic_id)
+        if checkpoint:
+            # a channel without usage for longer than the import reaches back
+            # keeps its sum, there is nothing to add to it
+            start = max(dt_util.utc_from_timestamp(checkpoint["end"]), earliest)
+            total = checkpoint["sum"]
+        else:
+            start = earliest
+            total = 0.0
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=channel.name,
+            source=DOMAIN,
+            statistic_id=channel.statistic_id,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+        imported = 0
+        seen_usage = False
+        while start < until:
+            end = min(start + CHUNK, until)
+            async with self._semaphore:
+                usage, first_hour = await self._client.async_get_chart_usage(
+                    channel.device_gid,
+                    channel.channel_num,
+                    start,
+                    end,
+                    Scale.HOUR.value,
+                )
+            statistics: list[StatisticData] = []
+            for hour, kwh in enumerate(usage):
+                hour_start = first_hour.astimezone(UTC) + hour * HOUR
+                if kwh is None or not start <= hour_start < end:
+                    continue
+                seen_usage = True
+                total += apply_usage_sign(kwh, channel.sign_policy)
+                statistics.append(StatisticData(start=hour_start, sum=total))
+                if hour_start + HOUR <= settled:
+                    checkpoints[channel.statistic_id] = {
+                        "end": (hour_start + HOUR).timestamp(),
+                        "sum": total,
+                    }
+            if statistics:
+                async_add_external_statistics(self._hass, metadata, statistics)
+                imported += len(statistics)
+            self._store.async_delay_save(lambda: {"channels": checkpoints}, SAVE_DELAY)
+            start = end
+        if not seen_usage and (
+            not checkpoint or checkpoint["end"] < settled.timestamp()
+        ):
+            checkpoints[channel.statistic_id] = {
+                "end": settled.timestamp(),
+                "sum": total,
+            }
+            self._store.async_delay_save(lambda: {"channels": checkpoints}, SAVE_DELAY)
+        return imported
+
+
+def import_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the import checkpoints of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history_import")
+
+
+def import_channels(
+    devices: dict[int, VueDevice], invert_solar: bool
+) -> list[ImportChannel]:
+    """Return the channels of the devices to import, with their statistic ids."""
+    channels: list[ImportChannel] = []
+    for gid, device in devices.items():
+        for channel in device.channels:
+            if channel.channel_num in ["MainsFromGrid", "MainsToGrid"]:
+                continue  # the chart usage API has no data for these
+            slug = re.sub(r"[^a-z0-9]+", "_", channel.channel_num.lower()).strip("_")
+            channels.append(
+                ImportChannel(
+                    f"{DOMAIN}:energy_{gid}_{slug}",
+                    f"{channel.name or device.device_name} ({channel.channel_num})",
+                    gid,
+                    channel.channel_num,
+                    usage_sign_policy(
+                        channel.channel_num,
+                        "bidirectional" in channel.type.lower(),
+                        channel.channel_type_gid == 13,
+                        invert_solar,
+                    ),
+                )
+            )
+    return channels
@@ -0,0 +1,70 @@
+"""Usage records handed to the sensors by the coordinators."""
+
+from datetime import datetime
+
+from pyemvue.device import VueDevice
+
+
+class UsageRecord:
+    """The usage of one channel at one scale.
+
+    Records of the minute and second scales are reused from tick to tick and
+    updated in place, the usage of the tick before is kept for change detection.
+    The usage is always what the API returned. When the deadband holds back a
+    change, the value the sensor keeps showing is in held_usage; published is
+    what the sensor shows either way.
+    """
+
+    __slots__ = (
+        "channel_num",
+        "device_gid",
+        "held_usage",
+        "info",
+        "previous_usage",
+        "reset",
+        "scale",
+        "timestamp",
+        "usage",
+    )
+
+    def __init__(
+        self,
+        device_gid: int,
+        channel_num: str,
+        scale: str,
+        info: VueDevice,
+        usage: float | None = None,
+        reset: datetime | None = None,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """Initialize."""
+        self.device_gid = device_gid
+        self.channel_num = channel_num
+        self.scale = scale
+        self.info = info
+        self.usage = usage
+        self.previous_usage: float | None = None
+        self.held_usage: float | None = None
+        self.reset = reset
+        self.timestamp = timestamp
+
+    @property
+    def published(self) -> float | None:
+        """Return the usage the sensor shows."""
+        return self.usage if self.held_usage is None else self.held_usage
+
+    def update(
+        self, usage: float | None, reset: datetime | None, timestamp: datetime | None
+    ) -> None:
+        """Update the record in place with the values of a new tick."""
+        self.previous_usage = self.usage
+        self.usage = usage
+        self.reset = reset
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        """Return the record for the debug log."""
+        return (
+            f"UsageRecord({self.device_gid}-{self.channel_num}-{self.scale}"
+            f" usage={self.usage} reset={self.reset} timestamp={self.timestamp})"
+        )
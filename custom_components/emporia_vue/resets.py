@@ -0,0 +1,128 @@
+"""Per-device time zones and the day and billing cycle reset boundaries."""
+
+import asyncio
+import calendar
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta, tzinfo
+
+import dateutil.relativedelta
+import dateutil.tz
+from pyemvue.device import VueDevice
+
+
+class DeviceResetSchedule:
+    """Convert to a device's local time and find its last day and month reset.
+
+    The time zone is resolved once. The current day and billing cycle are kept as
+    timestamp ranges, so a check is a comparison until a boundary is crossed and
+    only then is the next one computed.
+    """
+
+    def __init__(self, tz_info: tzinfo | None, billing_cycle_start_day: int) -> None:
+        """Initialize with the resolved time zone of the device."""
+        self.tz_info = tz_info
+        self.billing_cycle_start_day = billing_cycle_start_day
+        self._day_reset: datetime | None = None
+        self._day_start = 0.0
+        self._next_midnight = 0.0
+        self._month_reset: datetime | None = None
+        self._month_start = 0.0
+        self._next_month_reset = 0.0
+
+    def to_local(self, time: datetime) -> datetime:
+        """Change the datetime to the device's time zone, if not already."""
+        if not time.tzinfo or time.tzinfo.utcoffset(time) is None:
+            # unaware, assume it's already utc
+            time = time.replace(tzinfo=UTC)
+        return time.astimezone(self.tz_info)
+
+    def day_reset(self, time: datetime) -> datetime:
+        """Return the local midnight at or before the time."""
+        timestamp = time.timestamp()
+        if (
+            self._day_reset is None
+            or not self._day_start <= timestamp < self._next_midnight
+        ):
+            reset = determine_reset_datetime(
+                self.to_local(time), self.billing_cycle_start_day, False
+            )
+            # aware arithmetic keeps the wall clock, so this is the next local midnight
+            next_midnight = reset + timedelta(days=1)
+            self._day_reset = reset
+            self._day_start = reset.timestamp()
+            self._next_midnight = next_midnight.timestamp()
+        return self._day_reset
+
+    def month_reset(self, time: datetime) -> datetime:
+        """Return the start of the billing cycle the time falls in."""
+        timestamp = time.timestamp()
+        if (
+            self._month_reset is None
+            or not self._month_start <= timestamp < self._next_month_reset
+        ):
+            reset = determine_reset_datetime(
+                self.to_local(time), self.billing_cycle_start_day, True
+            )
+            next_month = reset + dateutil.relativedelta.relativedelta(months=1)
+            next_reset = next_month.replace(
+                day=min(
+                    self.billing_cycle_start_day,
+                    calendar.monthrange(next_month.year, next_month.month)[1],
+                )
+            )
+            self._month_reset = reset
+            self._month_start = reset.timestamp()
+            self._next_month_reset = next_reset.timestamp()
+        return self._month_reset
+
+
+async def async_build_reset_schedules(
+    devices: Iterable[VueDevice],
+) -> dict[int, DeviceResetSchedule]:
+    """Build the reset schedule of every device, keyed by device gid."""
+    devices = list(devices)
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    # gettz can read the time zone database from disk, resolve each zone only once
+    tz_strings = {device.time_zone for device in devices}
+    tz_infos: dict[str, tzinfo | None] = await loop.run_in_executor(
+        None,
+        lambda: {tz_string: dateutil.tz.gettz(tz_string) for tz_string in tz_strings},
+    )
+    return {
+        device.device_gid: DeviceResetSchedule(
+            tz_infos[device.time_zone], device.billing_cycle_start_day
+        )
+        for device in devices
+    }
+
+
+def determine_reset_datetime(
+    local_time: datetime, monthly_cycle_start: int, is_month: bool
+) -> datetime:
+    """Determine the last reset datetime (aware) based on the passed time and cycle start date."""
+    reset_datetime: datetime = local_time.replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    if is_month:
+        # Month should use the most recent billing_cycle_start_day midnight.
+        # Never return a future reset datetime.
+        last_day_this_month = calendar.monthrange(
+            reset_datetime.year, reset_datetime.month
+        )[1]
+        target_day_this_month = min(monthly_cycle_start, last_day_this_month)
+        candidate_this_month = reset_datetime.replace(day=target_day_this_month)
+
+        if local_time >= candidate_this_month:
+            reset_datetime = candidate_this_month
+        else:
+            previous_month = reset_datetime - dateutil.relativedelta.relativedelta(
+                months=1
+            )
+            last_day_previous_month = calendar.monthrange(
+                previous_month.year, previous_month.month
+            )[1]
+            target_day_previous_month = min(
+                monthly_cycle_start, last_day_previous_month
+            )
+            reset_datetime = previous_month.replace(day=target_day_previous_month)
+    return reset_datetime
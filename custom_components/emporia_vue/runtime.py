@@ -0,0 +1,44 @@
+"""The state one config entry keeps between the polls of its Emporia account."""
+
+from datetime import datetime
+
+from pyemvue.device import VueDevice
+
+from .accumulator import UsageAccumulator
+from .channel_index import ChannelIndex
+from .const import DEFAULT_USAGE_SHARD_SIZE
+from .records import UsageRecord
+from .resets import DeviceResetSchedule
+
+
+class VueRuntime:
+    """The devices, settings and usage caches of one config entry.
+
+    Every config entry has its own, so several accounts can be polled side by
+    side without one clobbering the devices or the totals of another.
+    """
+
+    def __init__(
+        self,
+        invert_solar: bool = True,
+        shard_size: int = DEFAULT_USAGE_SHARD_SIZE,
+        columnar: bool = False,
+    ) -> None:
+        """Initialize."""
+        self.invert_solar = invert_solar
+        self.shard_size = shard_size
+        self.columnar = columnar
+        self.device_gids: list[str] = []
+        self.devices: dict[int, VueDevice] = {}
+        self.reset_schedules: dict[int, DeviceResetSchedule] = {}
+        self.channel_indexes: dict[str, ChannelIndex] = {}
+        # (device gid, channel num) of unused channels that can't be added as
+        # special ones
+        self.ignored_channels: set[tuple[int, str]] = set()
+        self.last_minute_data: dict[str, UsageRecord] = {}
+        self.last_day_data: dict[str, UsageRecord] = {}
+        self.last_day_update: datetime | None = None
+        self.last_month_data: dict[str, UsageRecord] = {}
+        self.last_month_update: datetime | None = None
+        self.day_accumulator: UsageAccumulator | None = None
+        self.month_accumulator: UsageAccumulator | None = None
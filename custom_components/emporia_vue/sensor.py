@@ -18,7 +18,8 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, VUE_DEVICES
+from .records import UsageRecord
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    coordinator_1s = hass.data[DOMAIN][config_entry.entry_id]["coordinator_1s"]
     coordinator_1min = hass.data[DOMAIN][config_entry.entry_id]["coordinator_1min"]
     coordinator_1mon = hass.data[DOMAIN][config_entry.entry_id]["coordinator_1mon"]
     coordinator_day_sensor = hass.data[DOMAIN][config_entry.entry_id][
@@ -37,43 +39,79 @@ async def async_setup_entry(
     ]
 
     _LOGGER.info(hass.data[DOMAIN][config_entry.entry_id])
+    channels = build_channel_map(hass.data[DOMAIN][config_entry.entry_id][VUE_DEVICES])
+    precision: int | None = hass.data[DOMAIN][config_entry.entry_id][
+        "usage_filter"
+    ].precision
+
+    if coordinator_1s:
+        async_add_entities(
+            CurrentVuePowerSensor(coordinator_1s, identifier, channels, precision)
+            for identifier in coordinator_1s.data
+        )
 
     if coordinator_1min:
         async_add_entities(
-            CurrentVuePowerSensor(coordinator_1min, identifier)
-            for _, identifier in enumerate(coordinator_1min.data)
+            CurrentVuePowerSensor(coordinator_1min, identifier, channels, precision)
+            for identifier in coordinator_1min.data
         )
 
     if coordinator_1mon:
         async_add_entities(
-            CurrentVuePowerSensor(coordinator_1mon, identifier)
-            for _, identifier in enumerate(coordinator_1mon.data)
+            CurrentVuePowerSensor(coordinator_1mon, identifier, channels, precision)
+            for identifier in coordinator_1mon.data
         )
 
     if coordinator_day_sensor:
         async_add_entities(
-            CurrentVuePowerSensor(coordinator_day_sensor, identifier)
-            for _, identifier in enumerate(coordinator_day_sensor.data)
+            CurrentVuePowerSensor(
+                coordinator_day_sensor, identifier, channels, precision
+            )
+            for identifier in coordinator_day_sensor.data
         )
 
 
+def build_channel_map(
+    devices: dict[int, VueDevice],
+) -> dict[tuple[int, str], VueDeviceChannel]:
+    """Map (device gid, channel num) to the channel, for every device."""
+    channels: dict[tuple[int, str], VueDeviceChannel] = {}
+    for device_gid, device in devices.items():
+        for channel in device.channels:
+            # the first channel with the number wins, like a scan would find it
+            channels.setdefault((device_gid, channel.channel_num), channel)
+    return channels
+
+
 class CurrentVuePowerSensor(CoordinatorEntity, SensorEntity):  # type: ignore
     """Representation of a Vue Sensor's current power."""
 
-    def __init__(self, coordinator, identifier) -> None:
-        """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator,
+        identifier,
+        channels: dict[tuple[int, str], VueDeviceChannel],
+        precision: int | None = None,
+    ) -> None:
+        """Pass coordinator to CoordinatorEntity.
+
+        The channel is looked up in channels, built once by build_channel_map. The
+        identifier is the listener context, the coordinator only updates the
+        sensor when the usage or reset of its identifier changed. Power is rounded
+        to precision decimal places when it is set.
+        """
+        super().__init__(coordinator, identifier)
         self._id = identifier
-        self._scale: str = coordinator.data[identifier]["scale"]
-        device_gid: int = coordinator.data[identifier]["device_gid"]
-        channel_num: str = coordinator.data[identifier]["channel_num"]
-        self._device: VueDevice = coordinator.data[identifier]["info"]
-        final_channel: VueDeviceChannel | None = None
-        if self._device is not None:
-            for channel in self._device.channels:
-                if channel.channel_num == channel_num:
-                    final_channel = channel
-                    break
+        record: UsageRecord = coordinator.data[identifier]
+        self._scale: str = record.scale
+        device_gid: int = record.device_gid
+        channel_num: str = record.channel_num
+        self._device: VueDevice = record.info
+        final_channel: VueDeviceChannel | None = (
+            channels.get((device_gid, channel_num))
+            if self._device is not None
+            else None
+        )
         if final_channel is None:
             _LOGGER.warning(
                 "No channel found for device_gid %s and channel_num %s",
@@ -84,9 +122,18 @@ class CurrentVuePowerSensor(CoordinatorEntity, SensorEntity):  # type: ignore
                 f"No channel found for device_gid {device_gid} and channel_num {channel_num}"
             )
         self._channel: VueDeviceChannel = final_channel
+        # everything that depends on the scale is resolved once, the properties
+        # read by every state write are plain attribute loads
         self._iskwh = self.scale_is_energy()
+        self._multiplier: int = self.scale_multiplier()
+        self._precision: int | None = None if self._iskwh else precision
 
         self._attr_has_entity_name = True
+        scale_id = "instant" if self._scale == Scale.MINUTE.value else self._scale
+        self._attr_unique_id = (
+            f"sensor.emporia_vue.{scale_id}."
+            f"{final_channel.device_gid}-{final_channel.channel_num}"
+        )
         if self._iskwh:
             self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
             self._attr_device_class = SensorDeviceClass.ENERGY
@@ -100,15 +147,11 @@ class CurrentVuePowerSensor(CoordinatorEntity, SensorEntity):  # type: ignore
             self._attr_suggested_display_precision = 1
             self._attr_name = f"Power {self.scale_readable()}"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        device_name = self._channel.name or self._device.device_name
-        return DeviceInfo(
+        self._attr_device_info = DeviceInfo(
             identifiers={
-                (DOMAIN, f"{self._device.device_gid}-{self._channel.channel_num}")
+                (DOMAIN, f"{self._device.device_gid}-{final_channel.channel_num}")
             },
-            name=device_name,
+            name=final_channel.name or self._device.device_name,
             model=self._device.model,
             sw_version=self._device.firmware,
             manufacturer="Emporia",
@@ -117,42 +160,36 @@ class CurrentVuePowerSensor(CoordinatorEntity, SensorEntity):  # type: ignore
     @property
     def last_reset(self) -> datetime | None:
         """Reset time of the daily/monthly sensor. Midnight local time."""
-        if self._id in self.coordinator.data:
-            return self.coordinator.data[self._id]["reset"]
-        return None
+        record: UsageRecord | None = self.coordinator.data.get(self._id)
+        return record.reset if record is not None else None
 
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if self._id in self.coordinator.data:
-            usage = self.coordinator.data[self._id]["usage"]
-            return self.scale_usage(usage) if usage is not None else None
-        return None
-
-    @property
-    def unique_id(self) -> str:
-        """Return the Unique ID for the sensor."""
-        if self._scale == Scale.MINUTE.value:
-            return (
-                "sensor.emporia_vue.instant."
-                f"{self._channel.device_gid}-{self._channel.channel_num}"
-            )
-        return (
-            f"sensor.emporia_vue.{self._scale}."
-            f"{self._channel.device_gid}-{self._channel.channel_num}"
-        )
+        record: UsageRecord | None = self.coordinator.data.get(self._id)
+        if record is None:
+            return None
+        usage: float | None = record.published
+        if usage is None:
+            return None
+        if self._precision is not None:
+            return round(self._multiplier * usage, self._precision)
+        return self._multiplier * usage
 
     def scale_usage(self, usage):
         """Scales the usage to the correct timescale and magnitude."""
+        return self._multiplier * usage
+
+    def scale_multiplier(self) -> int:
+        """Return the factor that scales the usage to the correct magnitude."""
         if self._scale == Scale.MINUTE.value:
-            usage = 60 * 1000 * usage  # convert from kwh to w rate
-        elif self._scale == Scale.SECOND.value:
-            usage = 3600 * 1000 * usage  # convert to rate
-        elif self._scale == Scale.MINUTES_15.value:
-            usage = (
-                4 * 1000 * usage
-            )  # this might never be used but for safety, convert to rate
-        return usage
+            return 60 * 1000  # convert from kwh to w rate
+        if self._scale == Scale.SECOND.value:
+            return 3600 * 1000  # convert to rate
+        if self._scale == Scale.MINUTES_15.value:
+            # this might never be used but for safety, convert to rate
+            return 4 * 1000
+        return 1
 
     def scale_is_energy(self):
         """Return True if the scale is an energy unit instead of power."""
@@ -164,6 +201,8 @@ class CurrentVuePowerSensor(CoordinatorEntity, SensorEntity):  # type: ignore
 
     def scale_readable(self):
         """Return a human readable scale."""
+        if self._scale == Scale.SECOND.value:
+            return "Second Average"
         if self._scale == Scale.MINUTE.value:
             return "Minute Average"
         if self._scale == Scale.DAY.value:
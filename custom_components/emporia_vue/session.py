@@ -0,0 +1,98 @@
+"""Persist the Emporia session so restarts don't need a full login."""
+
+import asyncio
+import logging
+from typing import Any
+
+from pyemvue import PyEmVue
+from pyemvue.auth import Auth
+from pyemvue.pyemvue import API_ROOT
+
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import AsyncVueClient
+from .const import DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+TOKEN_KEYS = ("access_token", "id_token", "refresh_token")
+# Tokens refresh about once an hour, no need to write them out right away
+SAVE_DELAY = 10  # seconds
+
+
+class VueSessionStore:
+    """Save the token set to Home Assistant storage and restore it on startup."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.session"
+        )
+
+    async def async_restore(
+        self, vue: PyEmVue, client: AsyncVueClient, email: str
+    ) -> bool:
+        """Restore the saved session for the account, returns false if there is none.
+
+        Expired tokens are refreshed, anything that fails means a password login
+        is needed instead.
+        """
+        stored = await self._store.async_load()
+        if (
+            not stored
+            or stored.get(CONF_EMAIL) != email
+            or not all(stored["tokens"].get(key) for key in TOKEN_KEYS)
+        ):
+            return False
+        try:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            # creating the Cognito client reads botocore data files, keep it off the loop
+            await loop.run_in_executor(
+                None, self._restore_auth, vue, email, stored["tokens"]
+            )
+            if client.tokens_expired():
+                await client.async_refresh_tokens()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            _LOGGER.info("Could not restore the saved Emporia session: %s", err)
+            return False
+        _LOGGER.debug("Restored the saved Emporia session for %s", email)
+        self.async_save(vue, email)
+        return True
+
+    def track(self, vue: PyEmVue, client: AsyncVueClient, email: str) -> None:
+        """Save the tokens whenever PyEmVue or the async client refreshes them."""
+        vue.auth.token_updater = lambda _tokens: self._hass.add_job(
+            self.async_save, vue, email
+        )
+        client.token_listener = lambda: self.async_save(vue, email)
+
+    @callback
+    def async_save(self, vue: PyEmVue, email: str) -> None:
+        """Schedule saving the current tokens."""
+        self._store.async_delay_save(
+            lambda: {
+                CONF_EMAIL: email,
+                "tokens": {key: vue.auth.tokens.get(key) for key in TOKEN_KEYS},
+            },
+            SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the saved session."""
+        await self._store.async_remove()
+
+    def _restore_auth(self, vue: PyEmVue, email: str, tokens: dict[str, Any]) -> None:
+        """Recreate PyEmVue's authentication from the tokens without logging in."""
+        vue.username = email.lower()
+        vue.auth = Auth(
+            host=API_ROOT,
+            username=vue.username,
+            connect_timeout=vue.connect_timeout,
+            read_timeout=vue.read_timeout,
+            tokens=tokens,
+        )
+        vue.auth.tokens = {key: tokens[key] for key in TOKEN_KEYS}
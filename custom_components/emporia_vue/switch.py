@@ -1,57 +1,27 @@
 """Platform for switch integration."""
 
-import asyncio
-from datetime import timedelta
 import logging
 from typing import Any
 
-from pyemvue import PyEmVue
-from pyemvue.device import ChargerDevice, OutletDevice, VueDevice
-from requests import exceptions
+from pyemvue.device import VueDevice
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import PlatformNotReady
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
-    UpdateFailed,
 )
 
+from .api import AsyncVueClient, EmporiaApiError
 from .charger_entity import EmporiaChargerEntity
-from .const import DOMAIN, VUE_DATA
+from .const import DOMAIN, VUE_CLIENT, VUE_DEVICES
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
-device_information: dict[str, VueDevice] = {}  # data is the populated device objects
-
-
-async def __async_update_data(vue: PyEmVue):
-    """Fetch data from API endpoint.
-
-    This is the place to pre-process the data to lookup tables
-    so entities can quickly look up their data.
-    """
-    try:
-        # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-        # handled by the data update coordinator.
-        data: dict[str, Any] = {}
-        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-        outlets: list[OutletDevice]
-        chargers: list[ChargerDevice]
-        (outlets, chargers) = await loop.run_in_executor(None, vue.get_devices_status)
-        if outlets:
-            for outlet in outlets:
-                data[str(outlet.device_gid)] = outlet
-        if chargers:
-            for charger in chargers:
-                data[str(charger.device_gid)] = charger
-        return data
-    except Exception as err:
-        raise UpdateFailed(f"Error communicating with Emporia API: {err}") from err
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -59,42 +29,47 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    vue: PyEmVue = hass.data[DOMAIN][config_entry.entry_id][VUE_DATA]
-
-    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-    devices: list[VueDevice] = await loop.run_in_executor(None, vue.get_devices)
-    for device in devices:
-        if device.outlet or device.ev_charger:
-            device_information[str(device.device_gid)] = device
-
-    async def async_update_data():
-        return await __async_update_data(
-            vue=vue,
-        )
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        # Name of the data. For logging purposes.
-        name="switch",
-        update_method=async_update_data,
-        # Polling interval. Will only be polled if there are subscribers.
-        update_interval=timedelta(minutes=1),
-    )
-
-    await coordinator.async_refresh()
+    client: AsyncVueClient = hass.data[DOMAIN][config_entry.entry_id][VUE_CLIENT]
+    devices: dict[int, VueDevice] = hass.data[DOMAIN][config_entry.entry_id][
+        VUE_DEVICES
+    ]
+
+    # the populated outlet and charger devices of this entry, keyed by gid
+    device_information: dict[str, VueDevice] = {
+        str(device.device_gid): device
+        for device in devices.values()
+        if device.outlet or device.ev_charger
+    }
+
+    coordinator: DataUpdateCoordinator[dict[str, Any]] | None = hass.data[DOMAIN][
+        config_entry.entry_id
+    ]["coordinator_switch"]
+    if coordinator is None:
+        return
+    if not coordinator.last_update_success:
+        # the first refresh doesn't hold up the entry, retry just the switches
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise PlatformNotReady(
+                "Could not get the state of the outlets and chargers"
+            ) from coordinator.last_exception
+    if not coordinator.data:
+        _LOGGER.debug("No outlets or chargers reported for %s", config_entry.title)
+        return
 
     switches = []
     for _, gid in enumerate(coordinator.data):
         if gid not in device_information:
             continue
         if device_information[gid].outlet:
-            switches.append(EmporiaOutletSwitch(coordinator, vue, gid))
+            switches.append(
+                EmporiaOutletSwitch(coordinator, client, device_information[gid])
+            )
         elif device_information[gid].ev_charger:
             switches.append(
                 EmporiaChargerSwitch(
                     coordinator,
-                    vue,
+                    client,
                     device_information[gid],
                     None,
                     SwitchDeviceClass.OUTLET,
@@ -108,33 +83,32 @@ class EmporiaOutletSwitch(CoordinatorEntity, SwitchEntity):  # type: ignore
     """Representation of an Emporia Smart Outlet state."""
 
     def __init__(
-        self, coordinator: DataUpdateCoordinator[dict[str, Any]], vue: PyEmVue, gid: str
+        self,
+        coordinator: DataUpdateCoordinator[dict[str, Any]],
+        client: AsyncVueClient,
+        device: VueDevice,
     ) -> None:
-        """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator)
-        self._vue = vue
+        """Pass coordinator to CoordinatorEntity, updated when the outlet changes."""
+        gid = str(device.device_gid)
+        super().__init__(coordinator, gid)
+        self._client = client
         self._device_gid = gid
-        self._device: VueDevice = device_information[gid]
+        self._device: VueDevice = device
         self._attr_has_entity_name = True
         self._attr_name = None
         self._attr_device_class = SwitchDeviceClass.OUTLET
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None, self._vue.update_outlet, self.coordinator.data[self._device_gid], True
+        await self._client.async_update_outlet(
+            self.coordinator.data[self._device_gid], True
         )
         await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            self._vue.update_outlet,
-            self.coordinator.data[self._device_gid],
-            False,
+        await self._client.async_update_outlet(
+            self.coordinator.data[self._device_gid], False
         )
         await self.coordinator.async_request_refresh()
 
@@ -186,19 +160,16 @@ class EmporiaChargerSwitch(EmporiaChargerEntity, SwitchEntity):  # type: ignore
 
     async def _update_switch(self, on: bool) -> None:
         """Update the switch."""
-        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
         try:
-            await loop.run_in_executor(
-                None,
-                self._vue.update_charger,
+            await self._client.async_update_charger(
                 self.coordinator.data[self._device_gid],
                 on,
             )
-        except exceptions.HTTPError as err:
+        except EmporiaApiError as err:
             _LOGGER.error(
                 "Error updating charger status: %s \nResponse body: %s",
                 err,
-                err.response.text,
+                err.body,
             )
             raise
         await self.coordinator.async_request_refresh()
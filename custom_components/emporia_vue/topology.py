@@ -0,0 +1,119 @@
+"""Cache the Emporia device topology so setup doesn't wait on the device list."""
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from pyemvue.device import ChargerDevice, VueDevice
+
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class VueTopologyStore:
+    """Save the device list to Home Assistant storage and restore it on startup.
+
+    Besides the topology (the devices and their channels, time zones, billing
+    cycle days and outlets/chargers) the last known connection and charger status
+    is kept, so the entities built from the cache show it until the device list
+    is revalidated against the API.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.topology"
+        )
+
+    async def async_load(self, email: str) -> dict[int, VueDevice] | None:
+        """Return the cached devices by gid, or None if nothing was cached."""
+        stored = await self._store.async_load()
+        if not stored or stored.get(CONF_EMAIL) != email or not stored["devices"]:
+            return None
+        try:
+            devices = [
+                VueDevice().from_json_dictionary(device) for device in stored["devices"]
+            ]
+        except (KeyError, TypeError) as err:
+            _LOGGER.info("Ignoring the cached Emporia device list: %s", err)
+            return None
+        return {device.device_gid: device for device in devices}
+
+    async def async_save(self, email: str, devices: dict[int, VueDevice]) -> None:
+        """Save the devices."""
+        await self._store.async_save(
+            {CONF_EMAIL: email, "devices": devices_as_list(devices)}
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached devices."""
+        await self._store.async_remove()
+
+
+def devices_as_list(
+    devices: dict[int, VueDevice], status: bool = True
+) -> list[dict[str, Any]]:
+    """Return the devices in the shape of the API response.
+
+    Without the status only the topology is left, to compare two device lists.
+    """
+    return [device_as_dictionary(devices[gid], status) for gid in sorted(devices)]
+
+
+def device_as_dictionary(device: VueDevice, status: bool = True) -> dict[str, Any]:
+    """Return a device as VueDevice.from_json_dictionary reads it."""
+    dictionary = {
+        "deviceGid": device.device_gid,
+        "manufacturerDeviceId": device.manufacturer_id,
+        "model": device.model,
+        "firmware": device.firmware,
+        "parentDeviceGid": device.parent_device_gid,
+        "parentChannelNum": device.parent_channel_num,
+        "locationProperties": {
+            "deviceName": device.device_name,
+            "displayName": device.display_name,
+            "timeZone": device.time_zone,
+            "billingCycleStartDay": device.billing_cycle_start_day,
+            "solar": device.solar,
+        },
+        "channels": [channel.as_dictionary() for channel in device.channels],
+        "outlet": device.outlet.as_dictionary() if device.outlet else None,
+        "evCharger": charger_as_dictionary(device.ev_charger, status)
+        if device.ev_charger
+        else None,
+    }
+    if status:
+        dictionary["deviceConnected"] = {
+            "connected": device.connected,
+            "offlineSince": device.offline_since.isoformat()
+            if device.offline_since != datetime.min
+            else None,
+        }
+    return dictionary
+
+
+def charger_as_dictionary(
+    charger: ChargerDevice, status: bool = True
+) -> dict[str, Any]:
+    """Return a charger, with the status that ChargerDevice.as_dictionary leaves out."""
+    if not status:
+        return charger.as_dictionary()
+    return {
+        **charger.as_dictionary(),
+        "message": charger.message,
+        "status": charger.status,
+        "icon": charger.icon,
+        "iconLabel": charger.icon_label,
+        "iconDetailText": charger.icon_detail_text,
+        "faultText": charger.fault_text,
+        "offPeakSchedulesEnabled": charger.off_peak_schedules_enabled,
+        "debugCode": charger.debug_code,
+        "proControlCode": charger.pro_control_code,
+    }
@@ -0,0 +1,135 @@
+"""Persist the day and month totals so a restart doesn't have to refetch them."""
+
+from collections.abc import Callable
+from datetime import datetime
+import logging
+import time
+from typing import Any, NamedTuple
+
+from pyemvue.device import VueDevice
+
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .records import UsageRecord
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# The totals change every minute, write them out at most this often
+SAVE_INTERVAL = 300  # seconds
+
+
+class UsageTotals(NamedTuple):
+    """The day or month data the sensors show and when the API last trued it up."""
+
+    data: dict[str, UsageRecord]
+    last_update: datetime | None
+
+
+class VueTotalsStore:
+    """Save the day and month totals to Home Assistant storage.
+
+    Saves are spread out to one per SAVE_INTERVAL, the pending one is written on
+    shutdown. Records of devices or channels that no longer exist are dropped
+    when the totals are restored.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.totals"
+        )
+        self._next_save: float | None = None
+
+    async def async_load(
+        self, email: str, devices: dict[int, VueDevice], scales: dict[str, str]
+    ) -> dict[str, UsageTotals] | None:
+        """Return the saved totals by scale, or None if nothing was saved.
+
+        scales maps the name the totals are saved under to their scale.
+        """
+        stored = await self._store.async_load()
+        if not stored or stored.get(CONF_EMAIL) != email:
+            return None
+        channels = {
+            gid: {channel.channel_num for channel in device.channels}
+            for gid, device in devices.items()
+        }
+        totals: dict[str, UsageTotals] = {}
+        try:
+            for name, scale in scales.items():
+                if name not in stored:
+                    continue
+                data: dict[str, UsageRecord] = {}
+                for gid, channel_num, usage, reset, timestamp in stored[name][
+                    "records"
+                ]:
+                    if channel_num not in channels.get(gid, ()):
+                        continue
+                    data[f"{gid}-{channel_num}-{scale}"] = UsageRecord(
+                        gid,
+                        channel_num,
+                        scale,
+                        devices[gid],
+                        usage,
+                        _parse_time(reset),
+                        _parse_time(timestamp),
+                    )
+                if data:
+                    totals[name] = UsageTotals(
+                        data, _parse_time(stored[name]["last_update"])
+                    )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.info("Ignoring the saved Emporia totals: %s", err)
+            return None
+        return totals
+
+    @callback
+    def async_schedule_save(
+        self, email: str, totals: Callable[[], dict[str, UsageTotals]]
+    ) -> None:
+        """Schedule saving the totals, at most once per SAVE_INTERVAL."""
+        now = time.monotonic()
+        if self._next_save is None or now >= self._next_save:
+            self._next_save = now + SAVE_INTERVAL
+        # rescheduling keeps the deadline, so the totals are written at the latest then
+        self._store.async_delay_save(
+            lambda: {
+                CONF_EMAIL: email,
+                **{
+                    name: {
+                        "last_update": _format_time(total.last_update),
+                        "records": [
+                            [
+                                record.device_gid,
+                                record.channel_num,
+                                record.usage,
+                                _format_time(record.reset),
+                                _format_time(record.timestamp),
+                            ]
+                            for record in total.data.values()
+                        ],
+                    }
+                    for name, total in totals().items()
+                },
+            },
+            self._next_save - now,
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the saved totals."""
+        await self._store.async_remove()
+
+
+def _format_time(time_to_format: datetime | None) -> str | None:
+    """Format an aware datetime for storage."""
+    return time_to_format.isoformat() if time_to_format else None
+
+
+def _parse_time(stored: str | None) -> datetime | None:
+    """Parse a datetime formatted by _format_time."""
+    return dt_util.parse_datetime(stored) if stored else None
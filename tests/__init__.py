@@ -0,0 +1 @@
+"""Tests for the Emporia Vue integration."""
@@ -0,0 +1,79 @@
+"""Test the day and month totals integrated from the minute usage."""
+
+from array import array
+from datetime import UTC, datetime, timedelta
+
+from pyemvue.enums import Scale
+import pytest
+
+from custom_components.emporia_vue import accumulator as accumulator_module
+from custom_components.emporia_vue.accumulator import UsageAccumulator
+from custom_components.emporia_vue.channel_index import (
+    SIGN_KEEP,
+    ChannelIndex,
+    IndexedChannel,
+)
+from custom_components.emporia_vue.records import UsageRecord
+from custom_components.emporia_vue.resets import DeviceResetSchedule
+
+DAY = Scale.DAY.value
+MIDNIGHT = datetime(2024, 5, 1, tzinfo=UTC)
+# the second device crosses midnight later than the first one
+SCHEDULES = {1: DeviceResetSchedule(UTC, 1), 2: DeviceResetSchedule(UTC, 1)}
+
+
+def reset_for(schedule: DeviceResetSchedule, timestamp: datetime) -> datetime:
+    """Return the last midnight, an hour later for the second device."""
+    if schedule is SCHEDULES[2]:
+        timestamp -= timedelta(hours=1)
+    return datetime(timestamp.year, timestamp.month, timestamp.day, tzinfo=UTC)
+
+
+def make_index() -> ChannelIndex:
+    """Return the index of two devices with two channels each."""
+    return ChannelIndex(
+        [
+            IndexedChannel(
+                f"{gid}-{num}-{DAY}", gid, num, None, SCHEDULES[gid], SIGN_KEEP
+            )
+            for gid in (1, 2)
+            for num in ("1", "2")
+        ]
+    )
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_totals_and_resets(numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test minutes add up and a reset zeroes only the device that crossed it."""
+    if not numpy:
+        monkeypatch.setattr(accumulator_module, "np", None)
+    index = make_index()
+    reset = MIDNIGHT - timedelta(days=1)
+    data = {
+        "1-1-" + DAY: UsageRecord(1, "1", DAY, None, 1.0, reset),
+        "1-2-" + DAY: UsageRecord(1, "2", DAY, None, 2.0, reset),
+        "2-1-" + DAY: UsageRecord(2, "1", DAY, None, 3.0, reset),
+        # no total from the API, left alone
+        "2-2-" + DAY: UsageRecord(2, "2", DAY, None, None, reset),
+    }
+    accumulator = UsageAccumulator(index, data, reset_for)
+    totals = accumulator.usage
+
+    accumulator.add(
+        array("d", [0.5, 0.25, 0.125, 1.0]), MIDNIGHT - timedelta(minutes=1)
+    )
+    accumulator.store()
+    assert [record.usage for record in data.values()] == [1.5, 2.25, 3.125, None]
+
+    # the first device crossed midnight, the second one hasn't yet
+    accumulator.add(array("d", [0.5, 0.25, 0.125, 1.0]), MIDNIGHT)
+    accumulator.store()
+    assert [record.usage for record in data.values()] == [0.5, 0.25, 3.25, None]
+    assert [record.reset for record in data.values()] == [
+        MIDNIGHT,
+        MIDNIGHT,
+        reset,
+        reset,
+    ]
+    # the totals were updated in place
+    assert accumulator.usage is totals
@@ -0,0 +1,168 @@
+"""Test the async client against a local stand-in for the Emporia API."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+import jwt
+import pytest
+
+from custom_components.emporia_vue import api
+from custom_components.emporia_vue.api import AsyncVueClient, EmporiaApiError
+
+# the stand-in listens on localhost
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+STATUS_BODY = {"outlets": [], "evChargers": []}
+
+
+def make_token(name: str) -> str:
+    """Return an access token that expires in an hour."""
+    return jwt.encode({"sub": name, "exp": time.time() + 3600}, "secret")
+
+
+class StandInApi:
+    """Answer the status call and the Cognito refresh like Emporia would.
+
+    Requests are rejected with 401 unless they carry the current id token, and
+    the first server_errors requests fail with 503.
+    """
+
+    def __init__(self, server_errors: int = 0) -> None:
+        """Initialize."""
+        self.id_token = "id-1"
+        self.server_errors = server_errors
+        self.requests: list[str] = []
+        self.refreshes = 0
+
+    def app(self) -> web.Application:
+        """Return the application that serves the stand-in."""
+        app = web.Application()
+        app.router.add_post("/cognito", self.handle_refresh)
+        app.router.add_get("/{path:.*}", self.handle_status)
+        return app
+
+    async def handle_status(self, request: web.Request) -> web.Response:
+        """Serve the device status."""
+        self.requests.append(request.headers["authtoken"])
+        if self.server_errors:
+            self.server_errors -= 1
+            return web.Response(status=503, text="unavailable")
+        if request.headers["authtoken"] != self.id_token:
+            return web.Response(status=401, text="expired")
+        return web.json_response(STATUS_BODY)
+
+    async def handle_refresh(self, request: web.Request) -> web.Response:
+        """Hand out a new token set, slowly enough for the callers to pile up."""
+        body = json.loads(await request.text())
+        assert body["AuthParameters"]["REFRESH_TOKEN"] == "refresh"
+        await asyncio.sleep(0.05)
+        self.refreshes += 1
+        self.id_token = f"id-{self.refreshes + 1}"
+        return web.json_response(
+            {
+                "AuthenticationResult": {
+                    "AccessToken": make_token(self.id_token),
+                    "IdToken": self.id_token,
+                    "TokenType": "Bearer",
+                }
+            }
+        )
+
+
+@pytest.fixture
+async def stand_in(monkeypatch: pytest.MonkeyPatch):
+    """Run a stand-in API and return it along with a client pointed at it."""
+
+    async def start(server_errors: int = 0) -> tuple[StandInApi, AsyncVueClient]:
+        stand_in_api = StandInApi(server_errors)
+        server = TestServer(stand_in_api.app())
+        await server.start_server()
+        servers.append(server)
+        monkeypatch.setattr(api, "COGNITO_URL", str(server.make_url("/cognito")))
+        monkeypatch.setattr(api, "INITIAL_RETRY_DELAY", 0)
+        vue = SimpleNamespace(
+            auth=SimpleNamespace(
+                host=str(server.make_url("")).rstrip("/"),
+                tokens={
+                    "access_token": make_token("id-1"),
+                    "id_token": "id-1",
+                    "refresh_token": "refresh",
+                },
+                cognito=SimpleNamespace(),
+            )
+        )
+        return stand_in_api, AsyncVueClient(session, vue)
+
+    servers: list[TestServer] = []
+    session = ClientSession()
+    yield start
+    await session.close()
+    for server in servers:
+        await server.close()
+
+
+async def test_unauthorized_refreshes_and_retries(stand_in) -> None:
+    """Test a 401 refreshes the tokens and retries with the new id token."""
+    stand_in_api, client = await stand_in()
+    stand_in_api.id_token = "id-0"  # the client's token was revoked
+    refreshed: list[bool] = []
+    client.token_listener = lambda: refreshed.append(True)
+
+    assert await client.async_get_devices_status() == ([], [])
+
+    assert stand_in_api.refreshes == 1
+    assert stand_in_api.requests == ["id-1", "id-2"]
+    assert client.tokens["id_token"] == "id-2"
+    assert refreshed == [True]
+
+
+async def test_concurrent_unauthorized_refresh_once(stand_in) -> None:
+    """Test requests rejected at the same time share a single refresh."""
+    stand_in_api, client = await stand_in()
+    stand_in_api.id_token = "id-0"
+
+    results = await asyncio.gather(
+        *(client.async_get_devices_status() for _ in range(8))
+    )
+
+    assert results == [([], [])] * 8
+    assert stand_in_api.refreshes == 1
+    assert stand_in_api.requests.count("id-2") == 8
+
+
+async def test_server_error_is_retried(stand_in) -> None:
+    """Test a 5xx is retried with a backoff until the API answers."""
+    stand_in_api, client = await stand_in(server_errors=2)
+
+    assert await client.async_get_devices_status() == ([], [])
+
+    assert len(stand_in_api.requests) == 3
+    assert stand_in_api.refreshes == 0
+
+
+async def test_server_error_gives_up(stand_in) -> None:
+    """Test the last 5xx is raised once the attempts run out."""
+    stand_in_api, client = await stand_in(server_errors=api.MAX_REQUEST_ATTEMPTS)
+
+    with pytest.raises(EmporiaApiError) as err:
+        await client.async_get_devices_status()
+
+    assert err.value.status == 503
+    assert len(stand_in_api.requests) == api.MAX_REQUEST_ATTEMPTS
+
+
+async def test_unauthorized_on_the_last_attempt(stand_in) -> None:
+    """Test a 401 after the server errors used up the attempts is raised."""
+    stand_in_api, client = await stand_in(server_errors=api.MAX_REQUEST_ATTEMPTS - 1)
+    stand_in_api.id_token = "id-0"
+
+    with pytest.raises(EmporiaApiError) as err:
+        await client.async_get_devices_status()
+
+    assert err.value.status == 401
+    assert len(stand_in_api.requests) == api.MAX_REQUEST_ATTEMPTS
+    assert stand_in_api.refreshes == 1
@@ -0,0 +1,106 @@
+"""Test the backfill of the hourly power statistics after an outage."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pyemvue.enums import Scale
+
+from homeassistant.components.recorder.models import StatisticData
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.emporia_vue import backfill
+from custom_components.emporia_vue.backfill import StatisticsBackfill
+from custom_components.emporia_vue.channel_index import (
+    SIGN_KEEP,
+    ChannelIndex,
+    IndexedChannel,
+)
+from custom_components.emporia_vue.const import DOMAIN
+
+HOUR = timedelta(hours=1)
+# the outage ended in the middle of the 15:00 hour
+NOW = datetime(2024, 5, 1, 15, 20, tzinfo=UTC)
+LAST_STATISTIC = datetime(2024, 5, 1, 10, 0, tzinfo=UTC)
+
+
+class FakeClient:
+    """Answer the chart usage with one kWh value per hour, None for 12:00."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests: list[tuple] = []
+
+    async def async_get_chart_usage(
+        self,
+        device_gid: int,
+        channel_num: str,
+        start: datetime,
+        end: datetime,
+        scale: str,
+    ) -> tuple[list[float | None], datetime]:
+        """Return the usage of every hour from start up to end."""
+        self.requests.append((device_gid, channel_num, start, end, scale))
+        hours = int((end - start) / HOUR) + 1
+        usage: list[float | None] = [
+            None if start + hour * HOUR == LAST_STATISTIC + 2 * HOUR else 0.5 + hour
+            for hour in range(hours)
+        ]
+        return usage, start
+
+
+async def test_backfill_imports_up_to_the_current_hour(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the gap is filled up to and including the last complete hour."""
+    freezer.move_to(NOW)
+    entity_id = (
+        er.async_get(hass)
+        .async_get_or_create("sensor", DOMAIN, "sensor.emporia_vue.instant.1234-1,2,3")
+        .entity_id
+    )
+    index = ChannelIndex(
+        [IndexedChannel("1234-1,2,3-1MIN", 1234, "1,2,3", None, None, SIGN_KEEP)]
+    )
+    client = FakeClient()
+    imported: list[tuple[str, list[StatisticData]]] = []
+    recorder = SimpleNamespace(async_add_executor_job=hass.async_add_executor_job)
+
+    with (
+        patch.object(backfill, "get_instance", return_value=recorder),
+        patch.object(
+            backfill,
+            "_last_statistic_starts",
+            return_value={entity_id: LAST_STATISTIC},
+        ),
+        patch.object(
+            backfill,
+            "async_import_statistics",
+            side_effect=lambda hass, metadata, statistics: imported.append(
+                (metadata["statistic_id"], statistics)
+            ),
+        ),
+    ):
+        await StatisticsBackfill(hass, None, client).async_backfill(index)
+
+    start = LAST_STATISTIC + HOUR
+    until = datetime(2024, 5, 1, 15, 0, tzinfo=UTC)
+    assert client.requests == [(1234, "1,2,3", start, until, Scale.HOUR.value)]
+    assert imported == [
+        (
+            entity_id,
+            [
+                StatisticData(start=start, mean=500.0, min=500.0, max=500.0),
+                # 12:00 came back as None and is skipped
+                StatisticData(
+                    start=start + 2 * HOUR, mean=2500.0, min=2500.0, max=2500.0
+                ),
+                # the last complete hour of the outage, 14:00 to 15:00
+                StatisticData(
+                    start=start + 3 * HOUR, mean=3500.0, min=3500.0, max=3500.0
+                ),
+            ],
+        )
+    ]
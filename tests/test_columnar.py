@@ -0,0 +1,158 @@
+"""Test the columnar usage parsing against the channel by channel one."""
+
+from datetime import UTC, datetime, timedelta
+import random
+import time
+from zoneinfo import ZoneInfo
+
+from pyemvue.device import (
+    VueDevice,
+    VueDeviceChannel,
+    VueDeviceChannelUsage,
+    VueUsageDevice,
+)
+from pyemvue.enums import Scale
+import pytest
+
+from custom_components.emporia_vue import (
+    columnar as columnar_module,
+    parse_usage_for_scale,
+)
+from custom_components.emporia_vue.records import UsageRecord
+from custom_components.emporia_vue.resets import DeviceResetSchedule
+from custom_components.emporia_vue.runtime import VueRuntime
+
+CIRCUITS = [str(num) for num in range(1, 17)]
+START = datetime(2024, 5, 1, 12, 0, 30, tzinfo=UTC)
+
+
+def make_runtime(monitors: int, columnar: bool) -> VueRuntime:
+    """Return a runtime with monitors of 16 circuits, each with a plug on circuit 1."""
+    runtime = VueRuntime(columnar=columnar)
+    for gid in range(1, monitors + 1):
+        monitor = VueDevice(gid=gid, modelNum="VUE002")
+        monitor.channels = [
+            VueDeviceChannel(gid=gid, channelNum=num)
+            for num in ["1,2,3", *CIRCUITS, "Balance"]
+        ]
+        monitor.channels[2].channel_type_gid = 13  # solar
+        monitor.channels[3].type = "Bidirectional"
+        plug = VueDevice(gid=100_000 + gid, modelNum="SSO001")
+        plug.channels = [VueDeviceChannel(gid=plug.device_gid, channelNum="1,2,3")]
+        for device in (monitor, plug):
+            runtime.devices[device.device_gid] = device
+            runtime.reset_schedules[device.device_gid] = DeviceResetSchedule(
+                ZoneInfo("America/New_York"), 15
+            )
+    return runtime
+
+
+def make_usage(monitors: int, tick: int) -> dict[int, VueUsageDevice]:
+    """Return a usage response with some None and some missing channels.
+
+    The plugs are nested under circuit 1 and report a few seconds later than
+    their monitor, so the newest timestamp is a nested one.
+    """
+    rng = random.Random(tick)
+    timestamp = START + timedelta(minutes=tick)
+    usage_dict: dict[int, VueUsageDevice] = {}
+    for gid in range(1, monitors + 1):
+        monitor = VueUsageDevice(
+            gid=gid, timestamp=timestamp - timedelta(seconds=gid % 5)
+        )
+        for num in ["1,2,3", *CIRCUITS, "Balance"]:
+            if rng.random() < 0.02:
+                continue
+            usage = None if rng.random() < 0.05 else rng.uniform(-0.05, 0.05)
+            monitor.channels[num] = VueDeviceChannelUsage(gid, usage, num)
+        plug = VueUsageDevice(gid=100_000 + gid, timestamp=timestamp)
+        plug.channels["1,2,3"] = VueDeviceChannelUsage(
+            plug.device_gid, None if gid % 7 == 0 else rng.uniform(0, 0.01), "1,2,3"
+        )
+        circuit = monitor.channels.setdefault(
+            "1", VueDeviceChannelUsage(gid, rng.uniform(0, 0.05), "1")
+        )
+        circuit.nested_devices = {plug.device_gid: plug}
+        usage_dict[gid] = monitor
+    return usage_dict
+
+
+def record_values(record: UsageRecord) -> tuple:
+    """Return what a sensor would read from the record."""
+    return (
+        record.device_gid,
+        record.channel_num,
+        record.scale,
+        record.usage,
+        record.previous_usage,
+        record.reset,
+        record.timestamp,
+    )
+
+
+async def parse_ticks(
+    runtime: VueRuntime, monitors: int, ticks: int, scale: str
+) -> dict[str, UsageRecord]:
+    """Parse a few ticks of usage, skipping the first monitor on the last one."""
+    data: dict[str, UsageRecord] = {}
+    for tick in range(ticks):
+        failed_gids = {1} if tick == ticks - 1 else set()
+        data = await parse_usage_for_scale(
+            runtime,
+            make_usage(monitors, tick),
+            scale,
+            START + timedelta(minutes=tick),
+            failed_gids,
+        )
+        if scale == Scale.DAY.value:
+            runtime.last_day_data = data
+    return data
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+@pytest.mark.parametrize("scale", [Scale.MINUTE.value, Scale.DAY.value])
+async def test_columnar_matches_classic(
+    scale: str, numpy: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test both paths give the same records, usage column and data time."""
+    if not numpy:
+        monkeypatch.setattr(columnar_module, "np", None)
+    classic = make_runtime(20, columnar=False)
+    columnar = make_runtime(20, columnar=True)
+
+    classic_data = await parse_ticks(classic, 20, 3, scale)
+    columnar_data = await parse_ticks(columnar, 20, 3, scale)
+
+    assert classic_data.keys() == columnar_data.keys()
+    for identifier, record in classic_data.items():
+        assert record_values(columnar_data[identifier]) == record_values(record)
+    assert list(columnar.channel_indexes[scale].usage) == list(
+        classic.channel_indexes[scale].usage
+    )
+    # the nested plugs are the newest, every record is stamped with them
+    assert {
+        record.timestamp for record in columnar_data.values() if record.device_gid != 1
+    } == {START + timedelta(minutes=2)}
+
+
+@pytest.mark.benchmark
+async def test_columnar_benchmark() -> None:
+    """Test the columnar path keeps up with the classic one on 5k+ channels."""
+    monitors = 300  # 18 channels and a plug each, 5700 channels
+    responses = [make_usage(monitors, tick) for tick in range(5)]
+    timings: dict[bool, float] = {}
+    for columnar in (False, True):
+        runtime = make_runtime(monitors, columnar)
+        start = time.perf_counter()
+        for tick, usage_dict in enumerate(responses):
+            await parse_usage_for_scale(
+                runtime,
+                usage_dict,
+                Scale.MINUTE.value,
+                START + timedelta(minutes=tick),
+                set(),
+            )
+        timings[columnar] = time.perf_counter() - start
+        assert len(runtime.last_minute_data) == monitors * 19
+
+    assert timings[True] < timings[False] * 1.5
@@ -0,0 +1,50 @@
+"""Test the adaptive poll interval of the coordinators."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+from custom_components.emporia_vue.coordinator import (
+    AdaptivePollInterval,
+    switch_change_ratio,
+)
+
+MINUTE = timedelta(minutes=1)
+
+
+def test_churn_halves_the_interval() -> None:
+    """Test the interval halves when most values changed, within the minimum."""
+    poll_interval = AdaptivePollInterval(MINUTE, timedelta(seconds=20), 10 * MINUTE)
+
+    assert poll_interval.record_success(0.5) == MINUTE
+    assert poll_interval.record_success(0.5, 0.25) == MINUTE
+    assert poll_interval.record_success(0.5, 0.5) == timedelta(seconds=30)
+
+    # the minimum still bounds it
+    poll_interval.min_interval = timedelta(seconds=45)
+    assert poll_interval.record_success(0.5, 1.0) == timedelta(seconds=45)
+
+
+def test_slow_api_wins_over_churn() -> None:
+    """Test a slow API stretches the interval even when the data churns."""
+    poll_interval = AdaptivePollInterval(MINUTE, timedelta(seconds=20), 10 * MINUTE)
+
+    assert poll_interval.record_success(10.0, 1.0) == 2 * MINUTE
+
+
+def test_switch_change_ratio() -> None:
+    """Test the fraction of switches that were turned on or off or changed rate."""
+    previous = {
+        "1": SimpleNamespace(outlet_on=True),
+        "2": SimpleNamespace(outlet_on=False),
+        "3": SimpleNamespace(charger_on=True, charging_rate=16),
+        "4": SimpleNamespace(charger_on=True, charging_rate=16),
+    }
+    current = {
+        "1": SimpleNamespace(outlet_on=False),
+        "2": SimpleNamespace(outlet_on=False),
+        "3": SimpleNamespace(charger_on=True, charging_rate=32),
+        "4": SimpleNamespace(charger_on=True, charging_rate=16),
+    }
+
+    assert switch_change_ratio(previous, current) == 0.5
+    assert switch_change_ratio(None, current) is None
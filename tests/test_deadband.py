@@ -0,0 +1,82 @@
+"""Test the deadband keeps the raw usage and only holds back what is published."""
+
+from pyemvue.enums import Scale
+
+from custom_components.emporia_vue import handle_none_usage
+from custom_components.emporia_vue.coordinator import usage_snapshot
+from custom_components.emporia_vue.deadband import DeadbandRule, UsageFilter
+from custom_components.emporia_vue.records import UsageRecord
+from custom_components.emporia_vue.runtime import VueRuntime
+
+MINUTE = Scale.MINUTE.value
+IDENTIFIER = f"1-1-{MINUTE}"
+
+
+def watts(value: float) -> float:
+    """Return the minute usage in kWh of a power in watts."""
+    return value / 60_000
+
+
+def tick(
+    usage_filter: UsageFilter, data: dict[str, UsageRecord], value: float
+) -> UsageRecord:
+    """Update the record with the power and run the filter over it."""
+    record = data[IDENTIFIER]
+    record.update(watts(value), None, None)
+    usage_filter.apply(data, MINUTE)
+    return record
+
+
+def make_data(value: float) -> dict[str, UsageRecord]:
+    """Return the data of one channel."""
+    return {IDENTIFIER: UsageRecord(1, "1", MINUTE, None, watts(value))}
+
+
+def test_small_change_is_held_but_kept_raw() -> None:
+    """Test a change within the deadband is published as the old value only."""
+    usage_filter = UsageFilter(DeadbandRule(5.0, 0.0), {}, None)
+    data = make_data(100.0)
+
+    record = tick(usage_filter, data, 103.0)
+
+    assert record.usage == watts(103.0)
+    assert record.published == watts(100.0)
+    assert usage_snapshot(data)[IDENTIFIER] == (watts(100.0), None)
+
+    runtime = VueRuntime()
+    runtime.last_minute_data = data
+    assert handle_none_usage(runtime, MINUTE, IDENTIFIER) == watts(103.0)
+
+
+def test_drift_is_measured_from_the_published_value() -> None:
+    """Test small steps add up until they leave the deadband of what is shown."""
+    usage_filter = UsageFilter(DeadbandRule(5.0, 0.0), {}, None)
+    data = make_data(100.0)
+
+    assert tick(usage_filter, data, 103.0).published == watts(100.0)
+    assert tick(usage_filter, data, 104.0).published == watts(100.0)
+    assert tick(usage_filter, data, 106.0).published == watts(106.0)
+    assert data[IDENTIFIER].held_usage is None
+
+
+def test_precision_holds_changes_that_cant_show() -> None:
+    """Test changes below half the last shown decimal are held without rounding."""
+    usage_filter = UsageFilter(DeadbandRule(0.0, 0.0), {}, 1)
+    data = make_data(100.0)
+
+    assert tick(usage_filter, data, 100.04).published == watts(100.0)
+    # the published usage isn't rounded, the sensor does that
+    assert tick(usage_filter, data, 100.17).published == watts(100.17)
+
+
+def test_none_usage_is_published() -> None:
+    """Test a missing usage clears the held value."""
+    usage_filter = UsageFilter(DeadbandRule(5.0, 0.0), {}, None)
+    data = make_data(100.0)
+    tick(usage_filter, data, 103.0)
+
+    record = data[IDENTIFIER]
+    record.update(None, None, None)
+    usage_filter.apply(data, MINUTE)
+
+    assert record.published is None
@@ -0,0 +1,90 @@
+"""Test the minute history and its service."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from pyemvue.enums import Scale
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.emporia_vue.const import DOMAIN
+from custom_components.emporia_vue.history import MinuteHistory
+from custom_components.emporia_vue.history_api import async_get_minute_history
+from custom_components.emporia_vue.records import UsageRecord
+
+START = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def make_data(channels: int, watts: float) -> dict[str, UsageRecord]:
+    """Return minute records of the power."""
+    return {
+        f"1-{num}": UsageRecord(1, str(num), Scale.MINUTE.value, None, watts / 60_000)
+        for num in range(channels)
+    }
+
+
+async def test_naive_times_are_local(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test a window without a time zone is read in the local time zone."""
+    await hass.config.async_set_time_zone("America/New_York")
+    history = MinuteHistory(tmp_path, 1)
+    for minute in range(10):
+        history.record(make_data(1, 100.0 + minute), START + timedelta(minutes=minute))
+    hass.data[DOMAIN] = {"entry": {"minute_history": history}}
+
+    # 12:02 to 12:04 UTC is 08:02 to 08:04 in New York in May
+    result = await async_get_minute_history(
+        hass, "1-0", datetime(2024, 5, 1, 8, 2), datetime(2024, 5, 1, 8, 4)
+    )
+
+    assert result["start"] == "2024-05-01T12:02:00+00:00"
+    assert result["values"] == [102.0, 103.0, 104.0]
+    history.close()
+
+
+async def test_window_of_each_entry(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test an entry with a short history doesn't cut the window of the next one."""
+    short = MinuteHistory(tmp_path / "short", 1)
+    long = MinuteHistory(tmp_path / "long", 2)
+    for path in (short.directory, long.directory):
+        path.mkdir()
+    short.record(make_data(1, 100.0), START)
+    long.record(make_data(2, 100.0), START)
+    hass.data[DOMAIN] = {
+        "short": {"minute_history": short},
+        "long": {"minute_history": long},
+    }
+
+    # only the entry with two days has the channel
+    result = await async_get_minute_history(
+        hass, "1-1", START - timedelta(hours=36), START
+    )
+
+    assert result["start"] == (START - timedelta(hours=36)).isoformat()
+    assert len(result["values"]) == 36 * 60 + 1
+    assert result["values"][-1] == 100.0
+    short.close()
+    long.close()
+
+
+def test_concurrent_record_and_window(tmp_path: Path) -> None:
+    """Test recording and reading from several threads at once."""
+    history = MinuteHistory(tmp_path, 1)
+
+    def record(minute: int) -> None:
+        history.record(make_data(50, float(minute)), START + timedelta(minutes=minute))
+
+    def window(channel: int) -> list[float | None] | None:
+        return history.window(f"1-{channel}", START, START + timedelta(minutes=59))
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(record, minute) for minute in range(60)]
+        # read while the rings are being opened and written
+        futures += [executor.submit(window, channel) for channel in range(50)]
+        for future in futures:
+            future.result()
+
+    assert [window(channel) for channel in range(50)] == [
+        [float(minute) for minute in range(60)]
+    ] * 50
+    history.close()
@@ -0,0 +1,141 @@
+"""Test the import of the Emporia history as external statistics."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pyemvue.enums import Scale
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.recorder.models import StatisticData
+from homeassistant.core import HomeAssistant
+
+from custom_components.emporia_vue import history_import
+from custom_components.emporia_vue.channel_index import SIGN_KEEP
+from custom_components.emporia_vue.const import DOMAIN
+from custom_components.emporia_vue.history_import import (
+    HistoryImporter,
+    ImportChannel,
+    import_store,
+)
+
+HOUR = timedelta(hours=1)
+NOW = datetime(2024, 5, 1, 12, 10, tzinfo=UTC)
+CHANNEL = ImportChannel(f"{DOMAIN}:energy_1234_1_2_3", "Home", 1234, "1,2,3", SIGN_KEEP)
+
+
+class FakeClient:
+    """Answer the chart usage from a kWh value per hour, None if there is none."""
+
+    def __init__(self, usage: dict[datetime, float | None]) -> None:
+        """Initialize."""
+        self.usage = usage
+        self.starts: list[datetime] = []
+
+    async def async_get_chart_usage(
+        self,
+        device_gid: int,
+        channel_num: str,
+        start: datetime,
+        end: datetime,
+        scale: str,
+    ) -> tuple[list[float | None], datetime]:
+        """Return the usage of every hour from start up to end."""
+        assert scale == Scale.HOUR.value
+        self.starts.append(start)
+        hours = int((end - start) / HOUR) + 1
+        return [self.usage.get(start + hour * HOUR) for hour in range(hours)], start
+
+
+async def test_checkpoint_stops_at_the_last_settled_hour(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test recent and missing hours at the end are fetched again on the next run."""
+    freezer.move_to(NOW)
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    first_hour = datetime(2024, 5, 1, 0, 0, tzinfo=UTC)
+    # 00:00 to 08:00 have usage, 05:00 is a hole, 08:00 to 10:00 aren't in yet
+    # and 10:00 to 12:00 are still filling in
+    usage: dict[datetime, float | None] = {
+        first_hour + hour * HOUR: 1.0 for hour in range(8) if hour != 5
+    }
+    usage[first_hour + 10 * HOUR] = 0.25
+    usage[first_hour + 11 * HOUR] = 0.1
+    client = FakeClient(usage)
+    imported: list[StatisticData] = []
+    importer = HistoryImporter(hass, entry, client, days=1)
+
+    with patch.object(
+        history_import,
+        "async_add_external_statistics",
+        side_effect=lambda hass, metadata, statistics: imported.extend(statistics),
+    ):
+        await importer.async_import([CHANNEL])
+
+        # the hole at 05:00 is skipped, the checkpoint stays after 07:00
+        assert [row["start"].hour for row in imported] == [0, 1, 2, 3, 4, 6, 7, 10, 11]
+        assert (await import_store(hass, entry.entry_id).async_load())["channels"][
+            CHANNEL.statistic_id
+        ] == {
+            "end": (first_hour + 8 * HOUR).timestamp(),
+            "sum": 7.0,
+        }
+
+        # an hour later 08:00 and 09:00 came in and 11:00 is complete
+        freezer.tick(HOUR)
+        usage[first_hour + 8 * HOUR] = 1.0
+        usage[first_hour + 9 * HOUR] = 1.0
+        usage[first_hour + 11 * HOUR] = 1.0
+        imported.clear()
+        await importer.async_import([CHANNEL])
+
+    assert client.starts[-1] == first_hour + 8 * HOUR
+    assert [(row["start"].hour, row["sum"]) for row in imported] == [
+        (8, 8.0),
+        (9, 9.0),
+        (10, 9.25),
+        (11, 10.25),
+    ]
+    assert (await import_store(hass, entry.entry_id).async_load())["channels"][
+        CHANNEL.statistic_id
+    ] == {
+        "end": (first_hour + 11 * HOUR).timestamp(),
+        "sum": 9.25,
+    }
+
+
+async def test_checkpoint_of_a_channel_without_usage(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a channel without usage still moves its checkpoint to settled."""
+    freezer.move_to(NOW)
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    settled = datetime(2024, 5, 1, 10, 0, tzinfo=UTC)
+    store = import_store(hass, entry.entry_id)
+    await store.async_save(
+        {
+            "channels": {
+                CHANNEL.statistic_id: {
+                    "end": (settled - 6 * HOUR).timestamp(),
+                    "sum": 42.0,
+                }
+            }
+        }
+    )
+    client = FakeClient({})
+    importer = HistoryImporter(hass, entry, client, days=1)
+
+    with patch.object(history_import, "async_add_external_statistics") as mock_add:
+        await importer.async_import([CHANNEL])
+
+        assert (await import_store(hass, entry.entry_id).async_load())["channels"][
+            CHANNEL.statistic_id
+        ] == {"end": settled.timestamp(), "sum": 42.0}
+
+        # the next run only asks for the hours after settled
+        await importer.async_import([CHANNEL])
+
+    assert client.starts == [settled - 6 * HOUR, settled]
+    mock_add.assert_not_called()
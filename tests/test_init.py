@@ -0,0 +1,440 @@
+"""Test several Emporia accounts set up side by side."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+from pyemvue.device import (
+    ChargerDevice,
+    VueDevice,
+    VueDeviceChannel,
+    VueDeviceChannelUsage,
+    VueUsageDevice,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.emporia_vue.api import (
+    SHARED_MAX_CONCURRENT_REQUESTS,
+    AsyncVueClient,
+    EmporiaApiError,
+    async_get_request_pool,
+)
+from custom_components.emporia_vue.const import (
+    DOMAIN,
+    VUE_CLIENT,
+    VUE_DEVICES,
+    VUE_RUNTIME,
+)
+from custom_components.emporia_vue.runtime import VueRuntime
+from custom_components.emporia_vue.session import VueSessionStore
+
+ACCOUNTS = 50
+
+
+def account_devices(account: int) -> list[VueDevice]:
+    """Return a monitor and a charger with gids unique to the account."""
+    monitor = VueDevice(gid=account * 1000 + 1, modelNum="VUE002")
+    monitor.device_name = f"Home {account}"
+    monitor.channels = [
+        VueDeviceChannel(gid=monitor.device_gid, channelNum=num)
+        for num in ("1,2,3", "1", "2")
+    ]
+    charger = VueDevice(gid=account * 1000 + 2, modelNum="VVDN01")
+    charger.device_name = f"Charger {account}"
+    charger.channels = [VueDeviceChannel(gid=charger.device_gid, channelNum="1,2,3")]
+    charger.ev_charger = ChargerDevice(gid=charger.device_gid, on=True)
+    charger.ev_charger.max_charging_rate = 32 + account
+    for device in (monitor, charger):
+        device.time_zone = "America/New_York"
+        device.billing_cycle_start_day = 1
+    return [monitor, charger]
+
+
+class FakeVue:
+    """Log in to an account of the form user<number>@example.com."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.username = ""
+        self.auth = SimpleNamespace(
+            host="http://localhost", tokens={"id_token": "token"}
+        )
+
+    logins = 0
+
+    def login(self, username: str, password: str) -> bool:
+        """Log in without checking anything."""
+        FakeVue.logins += 1
+        self.username = username
+        return True
+
+    @property
+    def account(self) -> int:
+        """Return the number of the account."""
+        return int(self.username.removeprefix("user").partition("@")[0])
+
+    def get_devices(self) -> list[VueDevice]:
+        """Return the devices of the account."""
+        return account_devices(self.account)
+
+
+async def fake_device_list_usage(
+    client: AsyncVueClient, device_gids: list[str], instant: datetime, scale: str
+) -> dict[int, VueUsageDevice]:
+    """Return a usage for every channel that tells the account apart."""
+    account: int = client._vue.account
+    usage_dict: dict[int, VueUsageDevice] = {}
+    for device in account_devices(account):
+        if str(device.device_gid) not in device_gids:
+            continue
+        usage = VueUsageDevice(gid=device.device_gid, timestamp=instant)
+        for channel in device.channels:
+            usage.channels[channel.channel_num] = VueDeviceChannelUsage(
+                device.device_gid, account / 1000, channel.channel_num
+            )
+        usage_dict[device.device_gid] = usage
+    return usage_dict
+
+
+class FakeResponse:
+    """The status and body of an answered request."""
+
+    def __init__(self, status: int, body: str) -> None:
+        """Initialize."""
+        self.status = status
+        self._body = body
+
+    async def text(self) -> str:
+        """Return the body."""
+        return self._body
+
+
+class CountingSession:
+    """Answer the usage requests and track how many are in flight at once."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs: Any) -> AsyncIterator:
+        """Answer with the usage of the devices, after letting others pile up."""
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            for _ in range(3):
+                await asyncio.sleep(0)
+            yield FakeResponse(200, json.dumps(usage_body(url)))
+        finally:
+            self.in_flight -= 1
+
+
+def usage_body(url: str) -> dict[str, Any]:
+    """Return the usage response for the devices in the url."""
+    query = parse_qs(urlsplit(url).query)
+    assert query["apiMethod"] == ["getDeviceListUsages"]
+    devices: list[dict[str, Any]] = []
+    # the + between the gids reads back as a space
+    for gid in map(int, query["deviceGids"][0].split()):
+        device = next(
+            device
+            for device in account_devices(gid // 1000)
+            if device.device_gid == gid
+        )
+        devices.append(
+            {
+                "deviceGid": gid,
+                "channelUsages": [
+                    {
+                        "deviceGid": gid,
+                        "channelNum": channel.channel_num,
+                        "usage": gid // 1000 / 1000,
+                    }
+                    for channel in device.channels
+                ],
+            }
+        )
+    return {"deviceListUsages": {"instant": query["instant"][0], "devices": devices}}
+
+
+async def fake_devices_status(client: AsyncVueClient) -> tuple[list, list]:
+    """Return the status of the charger of the account."""
+    return [], [account_devices(client._vue.account)[1].ev_charger]
+
+
+async def test_accounts_are_isolated(hass: HomeAssistant) -> None:
+    """Test many entries keep their own runtime and the service finds the right one.
+
+    The entries are set up and refreshed all at once, their requests share one
+    pool that bounds how many are in flight.
+    """
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"user{account}@example.com",
+            data={
+                CONF_EMAIL: f"user{account}@example.com",
+                CONF_PASSWORD: "password",
+            },
+        )
+        for account in range(1, ACCOUNTS + 1)
+    ]
+    updated_chargers: list[tuple[AsyncVueClient, ChargerDevice, int]] = []
+
+    async def fake_update_charger(
+        client: AsyncVueClient, charger: ChargerDevice, on: bool, current: int
+    ) -> ChargerDevice:
+        updated_chargers.append((client, charger, current))
+        updated = ChargerDevice(gid=charger.device_gid, on=on)
+        updated.charging_rate = current
+        updated.max_charging_rate = charger.max_charging_rate
+        return updated
+
+    session = CountingSession()
+
+    with (
+        patch("custom_components.emporia_vue.PyEmVue", FakeVue),
+        patch(
+            "custom_components.emporia_vue.async_get_clientsession",
+            return_value=session,
+        ),
+        patch.object(AsyncVueClient, "async_get_devices_status", fake_devices_status),
+        patch.object(AsyncVueClient, "async_update_charger", fake_update_charger),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        for entry in entries:
+            entry.add_to_hass(hass)
+        assert all(
+            await asyncio.gather(
+                *(hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+            )
+        )
+        await hass.async_block_till_done()
+        assert session.max_in_flight == SHARED_MAX_CONCURRENT_REQUESTS
+
+        requests = session.requests
+        session.max_in_flight = 0
+        await asyncio.gather(
+            *(
+                hass.data[DOMAIN][entry.entry_id]["coordinator_usage"].async_refresh()
+                for entry in entries
+            )
+        )
+        assert session.requests - requests >= ACCOUNTS
+        assert session.max_in_flight == SHARED_MAX_CONCURRENT_REQUESTS
+
+        pool = async_get_request_pool(hass)
+        assert async_get_request_pool(hass) is pool
+        runtimes: list[VueRuntime] = []
+        for account, entry in enumerate(entries, start=1):
+            assert entry.state is ConfigEntryState.LOADED
+            entry_data = hass.data[DOMAIN][entry.entry_id]
+            runtime: VueRuntime = entry_data[VUE_RUNTIME]
+            gids = {account * 1000 + 1, account * 1000 + 2}
+            assert set(runtime.devices) == gids
+            assert entry_data[VUE_DEVICES] is runtime.devices
+            assert entry_data[VUE_CLIENT]._request_pool is pool
+            assert {
+                record.device_gid for record in runtime.last_minute_data.values()
+            } == gids
+            assert {record.usage for record in runtime.last_minute_data.values()} == {
+                account / 1000
+            }
+            runtimes.append(runtime)
+
+        # no two runtimes share any of their caches
+        for name, value in vars(runtimes[0]).items():
+            if isinstance(value, (list, dict, set)):
+                assert (
+                    len({id(vars(runtime)[name]) for runtime in runtimes}) == ACCOUNTS
+                )
+
+        # the service picks the account of the charger from its entity
+        registry = er.async_get(hass)
+        account = 17
+        entry = entries[account - 1]
+        charger_gid = account * 1000 + 2
+        entity_id = next(
+            registry_entry.entity_id
+            for registry_entry in er.async_entries_for_config_entry(
+                registry, entry.entry_id
+            )
+            if registry_entry.domain == "switch"
+            and registry_entry.unique_id.endswith(str(charger_gid))
+        )
+        await hass.services.async_call(
+            DOMAIN,
+            "set_charger_current",
+            {"entity_id": entity_id, "current": 100},
+            blocking=True,
+        )
+
+    client, charger, current = updated_chargers[0]
+    assert len(updated_chargers) == 1
+    assert client is hass.data[DOMAIN][entry.entry_id][VUE_CLIENT]
+    assert charger.device_gid == charger_gid
+    # capped at the maximum of this account's charger
+    assert current == 32 + account
+    assert (
+        runtimes[account - 1].devices[charger_gid].ev_charger.charging_rate == current
+    )
+    for other, runtime in enumerate(runtimes, start=1):
+        if other != account:
+            assert runtime.devices[other * 1000 + 2].ev_charger.charging_rate == 0
+
+
+async def test_cached_topology_is_not_reloaded(hass: HomeAssistant) -> None:
+    """Test a restart from the cached devices doesn't reload for special channels."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="user1@example.com",
+        data={CONF_EMAIL: "user1@example.com", CONF_PASSWORD: "password"},
+    )
+
+    async def fake_usage_with_balance(
+        client: AsyncVueClient, device_gids: list[str], instant: datetime, scale: str
+    ) -> dict[int, VueUsageDevice]:
+        usage_dict = await fake_device_list_usage(client, device_gids, instant, scale)
+        if 1001 in usage_dict:
+            usage_dict[1001].channels["Balance"] = VueDeviceChannelUsage(
+                1001, 0.5, "Balance"
+            )
+        return usage_dict
+
+    with (
+        patch("custom_components.emporia_vue.PyEmVue", FakeVue),
+        patch.object(
+            AsyncVueClient, "async_get_device_list_usage", fake_usage_with_balance
+        ),
+        patch.object(AsyncVueClient, "async_get_devices_status", fake_devices_status),
+        patch.object(
+            hass.config_entries, "async_reload", return_value=True
+        ) as mock_reload,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        # the second setup starts from the cached devices and revalidates them
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        runtime: VueRuntime = hass.data[DOMAIN][entry.entry_id][VUE_RUNTIME]
+        assert "Balance" in {
+            channel.channel_num for channel in runtime.devices[1001].channels
+        }
+        mock_reload.assert_not_called()
+
+
+async def test_rejected_session_logs_in_again(hass: HomeAssistant) -> None:
+    """Test a saved session Emporia rejects is dropped for a password login."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="user1@example.com",
+        data={CONF_EMAIL: "user1@example.com", CONF_PASSWORD: "password"},
+    )
+
+    async def fake_restore(
+        store: VueSessionStore, vue: FakeVue, client: AsyncVueClient, email: str
+    ) -> bool:
+        vue.username = email
+        return True
+
+    with (
+        patch("custom_components.emporia_vue.PyEmVue", FakeVue),
+        patch.object(
+            AsyncVueClient, "async_get_device_list_usage", fake_device_list_usage
+        ),
+        patch.object(AsyncVueClient, "async_get_devices_status", fake_devices_status),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        # the restart finds the cached devices and a saved session whose refresh
+        # token was revoked
+        FakeVue.logins = 0
+        with (
+            patch.object(VueSessionStore, "async_restore", fake_restore),
+            patch.object(
+                AsyncVueClient,
+                "async_refresh_tokens",
+                side_effect=EmporiaApiError(400, "NotAuthorizedException"),
+            ),
+            patch.object(VueSessionStore, "async_remove") as mock_remove,
+        ):
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert FakeVue.logins == 1
+    mock_remove.assert_called_once()
+
+
+async def test_switches_retry_after_a_failed_refresh(hass: HomeAssistant) -> None:
+    """Test the switches are set up once the status call works again."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="user1@example.com",
+        data={CONF_EMAIL: "user1@example.com", CONF_PASSWORD: "password"},
+    )
+    failing = True
+
+    async def flaky_devices_status(client: AsyncVueClient) -> tuple[list, list]:
+        if failing:
+            raise EmporiaApiError(503, "unavailable")
+        return await fake_devices_status(client)
+
+    def switches() -> list[er.RegistryEntry]:
+        return [
+            registry_entry
+            for registry_entry in er.async_entries_for_config_entry(
+                er.async_get(hass), entry.entry_id
+            )
+            if registry_entry.domain == "switch"
+        ]
+
+    with (
+        patch("custom_components.emporia_vue.PyEmVue", FakeVue),
+        patch.object(
+            AsyncVueClient, "async_get_device_list_usage", fake_device_list_usage
+        ),
+        patch.object(AsyncVueClient, "async_get_devices_status", flaky_devices_status),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+        assert not switches()
+
+        failing = False
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+        await hass.async_block_till_done()
+
+    assert len(switches()) == 1
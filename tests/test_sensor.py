@@ -0,0 +1,136 @@
+"""Test the sensors on a large account."""
+
+from datetime import UTC, datetime
+import logging
+import time
+
+from pyemvue.device import VueDevice, VueDeviceChannel
+from pyemvue.enums import Scale
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.emporia_vue.coordinator import (
+    ChangeNotifyingCoordinator,
+    usage_snapshot,
+)
+from custom_components.emporia_vue.records import UsageRecord
+from custom_components.emporia_vue.sensor import (
+    CurrentVuePowerSensor,
+    build_channel_map,
+)
+
+DEVICES = 10
+CHANNELS = 1000  # per device, 10k sensors in all
+TIMESTAMP = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def make_devices() -> dict[int, VueDevice]:
+    """Return devices with many channels each."""
+    devices: dict[int, VueDevice] = {}
+    for gid in range(1, DEVICES + 1):
+        device = VueDevice(gid=gid, modelNum="VUE002")
+        device.channels = [
+            VueDeviceChannel(gid=gid, channelNum=str(num)) for num in range(CHANNELS)
+        ]
+        devices[gid] = device
+    return devices
+
+
+def make_data(devices: dict[int, VueDevice]) -> dict[str, UsageRecord]:
+    """Return a minute record for every channel."""
+    return {
+        f"{gid}-{channel.channel_num}-{Scale.MINUTE.value}": UsageRecord(
+            gid, channel.channel_num, Scale.MINUTE.value, device, 0.001, None, TIMESTAMP
+        )
+        for gid, device in devices.items()
+        for channel in device.channels
+    }
+
+
+def scan_channel(device: VueDevice, channel_num: str) -> VueDeviceChannel | None:
+    """Find the channel the way the sensors did before the channel map."""
+    for channel in device.channels:
+        if channel.channel_num == channel_num:
+            return channel
+    return None
+
+
+def test_first_channel_wins() -> None:
+    """Test the map keeps the first of two channels with the same number."""
+    device = VueDevice(gid=1)
+    device.channels = [
+        VueDeviceChannel(gid=1, name="first", channelNum="1"),
+        VueDeviceChannel(gid=1, name="second", channelNum="1"),
+    ]
+
+    channels = build_channel_map({1: device})
+
+    assert channels[(1, "1")].name == "first"
+    assert scan_channel(device, "1") is channels[(1, "1")]
+
+
+@pytest.mark.benchmark
+async def test_sensor_benchmark(hass: HomeAssistant) -> None:
+    """Test setting up and updating 10k sensors.
+
+    The channel map has to beat scanning the channels of the device for every
+    sensor, and an update that changes 1% of the usage has to notify just those
+    sensors and take less time than notifying all of them.
+    """
+    devices = make_devices()
+    data = make_data(devices)
+
+    start = time.perf_counter()
+    for record in data.values():
+        scan_channel(record.info, record.channel_num)
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    channels = build_channel_map(devices)
+    for record in data.values():
+        channels.get((record.device_gid, record.channel_num))
+    map_time = time.perf_counter() - start
+    assert map_time < scan_time
+
+    coordinator = ChangeNotifyingCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name="usage",
+        snapshot=usage_snapshot,
+        update_interval=None,
+    )
+    coordinator.async_set_updated_data(data)
+    sensors = [
+        CurrentVuePowerSensor(coordinator, identifier, channels, precision=1)
+        for identifier in data
+    ]
+    assert len(sensors) == DEVICES * CHANNELS
+    assert len({sensor.unique_id for sensor in sensors}) == len(sensors)
+
+    notified: list[CurrentVuePowerSensor] = []
+    for sensor in sensors:
+        coordinator.async_add_listener(
+            lambda sensor=sensor: notified.append(sensor), sensor.coordinator_context
+        )
+
+    def tick(usage: float) -> float:
+        """Change every 100th record, publish it and read what was notified."""
+        for record in list(data.values())[::100]:
+            record.update(usage, None, TIMESTAMP)
+        notified.clear()
+        start = time.perf_counter()
+        coordinator.async_set_updated_data(data)
+        states = [sensor.native_value for sensor in notified]
+        elapsed = time.perf_counter() - start
+        assert states.count(round(usage * 60_000, 1)) == len(sensors) // 100
+        return elapsed
+
+    changed_time = tick(0.002)
+    assert len(notified) == len(sensors) // 100
+
+    coordinator._snapshot = None  # notify every sensor
+    all_time = tick(0.003)
+    assert len(notified) == len(sensors)
+
+    assert changed_time < all_time
@@ -0,0 +1,67 @@
+"""Test the cached Emporia device list."""
+
+from datetime import UTC, datetime
+
+from pyemvue.device import ChargerDevice, VueDevice, VueDeviceChannel
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.emporia_vue.topology import VueTopologyStore, devices_as_list
+
+
+def make_charger() -> VueDevice:
+    """Return a charger that went offline while charging."""
+    device = VueDevice(gid=1234, manId="A2332", modelNum="VVDN01")
+    device.device_name = "Garage"
+    device.channels = [VueDeviceChannel(gid=1234, name="Charger", channelNum="1,2,3")]
+    device.connected = False
+    device.offline_since = datetime(2024, 5, 1, 12, 30, tzinfo=UTC)
+    device.ev_charger = ChargerDevice(gid=1234, on=True)
+    device.ev_charger.charging_rate = 16
+    device.ev_charger.max_charging_rate = 40
+    device.ev_charger.status = "Charging"
+    device.ev_charger.message = "Your car is charging"
+    device.ev_charger.fault_text = ""
+    device.ev_charger.icon = "CarConnected"
+    device.ev_charger.icon_label = "Charging"
+    device.ev_charger.icon_detail_text = "16A"
+    return device
+
+
+async def test_status_is_restored(hass: HomeAssistant) -> None:
+    """Test the connection and charger status survive a save and load."""
+    store = VueTopologyStore(hass, "entry")
+    await store.async_save("me@example.com", {1234: make_charger()})
+
+    devices = await store.async_load("me@example.com")
+
+    assert devices is not None
+    device = devices[1234]
+    assert device.connected is False
+    assert device.offline_since == datetime(2024, 5, 1, 12, 30, tzinfo=UTC)
+    assert device.ev_charger.charger_on is True
+    assert device.ev_charger.status == "Charging"
+    assert device.ev_charger.message == "Your car is charging"
+    assert device.ev_charger.icon_label == "Charging"
+    assert device.ev_charger.icon_detail_text == "16A"
+    assert devices_as_list(devices) == devices_as_list({1234: make_charger()})
+
+
+async def test_other_account_is_ignored(hass: HomeAssistant) -> None:
+    """Test the devices cached for another account aren't restored."""
+    store = VueTopologyStore(hass, "entry")
+    await store.async_save("me@example.com", {1234: make_charger()})
+
+    assert await store.async_load("someone@example.com") is None
+
+
+def test_status_change_keeps_the_topology() -> None:
+    """Test a status change alone doesn't count as a topology change."""
+    online = make_charger()
+    online.connected = True
+    online.ev_charger.status = "Standby"
+
+    assert devices_as_list({1234: online}) != devices_as_list({1234: make_charger()})
+    assert devices_as_list({1234: online}, status=False) == devices_as_list(
+        {1234: make_charger()}, status=False
+    )